@@ -1,16 +1,80 @@
 """Admin log controller: list logs."""
+from datetime import datetime, timezone
+from itertools import islice
+
+from fastapi import HTTPException, Response
 from sqlalchemy.orm import Session
 
+from app.models import AdminLog
 from app.schemas import AdminLogResponse
-from app.services import admin_log_service
+from app.services import admin_log_archive_service, admin_log_service
+
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(log: AdminLog) -> str:
+    return f"{log.created_at.isoformat()}_{log.id}"
+
+
+def decode_cursor(cursor: str) -> admin_log_service.LogCursor:
+    try:
+        created_at, _, log_id = cursor.rpartition("_")
+        return datetime.fromisoformat(created_at), int(log_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+
+def _naive_utc(dt: datetime | None) -> datetime | None:
+    # Logs are stored as naive UTC.
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
 
 
 def list_logs(
     db: Session,
+    response: Response,
     limit: int = 200,
     offset: int = 0,
     entity_type: str | None = None,
     action: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    before: str | None = None,
 ) -> list[AdminLogResponse]:
-    logs = admin_log_service.list_logs(db, limit=limit, offset=offset, entity_type=entity_type, action=action)
+    """The cursor for the next (older) page is sent in X-Next-Cursor when the page is full."""
+    created_from, created_to = _naive_utc(created_from), _naive_utc(created_to)
+    if created_from and created_to and created_from > created_to:
+        raise HTTPException(status_code=400, detail="created_from must be on or before created_to.")
+    logs = admin_log_service.list_logs(
+        db,
+        limit=limit,
+        offset=offset,
+        entity_type=entity_type,
+        action=action,
+        created_from=created_from,
+        created_to=created_to,
+        before=decode_cursor(before) if before else None,
+    )
+    if len(logs) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(logs[-1])
     return [AdminLogResponse.model_validate(log) for log in logs]
+
+
+def list_archived_logs(
+    limit: int = 200,
+    entity_type: str | None = None,
+    action: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> list[AdminLogResponse]:
+    created_from, created_to = _naive_utc(created_from), _naive_utc(created_to)
+    if created_from and created_to and created_from > created_to:
+        raise HTTPException(status_code=400, detail="created_from must be on or before created_to.")
+    rows = admin_log_archive_service.query(
+        created_from=created_from,
+        created_to=created_to,
+        entity_type=entity_type,
+        action=action,
+    )
+    return [AdminLogResponse.model_validate(row) for row in islice(rows, limit)]
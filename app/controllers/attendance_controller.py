@@ -1,66 +1,305 @@
 """Attendance controller: HTTP handling for attendance endpoints."""
-from fastapi import HTTPException
+import csv
+import io
+import json
+from collections.abc import Iterator
+from datetime import date as Date, timedelta
+from itertools import islice
+from operator import itemgetter
+
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
+from app.controllers import employee_controller, fast_json
+from app.database import Query, SessionLocal
+from app.models import Attendance, AttendanceDepartmentDaily, AttendanceMonthly, AttendanceSummary, Department, Employee
+
 from app.schemas import (
     AttendanceBulkCreate,
     AttendanceCreate,
+    AttendanceDateRange,
+    AttendanceMultiDayBulkCreate,
     AttendanceResponse,
+    AttendanceRollupItem,
     AttendanceSummaryItem,
     BulkResult,
+    EmployeeAttendanceHistory,
+    EmployeeResponse,
+)
+from app.services import (
+    admin_log_service,
+    attendance_bitmap,
+    attendance_service,
+    attendance_summary_service,
+    employee_service,
+    group_commit,
+)
+
+# Tables the summary is built from (its ETag changes when any of them is written).
+SUMMARY_TABLES = (
+    Employee.__tablename__,
+    AttendanceSummary.__tablename__,
+    AttendanceMonthly.__tablename__,
+    Attendance.__tablename__,
 )
-from app.services import admin_log_service, attendance_service, employee_service
+# Tables the roster is built from.
+ROSTER_TABLES = (Employee.__tablename__, Department.__tablename__, Attendance.__tablename__)
+# Tables the department rollup is built from.
+ROLLUP_TABLES = (AttendanceDepartmentDaily.__tablename__, Department.__tablename__)
+MAX_BITMAP_YEARS = 50
+MAX_ROLLUP_DAYS = 3 * 366
+MAX_BULK_DAYS = 366
+MULTI_DAY_CHUNK_SIZE = 10_000  # rows upserted per transaction by the multi-day bulk endpoint
+_ROLLUP_KEYS = fast_json.keys(AttendanceRollupItem)
+_EMPLOYEE_KEYS = fast_json.keys(EmployeeResponse)
 
 
 def list_attendance(
     db: Session,
-    date_from: str | None = None,
-    date_to: str | None = None,
+    date_from: Date | None = None,
+    date_to: Date | None = None,
 ) -> list[AttendanceResponse]:
     return attendance_service.get_all_with_employee_name(db, date_from=date_from, date_to=date_to)
 
 
-def list_attendance_summary(db: Session) -> list[AttendanceSummaryItem]:
-    rows = attendance_service.get_attendance_summary(db)
+def _export_chunks(fmt: str, date_from: Date | None, date_to: Date | None) -> Iterator[str]:
+    # Uses its own session: the request-scoped one may be closed before the body finishes streaming.
+    db = SessionLocal()
+    try:
+        columns = attendance_service.EXPORT_COLUMNS
+        if fmt == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(columns)
+            for batch in attendance_service.iter_export_rows(db, date_from=date_from, date_to=date_to):
+                writer.writerows(batch)
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+            if buf.tell():
+                yield buf.getvalue()
+        else:
+            for batch in attendance_service.iter_export_rows(db, date_from=date_from, date_to=date_to):
+                yield "".join(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in batch)
+    finally:
+        db.close()
+
+
+def export_attendance(
+    fmt: str = "ndjson",
+    date_from: Date | None = None,
+    date_to: Date | None = None,
+) -> StreamingResponse:
+    """Stream the attendance listing as NDJSON or CSV in constant memory."""
+    if fmt == "csv":
+        media_type, ext = "text/csv", "csv"
+    else:
+        media_type, ext = "application/x-ndjson", "ndjson"
+    return StreamingResponse(
+        _export_chunks(fmt, date_from, date_to),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="attendance.{ext}"'},
+    )
+
+
+def list_attendance_summary(
+    date_from: Date | None = None,
+    date_to: Date | None = None,
+    department_id: int | None = None,
+) -> Query[list[AttendanceSummaryItem]]:
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must be on or before date_to.")
+    rows = yield from attendance_service.get_attendance_summary(
+        date_from=date_from, date_to=date_to, department_id=department_id
+    )
     return [AttendanceSummaryItem(**r) for r in rows]
 
 
-def create_attendance(body: AttendanceCreate, db: Session) -> AttendanceResponse:
-    emp = employee_service.get_by_employee_id(db, body.employee_id)
-    if not emp:
+def attendance_rollup(
+    db: Session,
+    date_from: Date,
+    date_to: Date,
+    granularity: str = "day",
+    department_id: int | None = None,
+) -> list[dict]:
+    """Present/absent days per department per day, week (from Monday) or month, from the daily
+    department counters. Dicts keyed like AttendanceRollupItem."""
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must be on or before date_to.")
+    if (date_to - date_from).days >= MAX_ROLLUP_DAYS:
+        raise HTTPException(status_code=400, detail=f"The range is limited to {MAX_ROLLUP_DAYS} days.")
+    rows = attendance_summary_service.department_rollup(
+        db, date_from, date_to, granularity=granularity, department_id=department_id
+    )
+    return fast_json.records(_ROLLUP_KEYS, rows)
+
+
+def roster(
+    db: Session,
+    response: Response,
+    date: Date,
+    state: str,
+    limit: int | None = None,
+    after: str | None = None,
+    department_id: int | None = None,
+    include_total: bool = False,
+) -> list[dict]:
+    """A keyset page of the employees unmarked / present / absent on `date`, in employee_id
+    order. Dicts keyed like EmployeeResponse; the next cursor (last employeeId) goes in
+    X-Next-Cursor when the page is full, the total in X-Total-Count when asked."""
+    page_size = limit or employee_controller.DEFAULT_PAGE_SIZE
+    employees = fast_json.records(
+        _EMPLOYEE_KEYS,
+        attendance_service.roster_rows(db, date, state, page_size, after=after, department_id=department_id),
+    )
+    if len(employees) == page_size:
+        response.headers["X-Next-Cursor"] = employees[-1]["employeeId"]
+    if include_total:
+        response.headers["X-Total-Count"] = str(
+            attendance_service.roster_count(db, date, state, department_id=department_id)
+        )
+    return employees
+
+
+def employee_attendance(
+    db: Session,
+    employee_id: str,
+    fmt: str = "days",
+    date_from: Date | None = None,
+    date_to: Date | None = None,
+) -> EmployeeAttendanceHistory:
+    """One employee's attendance, oldest first. fmt="bitmap" returns one 2-bit-per-day bitmap
+    per calendar year (from date_from's to date_to's year, or the years with records)."""
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must be on or before date_to.")
+    if not employee_service.get_ref_by_employee_id(db, employee_id):
         raise HTTPException(status_code=404, detail="Employee not found.")
-    existing = attendance_service.get_by_employee_date(db, body.employee_id, body.date)
-    dept_name = emp.department.name if getattr(emp, "department", None) else None
-    if existing:
-        attendance_service.update_status(db, existing, body.status)
-        admin_log_service.create(
-            db, "update", "attendance", body.employee_id,
-            f"Updated attendance: {emp.full_name} on {body.date} → {body.status}",
+    rows = attendance_service.history(db, employee_id, date_from=date_from, date_to=date_to)
+    if fmt != "bitmap":
+        return EmployeeAttendanceHistory(
+            employee_id=employee_id, days=[{"date": d, "status": status} for d, status in rows]
         )
-        return attendance_service.to_response(existing, emp.full_name, dept_name)
-    rec = attendance_service.create(db, body.employee_id, body.date, body.status)
-    admin_log_service.create(
-        db, "create", "attendance", body.employee_id,
-        f"Marked attendance: {emp.full_name} on {body.date} → {body.status}",
-    )
-    return attendance_service.to_response(rec, emp.full_name, dept_name)
+    years: range | tuple = ()
+    if rows or (date_from and date_to):
+        first = date_from.year if date_from else rows[0][0].year
+        last = date_to.year if date_to else rows[-1][0].year
+        if last - first >= MAX_BITMAP_YEARS:
+            raise HTTPException(status_code=400, detail=f"Bitmap history is limited to {MAX_BITMAP_YEARS} years.")
+        years = range(first, last + 1)
+    return EmployeeAttendanceHistory(employee_id=employee_id, years=attendance_bitmap.encode_years(rows, years))
 
 
-def bulk_attendance(body: AttendanceBulkCreate, db: Session) -> BulkResult:
-    created = updated = failed = 0
-    for item in body.records:
-        emp = employee_service.get_by_employee_id(db, item.employee_id)
+def stage_marks(db: Session, bodies: list[AttendanceCreate]) -> list[dict | HTTPException]:
+    """Stage attendance marks in order in the caller's transaction, with one admin log each.
+    A mark for an unknown employee gets a 404 instead. Does not commit."""
+    refs = {}
+    for body in bodies:
+        if body.employee_id not in refs:
+            refs[body.employee_id] = employee_service.get_ref_by_employee_id(db, body.employee_id)
+    staged = iter(
+        attendance_service.upsert_marks(
+            db, [(body.employee_id, body.date, body.status) for body in bodies if refs[body.employee_id]]
+        )
+    )
+    results: list[dict | HTTPException] = []
+    for body in bodies:
+        emp = refs[body.employee_id]
         if not emp:
-            failed += 1
+            results.append(HTTPException(status_code=404, detail="Employee not found."))
             continue
-        _, action = attendance_service.create_or_update(db, item.employee_id, body.date, item.status)
-        if action == "created":
-            created += 1
+        rec, created = next(staged)
+        if created:
+            admin_log_service.create(
+                db, "create", "attendance", body.employee_id,
+                f"Marked attendance: {emp.full_name} on {body.date} → {body.status}",
+            )
         else:
-            updated += 1
+            admin_log_service.create(
+                db, "update", "attendance", body.employee_id,
+                f"Updated attendance: {emp.full_name} on {body.date} → {body.status}",
+            )
+        # A later mark in the batch may change the record; report this mark's status.
+        results.append(
+            {**attendance_service.to_response(rec, emp.full_name, emp.department_name), "status": body.status}
+        )
+    return results
+
+
+# Single marks from concurrent requests share a transaction (see group_commit);
+# mark_writes.write(body) commits one on its own.
+mark_writes = group_commit.register("attendance_marks", stage_marks)
+
+
+def bulk_attendance(body: AttendanceBulkCreate, db: Session) -> BulkResult:
+    known = employee_service.existing_employee_ids(db, (item.employee_id for item in body.records))
+    records = [(item.employee_id, item.status) for item in body.records if item.employee_id in known]
+    failed = len(body.records) - len(records)
+    created, updated = attendance_service.bulk_upsert(db, body.date, records)
     if created or updated:
         admin_log_service.create(
             db, "bulk_create", "attendance", None,
             f"Bulk attendance for {body.date}: {created} created, {updated} updated",
         )
+    db.commit()
     return {"created": created, "updated": updated, "failed": failed}
+
+
+def _expand_range(date_range: AttendanceDateRange) -> Iterator[tuple[str, Date, str]]:
+    """(employee_id, date, status) rows of a date range, date by date; patterns repeat from date_from."""
+    for offset in range((date_range.date_to - date_range.date_from).days + 1):
+        date = date_range.date_from + timedelta(days=offset)
+        for item in date_range.employees:
+            status = item.pattern[offset % len(item.pattern)]
+            if status is not None:
+                yield item.employee_id, date, status
+
+
+def bulk_attendance_multi_day(body: AttendanceMultiDayBulkCreate, db: Session) -> dict:
+    """Upsert attendance over many dates, MULTI_DAY_CHUNK_SIZE rows (in date order) per
+    transaction. A chunk that fails is rolled back and reported; the others still commit."""
+    if (body.records is None) == (body.date_range is None):
+        raise HTTPException(status_code=400, detail="Send either records or dateRange.")
+    if body.records is not None:
+        rows = iter(sorted(((r.employee_id, r.date, r.status) for r in body.records), key=itemgetter(1)))
+        employee_ids = {r.employee_id for r in body.records}
+    else:
+        date_range = body.date_range
+        if date_range.date_from > date_range.date_to:
+            raise HTTPException(status_code=400, detail="dateFrom must be on or before dateTo.")
+        if (date_range.date_to - date_range.date_from).days >= MAX_BULK_DAYS:
+            raise HTTPException(status_code=400, detail=f"The range is limited to {MAX_BULK_DAYS} days.")
+        rows = _expand_range(date_range)
+        employee_ids = {item.employee_id for item in date_range.employees}
+    known = employee_service.existing_employee_ids(db, employee_ids)
+    result = {"created": 0, "updated": 0, "failed": 0, "chunks": []}
+    index = 0
+    while chunk := list(islice(rows, MULTI_DAY_CHUNK_SIZE)):
+        records = [row for row in chunk if row[0] in known]
+        chunk_result = {
+            "index": index,
+            "date_from": chunk[0][1],
+            "date_to": chunk[-1][1],
+            "rows": len(chunk),
+            "failed": len(chunk) - len(records),
+        }
+        try:
+            created, updated = attendance_service.bulk_upsert_many(db, records)
+            if created or updated:
+                admin_log_service.create(
+                    db, "bulk_create", "attendance", None,
+                    f"Bulk attendance for {chunk[0][1]}..{chunk[-1][1]}: {created} created, {updated} updated",
+                )
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            created = updated = 0
+            chunk_result.update(committed=False, error=str(getattr(e, "orig", None) or e), failed=len(chunk))
+        chunk_result.update(created=created, updated=updated)
+        result["created"] += created
+        result["updated"] += updated
+        result["failed"] += chunk_result["failed"]
+        result["chunks"].append(chunk_result)
+        index += 1
+    return result
@@ -1,36 +1,72 @@
 """Department controller: HTTP handling for department endpoints."""
+import csv
+from itertools import islice
+from typing import BinaryIO
+
 from sqlalchemy.exc import IntegrityError
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 from sqlalchemy.orm import Session
 
-from app.models import Department
+from app.controllers import employee_controller, fast_json, job_controller
+from app.database import Query
+from app.models import Department, Employee, Job
 from app.schemas import (
     BulkResult,
     DepartmentCreate,
     DepartmentResponse,
-    DepartmentWithEmployeesResponse,
+    DepartmentSummary,
     EmployeeSummary,
+    JobResponse,
 )
-from app.services import admin_log_service, department_service
+from app.services import admin_log_service, department_service, job_service
 
 
-def _department_with_employees_response(dept: Department) -> DepartmentWithEmployeesResponse:
-    employees = [
-        EmployeeSummary(
-            id=emp.id,
-            employee_id=emp.employee_id,
-            full_name=emp.full_name,
-            email=emp.email,
-        )
-        for emp in (dept.employees or [])
-    ]
-    return DepartmentWithEmployeesResponse(id=dept.id, name=dept.name, employees=employees)
+# Tables the department list is built from (its ETag changes when any of them is written).
+LIST_TABLES = (Department.__tablename__, Employee.__tablename__)
+_DEPARTMENT_KEYS = fast_json.keys(DepartmentSummary)
+_SUMMARY_KEYS = fast_json.keys(EmployeeSummary)
+CSV_CHUNK_SIZE = 5000  # names checked and inserted per transaction by the CSV import job
+CSV_IMPORT_JOB = "departments_csv"
+
+
+def list_departments(expand_employees: bool = False) -> Query[list[dict]]:
+    """Departments with their employee counts, as dicts keyed like DepartmentSummary; one row
+    per department. With `expand_employees`, each also carries its employees (keyed like
+    DepartmentWithEmployeesResponse), built from one joined Core query. A Query (see app.database)."""
+    if not expand_employees:
+        return fast_json.records(_DEPARTMENT_KEYS, (yield department_service.counts_select()))
+    departments: list[dict] = []
+    current_id = None
+    for dept_id, name, *employee in (yield department_service.employee_rows_select()):
+        if dept_id != current_id:
+            current_id = dept_id
+            departments.append({"id": dept_id, "name": name, "employeeCount": 0, "employees": []})
+        if employee[0] is not None:
+            departments[-1]["employeeCount"] += 1
+            departments[-1]["employees"].append(dict(zip(_SUMMARY_KEYS, employee)))
+    return departments
 
 
-def list_departments(db: Session) -> list[DepartmentWithEmployeesResponse]:
-    departments = department_service.get_all_with_employees(db)
-    return [_department_with_employees_response(d) for d in departments]
+def list_department_employees(
+    response: Response,
+    id: int,
+    limit: int | None = None,
+    after: int | None = None,
+    include_total: bool = False,
+) -> Query[list[dict]]:
+    """A keyset page of one department's employees (see employee_controller.list_employees)."""
+    if not (yield from department_service.exists(id)):
+        raise HTTPException(status_code=404, detail="Department not found.")
+    return (
+        yield from employee_controller.list_employees(
+            response,
+            limit=limit or employee_controller.DEFAULT_PAGE_SIZE,
+            after=str(after) if after is not None else None,
+            department_id=id,
+            include_total=include_total,
+        )
+    )
 
 
 def create_department(body: DepartmentCreate, db: Session) -> DepartmentResponse:
@@ -41,7 +77,9 @@ def create_department(body: DepartmentCreate, db: Session) -> DepartmentResponse
     admin_log_service.create(
         db, "create", "department", dept.id, f"Created department: {body.name.strip()}"
     )
-    return DepartmentResponse.model_validate(dept)
+    response = DepartmentResponse.model_validate(dept)
+    db.commit()
+    return response
 
 
 def delete_department(id: int, db: Session) -> None:
@@ -52,36 +90,91 @@ def delete_department(id: int, db: Session) -> None:
     try:
         department_service.delete(db, department)
     except IntegrityError:
+        db.rollback()
         raise HTTPException(
             status_code=400,
             detail="Cannot delete department that has employees. Reassign or remove employees first.",
         )
     admin_log_service.create(db, "delete", "department", id, f"Deleted department: {name}")
+    db.commit()
     return None
 
 
-def bulk_create_departments(db: Session, names: list[str]) -> BulkResult:
-    """Insert all new department names in one transaction. Duplicates (in list or DB) are skipped."""
-    created = failed = 0
-    seen: set[str] = set()
-    for name in names:
-        n = (name or "").strip()
-        if not n:
-            failed += 1
-            continue
-        key = n.lower()
-        if key in seen:
-            failed += 1
-            continue
-        if department_service.get_by_name(db, n):
+def _stage_new_departments(db: Session, names: list[str]) -> tuple[int, int]:
+    """Insert the names that are not blank and not already taken, ignoring case: by an earlier
+    name in `names` or by a department in the DB (which includes those inserted earlier in the
+    transaction or by an earlier chunk). Existing names are found with one IN query per chunk;
+    new ones go in with one executemany. Does not commit. Returns (created, failed)."""
+    stripped = [(name or "").strip() for name in names]
+    taken = department_service.existing_names_nocase(db, (n for n in stripped if n))
+    failed = 0
+    new_names: list[str] = []
+    for n in stripped:
+        key = department_service.fold_case(n)
+        if not n or key in taken:
             failed += 1
             continue
-        db.add(Department(name=n))
-        seen.add(key)
-        created += 1
-    db.commit()
+        taken.add(key)
+        new_names.append(n)
+    department_service.insert_many(db, new_names)
+    return len(new_names), failed
+
+
+def bulk_create_departments(db: Session, names: list[str]) -> BulkResult:
+    """Insert all new department names in one transaction. Duplicates (in list or DB) are skipped."""
+    created, failed = _stage_new_departments(db, names)
     if created:
         admin_log_service.create(
             db, "bulk_create", "department", None, f"Bulk created {created} department(s)"
         )
+    db.commit()
+    if created:
+        department_service.invalidate_cache()
     return BulkResult(created=created, updated=0, failed=failed)
+
+
+def queue_departments_csv_import(db: Session, source: BinaryIO) -> JobResponse:
+    """Queue a CSV import as a background job; progress is at GET /api/jobs/{id}."""
+    return job_controller.to_response(job_service.enqueue(db, CSV_IMPORT_JOB, source))
+
+
+def run_departments_csv_job(db: Session, job: Job) -> None:
+    """Job handler: import department names (first column; optional 'name' header) from the
+    job's checkpoint, committing each chunk with its progress.
+
+    Names from earlier chunks are caught by the case-insensitive DB check, so a resumed job
+    rejects the same rows as an uninterrupted one.
+    """
+    created, failed, rows_processed = job.created, job.failed, job.rows_processed
+    with open(job.file_path, "rb") as f:
+        lines = job_service.InputLines(f, job.offset)
+        records = (r for r in csv.reader(lines) if r)
+        pending: list[list[str]] = []
+        if job.offset == 0:
+            first = next(records, None)
+            if first and first[0].strip().lower() != "name":
+                pending.append(first)
+        while True:
+            rows = pending + list(islice(records, CSV_CHUNK_SIZE - len(pending)))
+            pending = []
+            if not rows:
+                break
+            names = [n for n in ((r[0] or "").strip() for r in rows) if n]
+            chunk_created, chunk_failed = _stage_new_departments(db, names)
+            created += chunk_created
+            failed += chunk_failed
+            rows_processed += len(rows)
+            job_service.checkpoint(
+                db, job, offset=lines.offset, rows_processed=rows_processed, created=created, failed=failed
+            )
+            department_service.invalidate_cache()
+    if not created and not failed:
+        raise ValueError("No department names found in CSV.")
+    if created:
+        admin_log_service.create(
+            db, "bulk_create", "department", None, f"Bulk created {created} department(s) from CSV (job {job.id})"
+        )
+        db.commit()
+
+
+job_service.register(CSV_IMPORT_JOB, run_departments_csv_job)
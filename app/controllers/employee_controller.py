@@ -1,10 +1,39 @@
 """Employee controller: HTTP handling for employee endpoints."""
-from fastapi import HTTPException
+import base64
+import binascii
+import csv
+import re
+from functools import lru_cache
+from itertools import islice
+from typing import BinaryIO, TextIO
+
+from fastapi import HTTPException, Response
+from pydantic import EmailStr, TypeAdapter, ValidationError
 from sqlalchemy.orm import Session
 
-from app.models import Employee
-from app.schemas import BulkResult, EmployeeCreate, EmployeeResponse
-from app.services import admin_log_service, department_service, employee_service
+from app.controllers import fast_json, job_controller
+from app.database import Query
+from app.models import Department, Employee, Job
+from app.schemas import BulkResult, BulkRowError, EmployeeCreate, EmployeeResponse, JobResponse
+from app.services import (
+    admin_log_service,
+    department_service,
+    employee_search_service,
+    employee_service,
+    job_service,
+)
+
+
+# Tables the employee list is built from (its ETag changes when any of them is written).
+LIST_TABLES = (Employee.__tablename__, Department.__tablename__)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+CSV_CHUNK_SIZE = 5000  # rows parsed, checked and inserted at a time by the CSV importer
+MAX_REPORTED_ERRORS = 1000  # per-row errors returned; `failed` still counts every one
+CSV_IMPORT_JOB = "employees_csv"
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+_EMPLOYEE_KEYS = fast_json.keys(EmployeeResponse)
 
 
 def _employee_response(emp: Employee) -> EmployeeResponse:
@@ -19,9 +48,75 @@ def _employee_response(emp: Employee) -> EmployeeResponse:
     )
 
 
-def list_employees(db: Session) -> list[EmployeeResponse]:
-    employees = employee_service.get_all(db)
-    return [_employee_response(e) for e in employees]
+def encode_prefix_cursor(cursor: employee_service.PrefixCursor) -> str:
+    # Names can hold any character, so the (key, id) pair travels base64url-encoded.
+    key, last_id = cursor
+    return base64.urlsafe_b64encode(f"{last_id}:{key}".encode()).decode()
+
+
+def decode_cursor(after: str, prefix: str | None) -> int | employee_service.PrefixCursor:
+    """An id for plain listings; the encoded (key, id) of the last row for prefix listings."""
+    try:
+        if not prefix:
+            return int(after)
+        last_id, _, key = base64.urlsafe_b64decode(after.encode()).decode().partition(":")
+        return key, int(last_id)
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+
+def list_employees(
+    response: Response,
+    limit: int | None = None,
+    after: str | None = None,
+    department_id: int | None = None,
+    prefix: str | None = None,
+    include_total: bool = False,
+) -> Query[list[dict]]:
+    """Without `limit` (and no filters) returns every employee, as before. Otherwise returns a keyset
+    page; the cursor for the next page is sent in X-Next-Cursor and the total in X-Total-Count.
+
+    Pages are ordered by id, except with `prefix`: those are ordered by the matching name (or
+    email) and id, so each page is two short index range scans (see employee_service.prefix_selects).
+
+    Rows come from a column-projected Core query and are returned as dicts keyed like
+    EmployeeResponse (by alias), ready for either serialization path (see fast_json). A Query,
+    so it runs on a Session or an AsyncSession (see app.database)."""
+    prefix = (prefix or "").strip() or None
+    cursor = decode_cursor(after, prefix) if after else None
+    filtered = department_id is not None or prefix is not None
+    if limit is None and cursor is None and not filtered:
+        employees = fast_json.records(_EMPLOYEE_KEYS, (yield employee_service.page_select()))
+    elif prefix is not None:
+        page_size = limit or DEFAULT_PAGE_SIZE
+        results = []
+        for stmt in employee_service.prefix_selects(prefix, page_size, after=cursor, department_id=department_id):
+            results.append((yield stmt))
+        rows = employee_service.merge_prefix_rows(prefix, results, page_size)
+        employees = fast_json.records(_EMPLOYEE_KEYS, rows)
+        if len(rows) == page_size:
+            response.headers["X-Next-Cursor"] = encode_prefix_cursor(employee_service.prefix_key(prefix, rows[-1]))
+    else:
+        page_size = limit or DEFAULT_PAGE_SIZE
+        employees = fast_json.records(
+            _EMPLOYEE_KEYS,
+            (yield employee_service.page_select(page_size, after=cursor, department_id=department_id)),
+        )
+        if len(employees) == page_size:
+            response.headers["X-Next-Cursor"] = str(employees[-1]["id"])
+    if include_total:
+        total = yield from employee_service.count(department_id=department_id, prefix=prefix)
+        response.headers["X-Total-Count"] = str(total)
+    return employees
+
+
+def search_employees(
+    db: Session, q: str, limit: int | None = None, department_id: int | None = None
+) -> list[dict]:
+    """Full-text search over name, email, employee ID and department; every word matches as a
+    prefix, best matches first. Dicts keyed like EmployeeResponse."""
+    rows = employee_search_service.search(db, q, limit or DEFAULT_SEARCH_LIMIT, department_id=department_id)
+    return fast_json.records(_EMPLOYEE_KEYS, rows)
 
 
 def create_employee(body: EmployeeCreate, db: Session) -> EmployeeResponse:
@@ -31,7 +126,7 @@ def create_employee(body: EmployeeCreate, db: Session) -> EmployeeResponse:
     existing_email = employee_service.get_by_email(db, body.email)
     if existing_email:
         raise HTTPException(status_code=409, detail="An employee with this email already exists.")
-    dept = department_service.get_by_id(db, body.department_id)
+    dept = department_service.get_ref_by_id(db, body.department_id)
     if not dept:
         raise HTTPException(status_code=400, detail="Department not found.")
     emp = employee_service.create(db, body)
@@ -39,7 +134,9 @@ def create_employee(body: EmployeeCreate, db: Session) -> EmployeeResponse:
         db, "create", "employee", emp.employee_id,
         f"Created employee: {emp.full_name} ({emp.employee_id})",
     )
-    return _employee_response(emp)
+    response = _employee_response(emp)
+    db.commit()
+    return response
 
 
 def delete_employee(id_or_employee_id: str, db: Session) -> None:
@@ -53,44 +150,266 @@ def delete_employee(id_or_employee_id: str, db: Session) -> None:
     eid, name = employee.employee_id, employee.full_name
     employee_service.delete(db, employee)
     admin_log_service.create(db, "delete", "employee", eid, f"Deleted employee: {name} ({eid})")
+    db.commit()
     return None
 
 
 def bulk_create_employees(db: Session, employees: list[EmployeeCreate]) -> BulkResult:
-    """Insert all new employees in one transaction. Duplicates (employee_id/email in list or DB) are skipped."""
-    created = failed = 0
-    seen_ids: set[str] = set()
-    seen_emails: set[str] = set()
-    for item in employees:
-        eid = (item.employee_id or "").strip()
-        email = (item.email or "").strip().lower()
+    """Insert all new employees in one transaction. Duplicates (employee_id/email in list or DB) are skipped.
+
+    Existing employee_ids, emails and department ids are each fetched with one IN query per
+    chunk; new employees go in with one executemany.
+    """
+    items = [
+        ((item.employee_id or "").strip(), (item.email or "").strip().lower(), item) for item in employees
+    ]
+    taken_ids = employee_service.existing_employee_ids(db, (eid for eid, _, _ in items if eid))
+    taken_emails = employee_service.existing_emails(db, (email for _, email, _ in items if email))
+    dept_ids = department_service.existing_ids(db, (item.department_id for _, _, item in items))
+    failed = 0
+    new_ids: list[str] = []
+    rows: list[dict] = []
+    for eid, email, item in items:
         if not eid or not email:
             failed += 1
             continue
-        if eid in seen_ids or email in seen_emails:
+        if eid in taken_ids or email in taken_emails:
             failed += 1
             continue
-        if employee_service.get_by_employee_id(db, eid) or employee_service.get_by_email(db, email):
+        if item.department_id not in dept_ids:
             failed += 1
             continue
-        dept = department_service.get_by_id(db, item.department_id)
-        if not dept:
-            failed += 1
-            continue
-        db.add(
-            Employee(
-                employee_id=eid,
-                full_name=(item.full_name or "").strip(),
-                email=email,
-                department_id=item.department_id,
-            )
+        taken_ids.add(eid)
+        taken_emails.add(email)
+        new_ids.append(eid)
+        rows.append(
+            {
+                "employee_id": eid,
+                "full_name": (item.full_name or "").strip(),
+                "email": email,
+                "department_id": item.department_id,
+            }
         )
-        seen_ids.add(eid)
-        seen_emails.add(email)
-        created += 1
-    db.commit()
+    employee_service.insert_many(db, rows)
+    created = len(rows)
     if created:
         admin_log_service.create(
             db, "bulk_create", "employee", None, f"Bulk created {created} employee(s)"
         )
+    db.commit()
+    if created:
+        employee_service.invalidate_cache(*new_ids)
     return BulkResult(created=created, updated=0, failed=failed)
+
+
+def _norm_key(s: str) -> str:
+    return re.sub(r"\s+", "_", (s or "").strip().lower())
+
+
+_email_adapter = TypeAdapter(EmailStr)
+# RFC 5322 dot-atom local part, ASCII only: always accepted, and left unchanged, by EmailStr.
+_DOT_ATOM = re.compile(r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*")
+
+
+@lru_cache(maxsize=4096)
+def _normalized_domain(domain: str) -> str | None:
+    try:
+        return _email_adapter.validate_python(f"x@{domain}").rpartition("@")[2]
+    except ValidationError:
+        return None
+
+
+def _normalize_email(email: str) -> str:
+    """EmailStr validation + lowercasing, as the JSON path gets, with the domain checks
+    (IDNA, most of the cost) cached: an import repeats a handful of domains. Raises ValueError."""
+    local, _, domain = email.rpartition("@")
+    if local and len(local) <= 64 and len(email) <= 254 and _DOT_ATOM.fullmatch(local):
+        normalized_domain = _normalized_domain(domain)
+        if normalized_domain is not None:
+            return f"{local}@{normalized_domain}".lower()
+    try:
+        return _email_adapter.validate_python(email).lower()
+    except ValidationError as e:
+        raise ValueError(e.errors()[0]["msg"]) from None
+
+
+# Accepted header spellings per field (compared after _norm_key).
+_CSV_FIELDS = {
+    "employee_id": ("employee_id", "employeeId", "employee id"),
+    "full_name": ("full_name", "fullName", "full name"),
+    "email": ("email",),
+    "department_id": ("department_id", "departmentId", "department id"),
+    "department_name": ("department_name", "departmentName", "department name"),
+}
+
+
+class _CsvImport:
+    """State of one CSV import: the result so far and departments resolved by earlier chunks."""
+
+    def __init__(self, fieldnames: list[str]):
+        key_map = {_norm_key(f): f for f in fieldnames}
+        # field -> the header columns that can supply it, in preference order
+        self.columns = {
+            field: [key_map[k] for k in dict.fromkeys(_norm_key(c) for c in candidates) if k in key_map]
+            for field, candidates in _CSV_FIELDS.items()
+        }
+        self.result = BulkResult()
+        self.dept_ids: set[int] = set()
+        self.dept_by_name: dict[str, int] = {}
+
+    def get(self, row: dict, field: str) -> str | None:
+        """First non-empty value among the field's columns, stripped."""
+        for column in self.columns[field]:
+            if row.get(column):
+                return row[column].strip()
+        return None
+
+    def fail(self, line: int, detail: str) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < MAX_REPORTED_ERRORS:
+            self.result.errors.append(BulkRowError(row=line, detail=detail))
+
+    def import_chunk(self, db: Session, rows: list[tuple[int, dict]]) -> None:
+        """Validate one chunk, check it against the DB with one set query per key, insert the rest."""
+        first_error = len(self.result.errors)
+        parsed = []
+        for line, row in rows:
+            eid = self.get(row, "employee_id")
+            full_name = self.get(row, "full_name")
+            email = self.get(row, "email")
+            dept_id = self.get(row, "department_id")
+            dept_name = self.get(row, "department_name")
+            if not eid or not full_name or not email:
+                self.fail(line, "employee_id, full_name and email are required.")
+                continue
+            if not (dept_id and dept_id.isdigit()) and not dept_name:
+                self.fail(line, "department_id or department_name is required.")
+                continue
+            parsed.append((line, eid, full_name, email, int(dept_id) if dept_id and dept_id.isdigit() else None, dept_name))
+
+        wanted_ids = {p[4] for p in parsed if p[4] is not None} - self.dept_ids
+        wanted_names = {p[5] for p in parsed if p[4] is None} - self.dept_by_name.keys()
+        self.dept_ids |= department_service.existing_ids(db, wanted_ids)
+        self.dept_by_name.update(department_service.ids_by_name(db, wanted_names))
+
+        candidates: list[tuple[int, dict]] = []
+        for line, eid, full_name, email, dept_id, dept_name in parsed:
+            if dept_id is None:
+                dept_id = self.dept_by_name.get(dept_name)
+                found = dept_id is not None
+            else:
+                found = dept_id in self.dept_ids
+            if not found:
+                self.fail(line, "Department not found.")
+                continue
+            try:
+                email = _normalize_email(email)
+            except ValueError as e:
+                self.fail(line, str(e))
+                continue
+            candidates.append(
+                (line, {"employee_id": eid, "full_name": full_name, "email": email, "department_id": dept_id})
+            )
+
+        # Rows inserted by earlier chunks are visible here (same transaction), so these two
+        # queries also catch duplicates across chunks.
+        taken_ids = employee_service.existing_employee_ids(db, (row["employee_id"] for _, row in candidates))
+        taken_emails = employee_service.existing_emails(db, (row["email"] for _, row in candidates))
+        inserts = []
+        for line, row in candidates:
+            if row["employee_id"] in taken_ids:
+                self.fail(line, "An employee with this employee ID already exists.")
+                continue
+            if row["email"] in taken_emails:
+                self.fail(line, "An employee with this email already exists.")
+                continue
+            taken_ids.add(row["employee_id"])
+            taken_emails.add(row["email"])
+            inserts.append(row)
+        employee_service.insert_many(db, inserts)
+        self.result.created += len(inserts)
+        self.result.errors[first_error:] = sorted(self.result.errors[first_error:], key=lambda e: e.row)
+
+
+def import_employees_csv(db: Session, stream: TextIO) -> BulkResult:
+    """Create employees from a CSV text stream in chunks of CSV_CHUNK_SIZE rows, in one transaction.
+
+    Memory is bounded by the chunk size. Rows that can't be imported are counted in `failed`
+    and listed in `errors` with their line number.
+    """
+    reader = csv.DictReader(stream)
+    if not reader.fieldnames:
+        raise HTTPException(status_code=400, detail="CSV file is empty.")
+    state = _CsvImport(reader.fieldnames)
+    while True:
+        rows = [(reader.line_num, row) for row in islice(reader, CSV_CHUNK_SIZE)]
+        if not rows:
+            break
+        state.import_chunk(db, rows)
+    result = state.result
+    if not result.created and not result.failed:
+        raise HTTPException(status_code=400, detail="CSV has no data rows.")
+    if result.created:
+        admin_log_service.create(
+            db, "bulk_create", "employee", None, f"Imported {result.created} employee(s) from CSV"
+        )
+    db.commit()
+    if result.created:
+        employee_service.invalidate_cache()
+    return result
+
+
+def queue_employees_csv_import(db: Session, source: BinaryIO) -> JobResponse:
+    """Queue a CSV import as a background job; progress is at GET /api/jobs/{id}."""
+    return job_controller.to_response(job_service.enqueue(db, CSV_IMPORT_JOB, source))
+
+
+def run_employees_csv_job(db: Session, job: Job) -> None:
+    """Job handler: import the job's CSV from its checkpoint, committing each chunk with its progress.
+
+    Unlike the synchronous import, each chunk is its own transaction, so no write lock is
+    held for the whole file and a resumed job continues after the last committed chunk.
+    """
+    with open(job.file_path, "rb") as f:
+        lines = job_service.InputLines(f, job.offset)
+        line = job.line
+        fieldnames = job.fieldnames
+        if fieldnames is None:
+            header = csv.reader(lines)
+            fieldnames = next(header, None)
+            if not fieldnames:
+                raise ValueError("CSV file is empty.")
+            line += header.line_num
+        reader = csv.DictReader(lines, fieldnames=fieldnames)
+        state = _CsvImport(fieldnames)
+        state.result = BulkResult(created=job.created, failed=job.failed, errors=job.errors or [])
+        rows_processed = job.rows_processed
+        while True:
+            rows = [(line + reader.line_num, row) for row in islice(reader, CSV_CHUNK_SIZE)]
+            if not rows:
+                break
+            state.import_chunk(db, rows)
+            rows_processed += len(rows)
+            job_service.checkpoint(
+                db,
+                job,
+                offset=lines.offset,
+                line=line + reader.line_num,
+                fieldnames=fieldnames,
+                rows_processed=rows_processed,
+                created=state.result.created,
+                failed=state.result.failed,
+                errors=[e.model_dump() for e in state.result.errors],
+            )
+            employee_service.invalidate_cache()
+    if not rows_processed:
+        raise ValueError("CSV has no data rows.")
+    if state.result.created:
+        admin_log_service.create(
+            db, "bulk_create", "employee", None,
+            f"Imported {state.result.created} employee(s) from CSV (job {job.id})",
+        )
+        db.commit()
+
+
+job_service.register(CSV_IMPORT_JOB, run_employees_csv_job)
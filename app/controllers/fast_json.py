@@ -0,0 +1,28 @@
+"""Fast path for large list responses.
+
+The list controllers build plain dicts straight from Core rows, keyed by the response
+models' aliases. With FAST_JSON on (the default) orjson encodes them as is; otherwise they
+are validated and dumped through the response model. The JSON is the same either way.
+"""
+import os
+from collections.abc import Iterable, Sequence
+
+import orjson
+from pydantic import BaseModel
+
+# FAST_JSON=0 falls back to building and validating the response models.
+FAST_JSON = os.getenv("FAST_JSON", "1").strip().lower() not in ("0", "false", "no")
+
+
+def keys(model: type[BaseModel]) -> tuple[str, ...]:
+    """JSON keys of `model` (alias when set), in field order."""
+    return tuple(field.alias or name for name, field in model.model_fields.items())
+
+
+def records(keys: Sequence[str], rows: Iterable[Sequence]) -> list[dict]:
+    """Zip each row (columns in `keys` order) into a dict."""
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def dumps(obj) -> bytes:
+    return orjson.dumps(obj)
@@ -0,0 +1,85 @@
+"""Conditional GET for polled list endpoints.
+
+The weak ETag is derived from the versions of the tables a response is built from (see
+table_versions) plus the query string, so it can be computed without touching the
+database. A matching If-None-Match gets a 304. The last serialized body per URL is kept
+in a small LRU, so an unchanged poll without If-None-Match is served from memory too.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.controllers import fast_json
+from app.services import table_versions
+
+BODY_CACHE_ENTRIES = 128
+BODY_CACHE_MAX_BYTES = 4 * 1024 * 1024  # don't pin very large bodies in memory
+
+_bodies: OrderedDict[str, tuple[str, bytes, dict[str, str]]] = OrderedDict()
+_bodies_lock = threading.Lock()
+_adapters: dict[Any, TypeAdapter] = {}
+
+
+def etag_for(request: Request, tables: tuple[str, ...]) -> str:
+    versions = ".".join(str(v) for v in table_versions.snapshot(*tables))
+    query = hashlib.blake2s(str(request.url.query).encode(), digest_size=6).hexdigest()
+    return f'W/"{table_versions.BOOT_TOKEN}-{versions}-{query}"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes are ignored.
+    candidates = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+async def conditional_json(
+    request: Request,
+    tables: tuple[str, ...],
+    response_type: Any,
+    produce: Callable[[Response], Awaitable[Any]],
+) -> Response:
+    """Serve a JSON list endpoint with ETag / If-None-Match support.
+
+    `produce(response)` runs the controller; headers it sets on `response` are kept (and
+    cached with the body). The result is validated and serialized with `response_type`,
+    using aliases, exactly as response_model would. With `response_type=None` the result
+    must already be JSON-ready (dicts keyed by alias) and is encoded with orjson as is.
+    """
+    etag = etag_for(request, tables)
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    key = f"{request.url.path}?{request.url.query}"
+    with _bodies_lock:
+        cached = _bodies.get(key)
+        if cached and cached[0] == etag:
+            _bodies.move_to_end(key)
+            return Response(cached[1], media_type="application/json", headers={**cached[2], "ETag": etag})
+
+    sub_response = Response()
+    result = await produce(sub_response)
+    if response_type is None:
+        body = fast_json.dumps(result)
+    else:
+        adapter = _adapters.get(response_type)
+        if adapter is None:
+            adapter = _adapters[response_type] = TypeAdapter(response_type)
+        body = adapter.dump_json(adapter.validate_python(result), by_alias=True)
+    headers = {k: v for k, v in sub_response.headers.items() if k.lower() != "content-length"}
+
+    if len(body) <= BODY_CACHE_MAX_BYTES:
+        with _bodies_lock:
+            _bodies[key] = (etag, body, headers)
+            _bodies.move_to_end(key)
+            while len(_bodies) > BODY_CACHE_ENTRIES:
+                _bodies.popitem(last=False)
+    return Response(body, media_type="application/json", headers={**headers, "ETag": etag})
@@ -0,0 +1,57 @@
+"""Job controller: report and cancel background jobs."""
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.models import Job
+from app.schemas import JobResponse
+from app.services import job_service
+
+
+def _eta_seconds(job: Job) -> float | None:
+    """Time left at the current run's byte rate (None until a chunk of this run has committed)."""
+    if job.status != "running" or job.run_started_at is None:
+        return None
+    done = job.offset - job.run_start_offset
+    if done <= 0:
+        return None
+    elapsed = (datetime.utcnow() - job.run_started_at).total_seconds()
+    return round(elapsed / done * (job.total_bytes - job.offset), 1)
+
+
+def to_response(job: Job) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        rows_processed=job.rows_processed or 0,
+        created=job.created or 0,
+        failed=job.failed or 0,
+        errors=job.errors or [],
+        error=job.error,
+        bytes_processed=job.offset or 0,
+        total_bytes=job.total_bytes,
+        progress=1.0 if job.status == "succeeded" else round((job.offset or 0) / job.total_bytes, 4) if job.total_bytes else 0.0,
+        eta_seconds=_eta_seconds(job),
+        cancel_requested=bool(job.cancel_requested),
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+def get_job(db: Session, job_id: str) -> JobResponse:
+    job = job_service.get(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return to_response(job)
+
+
+def cancel_job(db: Session, job_id: str) -> JobResponse:
+    job = job_service.get(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    if job.status in job_service.FINISHED:
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}.")
+    return to_response(job_service.request_cancel(db, job))
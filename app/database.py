@@ -1,18 +1,161 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from collections.abc import AsyncIterator, Awaitable, Callable, Generator
+from functools import partial
+from typing import Any, TypeVar
+
+import anyio
+from sqlalchemy import Engine, Executable, Result, create_engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./hrms.db")
-connect_args = {} if not DATABASE_URL.startswith("sqlite") else {"check_same_thread": False}
+# "default" keeps SQLite's stock settings; "production" enables WAL and the pragmas below.
+DB_PROFILE = os.getenv("DB_PROFILE", "default").strip().lower()
+# DB_ASYNC=1 serves the polled list endpoints through an AsyncSession on the aiosqlite driver.
+DB_ASYNC = os.getenv("DB_ASYNC", "").strip().lower() in ("1", "true", "yes")
+
+# Applied to every new SQLite connection in the production profile.
+PRODUCTION_PRAGMAS = {
+    # Lets admin log retention hand freed pages back (PRAGMA incremental_vacuum). Only takes
+    # effect on a new database; see `python manage.py enable-incremental-vacuum`.
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",  # readers no longer block behind a writer's commit
+    "synchronous": "NORMAL",  # durable across app crashes; fsync only at WAL checkpoints
+    "cache_size": -64000,  # 64 MiB page cache per connection (negative = KiB)
+    "mmap_size": 268435456,  # 256 MiB memory-mapped reads
+    "busy_timeout": 5000,  # wait up to 5s for the write lock instead of failing with SQLITE_BUSY
+    "foreign_keys": "ON",
+    "temp_store": "MEMORY",
+}
+
+
+def _is_file_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and ":memory:" not in url and url.rstrip("/") not in ("sqlite:", "sqlite+pysqlite:")
+
+
+def _pool_kwargs(url: str, profile: str) -> dict:
+    if profile != "production" or not _is_file_sqlite(url):
+        return {}
+    # Sync routes run on FastAPI's threadpool (40 threads by default) in each uvicorn
+    # worker process, so size the per-process pool to that: no request waits on the pool.
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "30")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    }
+
+
+def _apply_profile(eng: Engine, profile: str) -> None:
+    if profile != "production":
+        return
+
+    @event.listens_for(eng, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        for name, value in PRODUCTION_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+def build_engine(url: str = DATABASE_URL, profile: str = DB_PROFILE) -> Engine:
+    """Create the engine for `url` using the given tuning profile."""
+    if not url.startswith("sqlite"):
+        return create_engine(url)
+    eng = create_engine(url, connect_args={"check_same_thread": False}, **_pool_kwargs(url, profile))
+    _apply_profile(eng, profile)
+    return eng
+
+
+def build_async_engine(url: str = DATABASE_URL, profile: str = DB_PROFILE) -> AsyncEngine:
+    """Async counterpart of build_engine (sqlite URLs use the aiosqlite driver)."""
+    if url.startswith("sqlite:"):
+        url = "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    if not url.startswith("sqlite"):
+        return create_async_engine(url)
+    eng = create_async_engine(url, **_pool_kwargs(url, profile))
+    _apply_profile(eng.sync_engine, profile)
+    return eng
+
+
+engine = build_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+# Only created in async mode, so the aiosqlite driver is not needed otherwise.
+async_engine = build_async_engine() if DB_ASYNC else None
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False) if DB_ASYNC else None
+
+# A DbRunner calls `fn(session, *args, **kwargs)` for a sync controller/service function on the
+# threadpool and awaits the result.
+DbRunner = Callable[..., Awaitable[Any]]
+
+T = TypeVar("T")
+# A Query is a generator that yields SQL statements, is sent each one's Result and returns its
+# value. It holds no session, so the same code runs on a Session (run_query) or awaits its
+# statements on an AsyncSession (run_query_async). The polled list endpoints are written this way.
+Query = Generator[Executable, Result, T]
+# A QueryRunner runs a Query on a fresh session and awaits its value.
+QueryRunner = Callable[[Query[T]], Awaitable[T]]
+
+
+def run_query(db: Session, query: Query[T]) -> T:
+    try:
+        statement = next(query)
+        while True:
+            statement = query.send(db.execute(statement))
+    except StopIteration as done:
+        return done.value
+
+
+async def run_query_async(db: AsyncSession, query: Query[T]) -> T:
+    try:
+        statement = next(query)
+        while True:
+            statement = query.send(await db.execute(statement))
+    except StopIteration as done:
+        return done.value
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def _call_and_close(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    db = SessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+async def get_db_runner() -> AsyncIterator[DbRunner]:
+    """Dependency for async routes that call sync code: runs it on the threadpool with a regular
+    Session, exactly like a sync route would, and closes the session as soon as the function
+    returns, so the pooled connection is not held while the response is sent."""
+    async def run_threaded(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return await anyio.to_thread.run_sync(partial(_call_and_close, fn, *args, **kwargs))
+
+    yield run_threaded
+
+
+async def get_query_runner() -> AsyncIterator[QueryRunner]:
+    """Dependency for the polled list endpoints. Async mode: awaits each statement on an
+    AsyncSession (aiosqlite), so the event loop serves other requests meanwhile. Sync mode:
+    runs the whole query on the threadpool with a regular Session."""
+    if DB_ASYNC:
+        async def run_async(query: Query[T]) -> T:
+            async with AsyncSessionLocal() as adb:
+                return await run_query_async(adb, query)
+
+        yield run_async
+        return
+
+    async def run_threaded(query: Query[T]) -> T:
+        return await anyio.to_thread.run_sync(_call_and_close, run_query, query)
+
+    yield run_threaded
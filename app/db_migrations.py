@@ -135,3 +135,156 @@ def ensure_employees_email_unique(engine: Engine) -> None:
             conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS ix_employees_email ON employees(email)"))
         except Exception:
             pass
+
+
+def ensure_employees_name_index(engine: Engine) -> None:
+    """Ensure the NOCASE index on employees.full_name used by name-prefix filters exists.
+
+    create_all() only creates indexes for new tables, so older DBs need it added here.
+    """
+    if not _is_sqlite(engine):
+        return
+
+    with engine.begin() as conn:
+        cols = conn.execute(text("PRAGMA table_info(employees)")).fetchall()
+        if not cols:
+            return
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_employees_full_name_nocase "
+                "ON employees(full_name COLLATE NOCASE)"
+            )
+        )
+
+
+def ensure_departments_name_index(engine: Engine) -> None:
+    """Ensure the NOCASE index on departments.name used by case-insensitive duplicate checks exists."""
+    if not _is_sqlite(engine):
+        return
+
+    with engine.begin() as conn:
+        cols = conn.execute(text("PRAGMA table_info(departments)")).fetchall()
+        if not cols:
+            return
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_departments_name_nocase "
+                "ON departments(name COLLATE NOCASE)"
+            )
+        )
+
+
+def ensure_admin_log_indexes(engine: Engine) -> None:
+    """Replace the single-column admin_logs indexes with the composite ones in the model.
+
+    The old `ix_admin_logs_action` / `ix_admin_logs_entity_type` indexes can't serve an
+    ordered page, and create_all() only creates indexes for new tables.
+    """
+    if not _is_sqlite(engine):
+        return
+
+    from app.models import AdminLog
+
+    with engine.begin() as conn:
+        cols = conn.execute(text("PRAGMA table_info(admin_logs)")).fetchall()
+        if not cols:
+            return
+        conn.execute(text("DROP INDEX IF EXISTS ix_admin_logs_action"))
+        conn.execute(text("DROP INDEX IF EXISTS ix_admin_logs_entity_type"))
+        for index in AdminLog.__table__.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def ensure_attendance_rollups_populated(engine: Engine) -> None:
+    """Backfill the attendance rollups when one is empty but attendance rows exist.
+
+    Run after create_all(): DBs created before a rollup table existed have history that
+    was never counted. `python manage.py rebuild-summary` does the same on demand.
+    """
+    from app.services import attendance_summary_service
+
+    with engine.begin() as conn:
+        has_attendance = conn.execute(text("SELECT 1 FROM attendance LIMIT 1")).scalar_one_or_none()
+        if not has_attendance:
+            return
+        for table in ("attendance_summary", "attendance_monthly", "attendance_department_daily"):
+            if conn.execute(text(f"SELECT 1 FROM {table} LIMIT 1")).scalar_one_or_none() is None:
+                attendance_summary_service.rebuild(conn)
+                return
+
+
+def ensure_employee_search(engine: Engine) -> None:
+    """Create the FTS5 employee search index and its triggers; populate it when first created.
+
+    Run after create_all(). `python manage.py rebuild-search` repopulates it on demand.
+    """
+    if not _is_sqlite(engine):
+        return
+
+    from app.services import employee_search_service
+
+    with engine.begin() as conn:
+        if employee_search_service.exists(conn):
+            employee_search_service.create(conn)  # adds any trigger missing from an older DB
+        else:
+            employee_search_service.rebuild(conn)
+
+
+def ensure_attendance_date_type(engine: Engine) -> None:
+    """Rebuild `attendance` with a DATE `date` column and the date-leading covering index.
+
+    Older DBs declared `attendance.date` as TEXT and only had employee-leading indexes, so
+    date-range listings scanned and sorted the whole table. Values are already ISO
+    `YYYY-MM-DD` strings (the storage format SQLAlchemy's Date uses on SQLite), so rows are
+    copied as-is with their ids. Rows whose text is not a valid calendar date are left in
+    `attendance_invalid_dates` for manual review instead of being dropped.
+    """
+    if not _is_sqlite(engine):
+        return
+
+    from app.models import Attendance
+
+    with engine.begin() as conn:
+        cols = conn.execute(text("PRAGMA table_info(attendance)")).fetchall()
+        if not cols:
+            return
+        date_type = next((row[2] for row in cols if row[1] == "date"), "")
+        if date_type.upper() == "DATE":
+            return
+
+        conn.execute(text("ALTER TABLE attendance RENAME TO attendance_legacy"))
+        # Index names are global in SQLite; free them for the new table.
+        for (name,) in conn.execute(
+            text(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND tbl_name = 'attendance_legacy' AND sql IS NOT NULL"
+            )
+        ).fetchall():
+            conn.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+        Attendance.__table__.create(conn)
+        conn.execute(
+            text(
+                """
+                INSERT INTO attendance (id, employee_id, date, status)
+                SELECT id, employee_id, date, status FROM attendance_legacy
+                WHERE date(julianday(date)) IS date
+                """
+            )
+        )
+        conn.execute(text("DELETE FROM attendance_legacy WHERE date(julianday(date)) IS date"))
+        leftover = conn.execute(text("SELECT 1 FROM attendance_legacy LIMIT 1")).scalar_one_or_none()
+        if leftover:
+            conn.execute(text("ALTER TABLE attendance_legacy RENAME TO attendance_invalid_dates"))
+            # Rollups may have counted the rows that were set aside.
+            rollups = conn.execute(
+                text(
+                    "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' "
+                    "AND name IN ('attendance_summary', 'attendance_monthly', 'attendance_department_daily')"
+                )
+            ).scalar_one()
+            if rollups == 3:
+                from app.services import attendance_summary_service
+
+                attendance_summary_service.rebuild(conn)
+        else:
+            conn.execute(text("DROP TABLE attendance_legacy"))
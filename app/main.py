@@ -4,10 +4,29 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database import Base, engine
-from app.db_migrations import ensure_employees_department_id, ensure_employees_email_unique
-from app.models import AdminLog, Attendance, Department, Employee  # noqa: F401 - register tables with Base
-from app.routers import admin_logs, attendance, departments, employees
+from app.database import Base, async_engine, engine
+from app.db_migrations import (
+    ensure_admin_log_indexes,
+    ensure_attendance_date_type,
+    ensure_attendance_rollups_populated,
+    ensure_departments_name_index,
+    ensure_employee_search,
+    ensure_employees_department_id,
+    ensure_employees_email_unique,
+    ensure_employees_name_index,
+)
+from app.models import (  # noqa: F401 - register tables with Base
+    AdminLog,
+    Attendance,
+    AttendanceDepartmentDaily,
+    AttendanceMonthly,
+    AttendanceSummary,
+    Department,
+    Employee,
+    Job,
+)
+from app.routers import admin_logs, attendance, departments, employees, jobs, metrics
+from app.services import group_commit, job_service
 
 
 @asynccontextmanager
@@ -15,8 +34,20 @@ async def lifespan(app: FastAPI):
     # If an older hrms.db exists, migrate it before ORM queries run.
     ensure_employees_department_id(engine)
     ensure_employees_email_unique(engine)
+    ensure_employees_name_index(engine)
+    ensure_departments_name_index(engine)
+    ensure_attendance_date_type(engine)
+    ensure_admin_log_indexes(engine)
     Base.metadata.create_all(bind=engine)
+    ensure_attendance_rollups_populated(engine)
+    ensure_employee_search(engine)
+    job_service.start()
+    group_commit.start()
     yield
+    group_commit.stop()
+    job_service.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 app = FastAPI(title="HRMS Lite API", lifespan=lifespan)
@@ -38,3 +69,5 @@ app.include_router(admin_logs.router, prefix="/api")
 app.include_router(departments.router, prefix="/api")
 app.include_router(employees.router, prefix="/api")
 app.include_router(attendance.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
@@ -1,7 +1,22 @@
 """SQLAlchemy models."""
 from app.models.admin_log import AdminLog
 from app.models.attendance import Attendance
+from app.models.attendance_department_daily import AttendanceDepartmentDaily
+from app.models.attendance_monthly import AttendanceMonthly
+from app.models.attendance_summary import AttendanceSummary
 from app.models.department import Department
 from app.models.employee import Employee
+from app.models.job import Job
+from app.models.table_version import TableVersion
 
-__all__ = ["AdminLog", "Attendance", "Department", "Employee"]
+__all__ = [
+    "AdminLog",
+    "Attendance",
+    "AttendanceDepartmentDaily",
+    "AttendanceMonthly",
+    "AttendanceSummary",
+    "Department",
+    "Employee",
+    "Job",
+    "TableVersion",
+]
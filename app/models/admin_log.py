@@ -1,7 +1,7 @@
 """Admin log model: records every admin action on the platform."""
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Integer, Text
+from sqlalchemy import Column, DateTime, Index, Integer, Text
 
 from app.database import Base
 
@@ -11,7 +11,15 @@ class AdminLog(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    action = Column(Text, nullable=False, index=True)  # create, update, delete, bulk_create, etc.
-    entity_type = Column(Text, nullable=False, index=True)  # employee, department, attendance
+    action = Column(Text, nullable=False)  # create, update, delete, bulk_create, etc.
+    entity_type = Column(Text, nullable=False)  # employee, department, attendance
     entity_id = Column(Text, nullable=True)  # id or identifier of the entity
     details = Column(Text, nullable=True)  # human-readable description
+
+    # Keyset pages are ordered by (created_at, id) DESC; each filter gets an index that
+    # leads with the filter column and continues in page order, so no page needs a sort.
+    __table_args__ = (
+        Index("ix_admin_logs_created_id", created_at, id),
+        Index("ix_admin_logs_entity_type_created_id", entity_type, created_at, id),
+        Index("ix_admin_logs_action_created_id", action, created_at, id),
+    )
@@ -1,5 +1,5 @@
 """Attendance model."""
-from sqlalchemy import Column, Integer, Text, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -15,9 +15,14 @@ class Attendance(Base):
         nullable=False,
         index=True,
     )
-    date = Column(Text, nullable=False)
+    date = Column(Date, nullable=False)
     status = Column(Text, nullable=False)
 
-    __table_args__ = (UniqueConstraint("employee_id", "date", name="uq_employee_date"),)
+    __table_args__ = (
+        UniqueConstraint("employee_id", "date", name="uq_employee_date"),
+        # Date-leading covering index: date-range listings/aggregates are index range scans,
+        # and (date DESC, employee_id) is the listing order, so listings never sort.
+        Index("ix_attendance_date_employee", date.desc(), employee_id, status),
+    )
 
     employee = relationship("Employee", back_populates="attendance")
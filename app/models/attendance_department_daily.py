@@ -0,0 +1,18 @@
+"""Attendance department daily rollup model: present/absent counts per department per day."""
+from sqlalchemy import Column, Date, ForeignKey, Integer
+
+from app.database import Base
+
+
+class AttendanceDepartmentDaily(Base):
+    __tablename__ = "attendance_department_daily"
+
+    # Date-leading key so a date range is one index range scan.
+    date = Column(Date, primary_key=True)
+    department_id = Column(
+        Integer,
+        ForeignKey("departments.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    present_days = Column(Integer, nullable=False, default=0)
+    absent_days = Column(Integer, nullable=False, default=0)
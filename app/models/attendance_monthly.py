@@ -0,0 +1,19 @@
+"""Attendance monthly rollup model: per-employee present/absent counts per calendar month."""
+from sqlalchemy import Column, ForeignKey, Integer, Text
+
+from app.database import Base
+
+
+class AttendanceMonthly(Base):
+    __tablename__ = "attendance_monthly"
+
+    # Month-leading key so a range of months is one index range scan.
+    month = Column(Text, primary_key=True)  # YYYY-MM
+    employee_id = Column(
+        Text,
+        ForeignKey("employees.employee_id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    present_days = Column(Integer, nullable=False, default=0)
+    absent_days = Column(Integer, nullable=False, default=0)
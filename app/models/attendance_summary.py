@@ -0,0 +1,17 @@
+"""Attendance summary model: per-employee counters kept current by the attendance write paths."""
+from sqlalchemy import Column, Date, ForeignKey, Integer, Text
+
+from app.database import Base
+
+
+class AttendanceSummary(Base):
+    __tablename__ = "attendance_summary"
+
+    employee_id = Column(
+        Text,
+        ForeignKey("employees.employee_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    present_days = Column(Integer, nullable=False, default=0)
+    absent_days = Column(Integer, nullable=False, default=0)
+    last_marked_date = Column(Date, nullable=True)
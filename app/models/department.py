@@ -1,5 +1,5 @@
 """Department model."""
-from sqlalchemy import Column, Integer, Text
+from sqlalchemy import Column, Index, Integer, Text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -11,4 +11,7 @@ class Department(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(Text, unique=True, nullable=False, index=True)
 
+    # Case-insensitive duplicate checks on import are IN lookups on this index.
+    __table_args__ = (Index("ix_departments_name_nocase", name.collate("NOCASE")),)
+
     employees = relationship("Employee", back_populates="department")
@@ -1,5 +1,5 @@
 """Employee model."""
-from sqlalchemy import Column, Integer, Text, ForeignKey
+from sqlalchemy import Column, ForeignKey, Index, Integer, Text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -14,5 +14,8 @@ class Employee(Base):
     email = Column(Text, unique=True, nullable=False, index=True)
     department_id = Column(Integer, ForeignKey("departments.id", ondelete="RESTRICT"), nullable=False, index=True)
 
+    # Case-insensitive index: name-prefix pages are NOCASE range scans in (full_name, id) order.
+    __table_args__ = (Index("ix_employees_full_name_nocase", full_name.collate("NOCASE")),)
+
     department = relationship("Department", back_populates="employees")
     attendance = relationship("Attendance", back_populates="employee", cascade="all, delete-orphan")
@@ -0,0 +1,38 @@
+"""Job model: a background job (e.g. a CSV import) with its input file and resume checkpoint."""
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, Column, DateTime, Index, Integer, Text
+
+from app.database import Base
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Text, primary_key=True)  # uuid4 hex
+    kind = Column(Text, nullable=False)  # handler name, e.g. employees_csv
+    status = Column(Text, nullable=False, default="queued")  # queued, running, succeeded, failed, cancelled
+    file_path = Column(Text, nullable=False)  # copy of the upload under JOB_DIR
+    total_bytes = Column(Integer, nullable=False, default=0)
+
+    # Checkpoint, committed together with each processed chunk.
+    offset = Column(Integer, nullable=False, default=0)  # bytes of input consumed
+    line = Column(Integer, nullable=False, default=0)  # input lines consumed
+    fieldnames = Column(JSON, nullable=True)  # CSV header, once read
+    rows_processed = Column(Integer, nullable=False, default=0)
+    created = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=True)  # first per-row errors: [{"row", "detail"}]
+    error = Column(Text, nullable=True)  # why the whole job failed
+
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    owner = Column(Text, nullable=True)  # worker that claimed it
+    heartbeat_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # Start of the current run (after a resume), for the ETA.
+    run_started_at = Column(DateTime, nullable=True)
+    run_start_offset = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_jobs_status_created", status, created_at),)
@@ -0,0 +1,11 @@
+"""Table version model: a write counter per table, bumped in the writing transaction (see table_versions)."""
+from sqlalchemy import Column, Integer, Text
+
+from app.database import Base
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    name = Column(Text, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,21 +1,45 @@
 """Routes for /api/admin-logs. Read-only list of admin actions."""
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, Response
 
 from app.controllers import admin_log_controller
-from app.database import get_db
+from app.database import DbRunner, get_db_runner
 from app.schemas import AdminLogResponse
 
 router = APIRouter(prefix="/admin-logs", tags=["admin-logs"])
 
 
 @router.get("", response_model=list[AdminLogResponse])
-def list_admin_logs(
-    limit: int = 200,
-    offset: int = 0,
+async def list_admin_logs(
+    response: Response,
+    limit: int = Query(200, ge=1, le=admin_log_controller.MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    entity_type: str | None = None,
+    action: str | None = None,
+    created_from: datetime | None = Query(None, description="Only logs created at or after this time"),
+    created_to: datetime | None = Query(None, description="Only logs created at or before this time"),
+    before: str | None = Query(None, description="Cursor: the X-Next-Cursor of the previous page"),
+    run: DbRunner = Depends(get_db_runner),
+):
+    """List admin action logs (newest first). Optional filters: entity_type, action, created_from/created_to.
+    Page with `before` = previous X-Next-Cursor (constant cost per page, unlike `offset`)."""
+    return await run(
+        admin_log_controller.list_logs, response, limit=limit, offset=offset, entity_type=entity_type,
+        action=action, created_from=created_from, created_to=created_to, before=before,
+    )
+
+
+@router.get("/archive", response_model=list[AdminLogResponse])
+def list_archived_admin_logs(
+    limit: int = Query(200, ge=1, le=admin_log_controller.MAX_PAGE_SIZE),
     entity_type: str | None = None,
     action: str | None = None,
-    db: Session = Depends(get_db),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
 ):
-    """List admin action logs (newest first). Optional filters: entity_type, action."""
-    return admin_log_controller.list_logs(db, limit=limit, offset=offset, entity_type=entity_type, action=action)
+    """Search logs moved out of the database by retention (newest first). Narrow with
+    created_from/created_to: only the monthly archive files in range are read."""
+    return admin_log_controller.list_archived_logs(
+        limit=limit, entity_type=entity_type, action=action, created_from=created_from, created_to=created_to
+    )
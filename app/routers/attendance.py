@@ -1,41 +1,138 @@
 """Routes for /api/attendance. Delegates to controller."""
-from fastapi import APIRouter, Depends
+import asyncio
+from datetime import date as Date
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.controllers import attendance_controller
-from app.database import get_db
+from app.controllers import attendance_controller, employee_controller, fast_json, http_cache
+from app.database import DbRunner, QueryRunner, get_db, get_db_runner, get_query_runner
 from app.schemas import (
     AttendanceBulkCreate,
     AttendanceCreate,
+    AttendanceMultiDayBulkCreate,
     AttendanceResponse,
+    AttendanceRollupItem,
     AttendanceSummaryItem,
     BulkResult,
+    EmployeeResponse,
+    MultiDayBulkResult,
 )
 
 router = APIRouter(prefix="/attendance", tags=["attendance"])
 
 
 @router.get("", response_model=list[AttendanceResponse])
-def list_attendance(
-    date_from: str | None = None,
-    date_to: str | None = None,
-    db: Session = Depends(get_db),
+async def list_attendance(
+    date_from: Date | None = None,
+    date_to: Date | None = None,
+    run: DbRunner = Depends(get_db_runner),
 ):
     """List attendance records. Optionally filter by date range (YYYY-MM-DD)."""
-    return attendance_controller.list_attendance(db, date_from=date_from, date_to=date_to)
+    return await run(attendance_controller.list_attendance, date_from=date_from, date_to=date_to)
+
+
+@router.get("/export")
+def export_attendance(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    date_from: Date | None = None,
+    date_to: Date | None = None,
+):
+    """Stream attendance records (optionally within a date range) as NDJSON or CSV."""
+    return attendance_controller.export_attendance(format, date_from=date_from, date_to=date_to)
 
 
 @router.get("/summary", response_model=list[AttendanceSummaryItem])
-def list_attendance_summary(db: Session = Depends(get_db)):
-    """Per-employee total present and absent days."""
-    return attendance_controller.list_attendance_summary(db)
+async def list_attendance_summary(
+    request: Request,
+    date_from: Date | None = None,
+    date_to: Date | None = None,
+    department_id: int | None = None,
+    query: QueryRunner = Depends(get_query_runner),
+):
+    """Per-employee present and absent days, all time or within a date range (YYYY-MM-DD).
+    Supports If-None-Match (weak ETag)."""
+    return await http_cache.conditional_json(
+        request,
+        attendance_controller.SUMMARY_TABLES,
+        list[AttendanceSummaryItem],
+        lambda _response: query(
+            attendance_controller.list_attendance_summary(
+                date_from=date_from, date_to=date_to, department_id=department_id
+            )
+        ),
+    )
+
+
+@router.get("/roster", response_model=list[EmployeeResponse])
+async def attendance_roster(
+    request: Request,
+    date: Date,
+    state: Literal["unmarked", "absent", "present"] = "unmarked",
+    limit: int | None = Query(None, ge=1, le=employee_controller.MAX_PAGE_SIZE),
+    after: str | None = Query(None, description="Cursor: return employees with employeeId greater than this"),
+    department_id: int | None = None,
+    include_total: bool = False,
+    run: DbRunner = Depends(get_db_runner),
+):
+    """Employees not yet marked (or marked absent / present) on `date`, ordered by employeeId.
+    Absent means any status other than Present, as in the summaries. Pages of `limit` (default
+    100); pass `after` = previous X-Next-Cursor. Supports If-None-Match (weak ETag)."""
+    return await http_cache.conditional_json(
+        request,
+        attendance_controller.ROSTER_TABLES,
+        None if fast_json.FAST_JSON else list[EmployeeResponse],
+        lambda response: run(
+            attendance_controller.roster, response, date, state,
+            limit=limit, after=after, department_id=department_id, include_total=include_total,
+        ),
+    )
+
+
+@router.get("/rollup", response_model=list[AttendanceRollupItem])
+async def attendance_rollup(
+    request: Request,
+    date_from: Date,
+    date_to: Date,
+    group_by: Literal["department"] = "department",
+    granularity: Literal["day", "week", "month"] = Query("day", description="Bucket size; weeks start on Monday"),
+    department_id: int | None = None,
+    run: DbRunner = Depends(get_db_runner),
+):
+    """Present and absent days per department per bucket within [date_from, date_to] (at most
+    about three years), oldest bucket first. Served from daily department counters, so the cost
+    grows with departments x buckets. Supports If-None-Match (weak ETag)."""
+    return await http_cache.conditional_json(
+        request,
+        attendance_controller.ROLLUP_TABLES,
+        None if fast_json.FAST_JSON else list[AttendanceRollupItem],
+        lambda _response: run(
+            attendance_controller.attendance_rollup, date_from, date_to,
+            granularity=granularity, department_id=department_id,
+        ),
+    )
 
 
 @router.post("", status_code=201, response_model=AttendanceResponse)
-def create_attendance(body: AttendanceCreate, db: Session = Depends(get_db)):
-    return attendance_controller.create_attendance(body, db)
+async def create_attendance(body: AttendanceCreate):
+    """Mark (or re-mark) one employee's attendance. Marks arriving together are committed in one
+    transaction; the response is sent once that commit is done."""
+    future = attendance_controller.mark_writes.submit(body)
+    if future is None:
+        return await run_in_threadpool(attendance_controller.mark_writes.write, body)
+    return await asyncio.wrap_future(future)
 
 
 @router.post("/bulk", response_model=BulkResult)
 def bulk_attendance(body: AttendanceBulkCreate, db: Session = Depends(get_db)):
     return attendance_controller.bulk_attendance(body, db)
+
+
+@router.post("/bulk/multi-day", response_model=MultiDayBulkResult)
+def bulk_attendance_multi_day(body: AttendanceMultiDayBulkCreate, db: Session = Depends(get_db)):
+    """Upsert attendance across dates: `records` = [{employeeId, date, status}, ...], or
+    `dateRange` = {dateFrom, dateTo, employees: [{employeeId, pattern: ["Present", null, ...]}]}
+    (pattern repeats from dateFrom; null skips the day). Committed in chunks, reported per chunk."""
+    return attendance_controller.bulk_attendance_multi_day(body, db)
@@ -1,20 +1,68 @@
 """Routes for /api/departments. Delegates to controller."""
 import csv
 import io
+from typing import Literal
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
-from app.controllers import department_controller
-from app.database import get_db
-from app.schemas import BulkResult, DepartmentBulkCreate, DepartmentCreate, DepartmentResponse, DepartmentWithEmployeesResponse
+from app.controllers import department_controller, employee_controller, fast_json, http_cache
+from app.database import QueryRunner, get_db, get_query_runner
+from app.schemas import (
+    BulkResult,
+    DepartmentBulkCreate,
+    DepartmentCreate,
+    DepartmentResponse,
+    DepartmentSummary,
+    DepartmentWithEmployeesResponse,
+    EmployeeResponse,
+    JobResponse,
+)
 
 router = APIRouter(prefix="/departments", tags=["departments"])
 
 
-@router.get("", response_model=list[DepartmentWithEmployeesResponse])
-def list_departments(db: Session = Depends(get_db)):
-    return department_controller.list_departments(db)
+@router.get("", response_model=list[DepartmentSummary] | list[DepartmentWithEmployeesResponse])
+async def list_departments(
+    request: Request,
+    expand: Literal["employees"] | None = Query(None, description="employees: embed each department's employees"),
+    query: QueryRunner = Depends(get_query_runner),
+):
+    """List departments with their employee counts. expand=employees also embeds every employee;
+    otherwise page through GET /api/departments/{id}/employees. Supports If-None-Match (weak ETag)."""
+    expand_employees = expand == "employees"
+    response_type = list[DepartmentWithEmployeesResponse] if expand_employees else list[DepartmentSummary]
+    return await http_cache.conditional_json(
+        request,
+        department_controller.LIST_TABLES,
+        None if fast_json.FAST_JSON else response_type,
+        lambda _response: query(department_controller.list_departments(expand_employees)),
+    )
+
+
+@router.get("/{id}/employees", response_model=list[EmployeeResponse])
+async def list_department_employees(
+    request: Request,
+    id: int,
+    limit: int | None = Query(None, ge=1, le=employee_controller.MAX_PAGE_SIZE),
+    after: int | None = Query(None, description="Cursor: return employees with id greater than this"),
+    include_total: bool = False,
+    query: QueryRunner = Depends(get_query_runner),
+):
+    """Page through a department's employees ordered by id (default page 100; next cursor in
+    X-Next-Cursor). Supports If-None-Match (weak ETag)."""
+    return await http_cache.conditional_json(
+        request,
+        department_controller.LIST_TABLES,
+        None if fast_json.FAST_JSON else list[EmployeeResponse],
+        lambda response: query(
+            department_controller.list_department_employees(
+                response, id, limit=limit, after=after, include_total=include_total
+            )
+        ),
+    )
 
 
 @router.post("", status_code=201, response_model=DepartmentResponse)
@@ -28,14 +76,27 @@ def bulk_create_departments(body: DepartmentBulkCreate, db: Session = Depends(ge
     return department_controller.bulk_create_departments(db, body.names)
 
 
-@router.post("/bulk/csv", response_model=BulkResult)
+@router.post(
+    "/bulk/csv",
+    response_model=BulkResult,
+    responses={202: {"model": JobResponse, "description": "Queued as a background job (background=true)"}},
+)
 async def bulk_create_departments_csv(
     file: UploadFile = File(..., description="CSV with a 'name' column (or first column = department name)"),
+    background: bool = Query(False, description="Queue the import and return 202 with a job; poll GET /api/jobs/{id}"),
     db: Session = Depends(get_db),
 ):
-    """Bulk create departments from CSV. CSV must have header row with column 'name', or no header (first column = name)."""
+    """Bulk create departments from CSV. CSV must have header row with column 'name', or no header (first column = name).
+    With background=true the import runs as a resumable job, one transaction per chunk."""
     if not file.filename or not file.filename.lower().endswith(".csv"):
         raise HTTPException(400, "Upload a .csv file.")
+    if background:
+        job = await run_in_threadpool(department_controller.queue_departments_csv_import, db, file.file)
+        return JSONResponse(
+            job.model_dump(mode="json", by_alias=True),
+            status_code=202,
+            headers={"Location": f"/api/jobs/{job.id}"},
+        )
     try:
         raw = await file.read()
         text = raw.decode("utf-8-sig").strip()
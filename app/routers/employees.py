@@ -1,26 +1,89 @@
 """Routes for /api/employees. Delegates to controller."""
 import csv
 import io
-import re
+from datetime import date as Date
+from typing import Literal
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
-from app.controllers import employee_controller
-from app.database import get_db
-from app.schemas import BulkResult, EmployeeBulkCreate, EmployeeCreate, EmployeeResponse
-from app.services import department_service
+from app.controllers import attendance_controller, employee_controller, fast_json, http_cache
+from app.database import DbRunner, QueryRunner, get_db, get_db_runner, get_query_runner
+from app.schemas import (
+    BulkResult,
+    EmployeeAttendanceHistory,
+    EmployeeBulkCreate,
+    EmployeeCreate,
+    EmployeeResponse,
+    JobResponse,
+)
 
 router = APIRouter(prefix="/employees", tags=["employees"])
 
 
-def _norm_key(s: str) -> str:
-    return re.sub(r"\s+", "_", (s or "").strip().lower())
+@router.get("", response_model=list[EmployeeResponse])
+async def list_employees(
+    request: Request,
+    limit: int | None = Query(None, ge=1, le=employee_controller.MAX_PAGE_SIZE),
+    after: str | None = Query(None, description="Cursor: the X-Next-Cursor of the previous page"),
+    department_id: int | None = None,
+    prefix: str | None = Query(
+        None, description="Case-insensitive prefix of full name or email; pages are then ordered by the matching name or email"
+    ),
+    include_total: bool = False,
+    query: QueryRunner = Depends(get_query_runner),
+):
+    """List employees ordered by id (by matching name or email, then id, with `prefix`). Pass `limit`
+    (and `after` = previous X-Next-Cursor) to page. Supports If-None-Match (weak ETag)."""
+    return await http_cache.conditional_json(
+        request,
+        employee_controller.LIST_TABLES,
+        None if fast_json.FAST_JSON else list[EmployeeResponse],
+        lambda response: query(
+            employee_controller.list_employees(
+                response, limit=limit, after=after,
+                department_id=department_id, prefix=prefix, include_total=include_total,
+            )
+        ),
+    )
 
 
-@router.get("", response_model=list[EmployeeResponse])
-def list_employees(db: Session = Depends(get_db)):
-    return employee_controller.list_employees(db)
+@router.get("/search", response_model=list[EmployeeResponse])
+async def search_employees(
+    request: Request,
+    q: str = Query(..., min_length=1, description="Words to match (each as a prefix) in name, email, employee ID or department"),
+    limit: int | None = Query(None, ge=1, le=employee_controller.MAX_SEARCH_LIMIT),
+    department_id: int | None = None,
+    run: DbRunner = Depends(get_db_runner),
+):
+    """Search employees, best matches first (default 20 results). Supports If-None-Match (weak ETag)."""
+    return await http_cache.conditional_json(
+        request,
+        employee_controller.LIST_TABLES,
+        None if fast_json.FAST_JSON else list[EmployeeResponse],
+        lambda _response: run(employee_controller.search_employees, q, limit=limit, department_id=department_id),
+    )
+
+
+@router.get(
+    "/{employee_id}/attendance",
+    response_model=EmployeeAttendanceHistory,
+    response_model_exclude_none=True,
+)
+async def employee_attendance(
+    employee_id: str,
+    format: Literal["days", "bitmap"] = Query(
+        "days", description="days: one object per marked day; bitmap: one base64 2-bit-per-day bitmap per year"
+    ),
+    date_from: Date | None = None,
+    date_to: Date | None = None,
+    run: DbRunner = Depends(get_db_runner),
+):
+    """One employee's attendance history, optionally within a date range (YYYY-MM-DD)."""
+    return await run(
+        attendance_controller.employee_attendance, employee_id, format, date_from=date_from, date_to=date_to
+    )
 
 
 @router.post("", status_code=201, response_model=EmployeeResponse)
@@ -39,59 +102,33 @@ def bulk_create_employees(body: EmployeeBulkCreate, db: Session = Depends(get_db
     return employee_controller.bulk_create_employees(db, body.employees)
 
 
-@router.post("/bulk/csv", response_model=BulkResult)
-async def bulk_create_employees_csv(
+@router.post(
+    "/bulk/csv",
+    response_model=BulkResult,
+    responses={202: {"model": JobResponse, "description": "Queued as a background job (background=true)"}},
+)
+def bulk_create_employees_csv(
     file: UploadFile = File(..., description="CSV: employee_id, full_name, email, department_id (or department_name)"),
+    background: bool = Query(False, description="Queue the import and return 202 with a job; poll GET /api/jobs/{id}"),
     db: Session = Depends(get_db),
 ):
-    """Bulk create employees from CSV. Columns: employee_id (or employeeId), full_name (or fullName), email, department_id (or departmentId) or department_name."""
+    """Bulk create employees from CSV. Columns: employee_id (or employeeId), full_name (or fullName), email, department_id (or departmentId) or department_name.
+    The upload is parsed as a stream, so memory does not grow with file size. Rejected rows are listed in `errors`.
+    With background=true the import runs as a resumable job, one transaction per chunk."""
     if not file.filename or not file.filename.lower().endswith(".csv"):
         raise HTTPException(400, "Upload a .csv file.")
+    if background:
+        job = employee_controller.queue_employees_csv_import(db, file.file)
+        return JSONResponse(
+            job.model_dump(mode="json", by_alias=True),
+            status_code=202,
+            headers={"Location": f"/api/jobs/{job.id}"},
+        )
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
     try:
-        raw = await file.read()
-        text = raw.decode("utf-8-sig").strip()
-    except Exception as e:
-        raise HTTPException(400, f"Could not read file as UTF-8: {e}") from e
-    if not text:
-        raise HTTPException(400, "CSV file is empty.")
-    reader = csv.DictReader(io.StringIO(text))
-    # Normalize column names: strip, lowercase, spaces -> underscores
-    if not reader.fieldnames:
-        raise HTTPException(400, "CSV has no header row.")
-    key_map = {_norm_key(f): f for f in reader.fieldnames}
-    def get(row: dict, *candidates: str) -> str | None:
-        for c in candidates:
-            k = _norm_key(c)
-            if k in key_map and row.get(key_map[k]):
-                return (row.get(key_map[k]) or "").strip()
-        return None
-    employees: list[EmployeeCreate] = []
-    dept_by_name: dict[str, int] = {}
-    for row in reader:
-        eid = get(row, "employee_id", "employeeId", "employee id")
-        full_name = get(row, "full_name", "fullName", "full name")
-        email = get(row, "email")
-        dept_id_val = get(row, "department_id", "departmentId", "department id")
-        dept_name_val = get(row, "department_name", "departmentName", "department name")
-        if not eid or not full_name or not email:
-            continue
-        department_id: int | None = None
-        if dept_id_val and dept_id_val.isdigit():
-            department_id = int(dept_id_val)
-        elif dept_name_val:
-            if dept_name_val not in dept_by_name:
-                d = department_service.get_by_name(db, dept_name_val)
-                if d:
-                    dept_by_name[dept_name_val] = d.id
-            department_id = dept_by_name.get(dept_name_val)
-        if department_id is None:
-            continue
-        try:
-            employees.append(
-                EmployeeCreate(employeeId=eid, fullName=full_name, email=email, departmentId=department_id)
-            )
-        except Exception:
-            continue
-    if not employees:
-        raise HTTPException(400, "No valid employee rows (need employee_id, full_name, email, department_id or department_name).")
-    return employee_controller.bulk_create_employees(db, employees)
+        return employee_controller.import_employees_csv(db, stream)
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.rollback()
+        raise HTTPException(400, f"Could not read file as UTF-8 CSV: {e}") from e
+    finally:
+        stream.detach()  # leave the upload's file open; UploadFile closes it
@@ -0,0 +1,21 @@
+"""Routes for /api/jobs. Progress and cancellation of background jobs."""
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.controllers import job_controller
+from app.database import DbRunner, get_db, get_db_runner
+from app.schemas import JobResponse
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, run: DbRunner = Depends(get_db_runner)):
+    """Status, rows processed/created/failed, per-row errors, progress (0..1) and ETA of a job."""
+    return await run(job_controller.get_job, job_id)
+
+
+@router.post("/{job_id}/cancel", status_code=202, response_model=JobResponse)
+def cancel_job(job_id: str, db: Session = Depends(get_db)):
+    """Cancel a queued job, or stop a running one after its current chunk (committed chunks are kept)."""
+    return job_controller.cancel_job(db, job_id)
@@ -0,0 +1,12 @@
+"""Routes for /api/metrics. Read-only in-process counters (per worker process)."""
+from fastapi import APIRouter
+
+from app.services import lookup_cache
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/cache")
+def cache_stats():
+    """Hit/miss counters and size of the department/employee lookup caches."""
+    return lookup_cache.all_stats()
@@ -1,5 +1,5 @@
 """Pydantic request/response models for API."""
-from datetime import datetime
+from datetime import date as Date, datetime
 from typing import Literal
 
 from pydantic import BaseModel, EmailStr, Field
@@ -33,14 +33,19 @@ class EmployeeSummary(BaseModel):
     model_config = {"from_attributes": True, "populate_by_name": True}
 
 
-class DepartmentWithEmployeesResponse(BaseModel):
+class DepartmentSummary(BaseModel):
+    """Department list item: the employee count instead of the employees themselves."""
     id: int
     name: str
-    employees: list[EmployeeSummary] = Field(default_factory=list, alias="employees")
+    employee_count: int = Field(0, alias="employeeCount")
 
     model_config = {"from_attributes": True, "populate_by_name": True}
 
 
+class DepartmentWithEmployeesResponse(DepartmentSummary):
+    employees: list[EmployeeSummary] = Field(default_factory=list, alias="employees")
+
+
 # --- Employee ---
 
 class EmployeeCreate(BaseModel):
@@ -72,7 +77,7 @@ class EmployeeBulkCreate(BaseModel):
 
 class AttendanceCreate(BaseModel):
     employee_id: str = Field(..., alias="employeeId")
-    date: str = Field(..., pattern=r"^\d{4}-\d{2}-\d{2}$")
+    date: Date
     status: Literal["Present", "Absent"]
 
     model_config = {"populate_by_name": True}
@@ -86,13 +91,41 @@ class AttendanceRecordItem(BaseModel):
 
 
 class AttendanceBulkCreate(BaseModel):
-    date: str = Field(..., pattern=r"^\d{4}-\d{2}-\d{2}$")
+    date: Date
     records: list[AttendanceRecordItem] = Field(..., min_length=1)
 
 
+class AttendanceDatedRecordItem(AttendanceRecordItem):
+    date: Date
+
+
+class AttendanceRangeEmployee(BaseModel):
+    """One employee's statuses over a range: `pattern` repeats from date_from, null = leave the day alone."""
+    employee_id: str = Field(..., alias="employeeId")
+    pattern: list[Literal["Present", "Absent"] | None] = Field(..., min_length=1)
+
+    model_config = {"populate_by_name": True}
+
+
+class AttendanceDateRange(BaseModel):
+    date_from: Date = Field(..., alias="dateFrom")
+    date_to: Date = Field(..., alias="dateTo")
+    employees: list[AttendanceRangeEmployee] = Field(..., min_length=1)
+
+    model_config = {"populate_by_name": True}
+
+
+class AttendanceMultiDayBulkCreate(BaseModel):
+    """Multi-day bulk upsert: either `records` ({employeeId, date, status} triples) or `dateRange`."""
+    records: list[AttendanceDatedRecordItem] | None = None
+    date_range: AttendanceDateRange | None = Field(None, alias="dateRange")
+
+    model_config = {"populate_by_name": True}
+
+
 class AttendanceResponse(BaseModel):
     id: int
-    date: str
+    date: Date
     employee_id: str = Field(..., alias="employeeId")
     employee_name: str | None = Field(None, alias="employeeName")
     status: str
@@ -110,10 +143,71 @@ class AttendanceSummaryItem(BaseModel):
     model_config = {"populate_by_name": True}
 
 
+class AttendanceRollupItem(BaseModel):
+    """Present/absent days of one department in one bucket (labelled by its start date)."""
+    bucket: Date
+    department_id: int = Field(..., alias="departmentId")
+    department_name: str = Field(..., alias="departmentName")
+    present_days: int = Field(0, alias="presentDays")
+    absent_days: int = Field(0, alias="absentDays")
+
+    model_config = {"populate_by_name": True}
+
+
+class AttendanceDay(BaseModel):
+    date: Date
+    status: str
+
+
+class AttendanceYearBitmap(BaseModel):
+    """One calendar year of attendance, 2 bits per day from 1 January (00 unmarked, 01 present,
+    10 absent, 11 other), four days per byte starting at the low bits, base64."""
+    year: int
+    days: int
+    present: int = 0
+    absent: int = 0
+    bitmap: str
+
+
+class EmployeeAttendanceHistory(BaseModel):
+    """One employee's attendance: `days` (format=days) or `years` (format=bitmap)."""
+    employee_id: str = Field(..., alias="employeeId")
+    days: list[AttendanceDay] | None = None
+    years: list[AttendanceYearBitmap] | None = None
+
+    model_config = {"populate_by_name": True}
+
+
+class BulkRowError(BaseModel):
+    """Why one input row was not imported (row = line number in the uploaded file)."""
+    row: int
+    detail: str
+
+
 class BulkResult(BaseModel):
     created: int = 0
     updated: int = 0
     failed: int = 0
+    errors: list[BulkRowError] = []
+
+
+class BulkChunkResult(BaseModel):
+    """Outcome of one chunk (one transaction) of a multi-day bulk upsert."""
+    index: int
+    date_from: Date = Field(..., alias="dateFrom")
+    date_to: Date = Field(..., alias="dateTo")
+    rows: int
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    committed: bool = True
+    error: str | None = None
+
+    model_config = {"populate_by_name": True}
+
+
+class MultiDayBulkResult(BulkResult):
+    chunks: list[BulkChunkResult] = []
 
 
 # --- Admin log ---
@@ -127,3 +221,26 @@ class AdminLogResponse(BaseModel):
     details: str | None = None
 
     model_config = {"from_attributes": True, "populate_by_name": True}
+
+
+# --- Jobs ---
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str  # queued, running, succeeded, failed, cancelled
+    rows_processed: int = Field(0, alias="rowsProcessed")
+    created: int = 0
+    failed: int = 0
+    errors: list[BulkRowError] = []
+    error: str | None = None
+    bytes_processed: int = Field(0, alias="bytesProcessed")
+    total_bytes: int = Field(0, alias="totalBytes")
+    progress: float = 0.0  # 0..1, by bytes of input
+    eta_seconds: float | None = Field(None, alias="etaSeconds")
+    cancel_requested: bool = Field(False, alias="cancelRequested")
+    created_at: datetime = Field(..., alias="createdAt")
+    started_at: datetime | None = Field(None, alias="startedAt")
+    finished_at: datetime | None = Field(None, alias="finishedAt")
+
+    model_config = {"populate_by_name": True}
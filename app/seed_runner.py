@@ -1,11 +1,13 @@
 """Seed DB with departments, employees, and sample attendance. Idempotent; skips if data exists."""
 import copy
+from datetime import date as Date
 
 from sqlalchemy import select
 
 from app.database import Base, SessionLocal, engine
 from app.db_migrations import ensure_employees_department_id
 from app.models import Attendance, Department, Employee
+from app.services import attendance_summary_service
 
 SEED_DEPARTMENTS = ["Engineering", "HR", "Sales", "Finance"]
 
@@ -64,7 +66,9 @@ def run_seed():
         db.commit()
 
         for employee_id, date, status in SAMPLE_ATTENDANCE:
-            db.add(Attendance(employee_id=employee_id, date=date, status=status))
+            db.add(Attendance(employee_id=employee_id, date=Date.fromisoformat(date), status=status))
+        db.flush()
+        attendance_summary_service.rebuild(db)
         db.commit()
     finally:
         db.close()
@@ -0,0 +1,146 @@
+"""Admin log retention: move old admin_logs rows into gzip NDJSON archives.
+
+Rows older than the retention age are written to one file per calendar month
+(`admin_logs-YYYY-MM.ndjson.gz` under ADMIN_LOG_ARCHIVE_DIR), in the same camelCase shape
+as GET /api/admin-logs, and then deleted in batches. Each batch is appended as a new gzip
+member and fsynced before its rows are deleted, so a crash can at worst archive a batch
+twice; `query` skips repeated ids.
+"""
+import glob
+import gzip
+import json
+import os
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+from pydantic import TypeAdapter
+from sqlalchemy import Engine, delete, select, text
+from sqlalchemy.orm import Session
+
+from app.models import AdminLog
+from app.schemas import AdminLogResponse
+from app.services.batching import chunked
+
+ADMIN_LOG_RETENTION_DAYS = int(os.getenv("ADMIN_LOG_RETENTION_DAYS", "365"))
+ADMIN_LOG_ARCHIVE_DIR = os.getenv("ADMIN_LOG_ARCHIVE_DIR", "./archive/admin_logs")
+VACUUM_PAGES_PER_RUN = 10000  # ~40 MiB at the default 4 KiB page size
+
+_FILE_PREFIX = "admin_logs-"
+_FILE_SUFFIX = ".ndjson.gz"
+_adapter = TypeAdapter(AdminLogResponse)
+
+
+def _path(archive_dir: str, month: str) -> str:
+    return os.path.join(archive_dir, f"{_FILE_PREFIX}{month}{_FILE_SUFFIX}")
+
+
+def _append(path: str, lines: list[bytes]) -> None:
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+            gz.write(b"\n".join(lines) + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def archive_older_than(
+    db: Session,
+    cutoff: datetime,
+    archive_dir: str = ADMIN_LOG_ARCHIVE_DIR,
+    batch_size: int = 5000,
+) -> int:
+    """Archive and delete admin logs created before `cutoff`, oldest first, one transaction per batch.
+
+    Returns the number of rows archived.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    total = 0
+    while True:
+        logs = db.execute(
+            select(AdminLog)
+            .where(AdminLog.created_at < cutoff)
+            .order_by(AdminLog.created_at, AdminLog.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not logs:
+            return total
+        by_month: dict[str, list[bytes]] = defaultdict(list)
+        for log in logs:
+            by_month[log.created_at.strftime("%Y-%m")].append(
+                _adapter.dump_json(AdminLogResponse.model_validate(log), by_alias=True)
+            )
+        for month, lines in by_month.items():
+            _append(_path(archive_dir, month), lines)
+        for ids in chunked([log.id for log in logs]):
+            db.execute(
+                delete(AdminLog).where(AdminLog.id.in_(ids)).execution_options(synchronize_session=False)
+            )
+        db.commit()
+        db.expunge_all()
+        total += len(logs)
+
+
+def apply_retention(db: Session, days: int = ADMIN_LOG_RETENTION_DAYS, **kwargs) -> int:
+    """Archive admin logs older than `days` days. Does not vacuum."""
+    return archive_older_than(db, datetime.utcnow() - timedelta(days=days), **kwargs)
+
+
+def incremental_vacuum(engine: Engine, pages: int = VACUUM_PAGES_PER_RUN) -> int | None:
+    """Return up to `pages` free pages to the filesystem.
+
+    Needs auto_vacuum=INCREMENTAL (see `enable_incremental_vacuum`); returns None when the
+    database is not in that mode, otherwise the number of pages still free afterwards.
+    """
+    with engine.begin() as conn:
+        if conn.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+            return None
+        # Each result row is one freed page; the pragma only runs as far as it is stepped.
+        result = conn.execute(text(f"PRAGMA incremental_vacuum({int(pages)})"))
+        if result.returns_rows:
+            result.fetchall()
+        return conn.execute(text("PRAGMA freelist_count")).scalar()
+
+
+def enable_incremental_vacuum(engine: Engine) -> None:
+    """Switch an existing database to auto_vacuum=INCREMENTAL. Rewrites the file (full VACUUM) once."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("PRAGMA auto_vacuum=INCREMENTAL"))
+        conn.execute(text("VACUUM"))
+
+
+def _months(archive_dir: str) -> list[str]:
+    paths = glob.glob(os.path.join(archive_dir, f"{_FILE_PREFIX}*{_FILE_SUFFIX}"))
+    return sorted(os.path.basename(p)[len(_FILE_PREFIX):-len(_FILE_SUFFIX)] for p in paths)
+
+
+def query(
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    entity_type: str | None = None,
+    action: str | None = None,
+    archive_dir: str = ADMIN_LOG_ARCHIVE_DIR,
+) -> Iterator[dict]:
+    """Yield archived logs (camelCase dicts) matching the filters, newest first.
+
+    Only month files overlapping [created_from, created_to] are opened; memory is bounded by
+    the matches in one month.
+    """
+    lo = created_from.strftime("%Y-%m") if created_from else None
+    hi = created_to.strftime("%Y-%m") if created_to else None
+    for month in reversed(_months(archive_dir)):
+        if (lo and month < lo) or (hi and month > hi):
+            continue
+        matches: dict[int, tuple[datetime, dict]] = {}
+        with gzip.open(_path(archive_dir, month), "rt", encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                if entity_type and row["entityType"] != entity_type:
+                    continue
+                if action and row["action"] != action:
+                    continue
+                created_at = datetime.fromisoformat(row["createdAt"])
+                if (created_from and created_at < created_from) or (created_to and created_at > created_to):
+                    continue
+                matches[row["id"]] = (created_at, row)
+        for _, row in sorted(matches.values(), key=lambda m: (m[0], m[1]["id"]), reverse=True):
+            yield row
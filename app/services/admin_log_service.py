@@ -1,5 +1,11 @@
-"""Admin log service: record and list admin actions."""
-from sqlalchemy import select
+"""Admin log service: record and list admin actions.
+
+Log rows are staged in the caller's session and committed with the change they describe:
+one transaction (and one fsync) per request, and no entity write without its log entry.
+"""
+from datetime import datetime
+
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
 
 from app.models import AdminLog
@@ -12,6 +18,7 @@ def create(
     entity_id: str | int | None = None,
     details: str | None = None,
 ) -> AdminLog:
+    """Stage an admin log row in the caller's transaction. Does not commit."""
     log = AdminLog(
         action=action.strip(),
         entity_type=entity_type.strip(),
@@ -19,22 +26,38 @@ def create(
         details=(details or "").strip() or None,
     )
     db.add(log)
-    db.commit()
-    db.refresh(log)
     return log
 
 
+# Keyset position: (created_at, id) of the last log on the previous page.
+LogCursor = tuple[datetime, int]
+
+
 def list_logs(
     db: Session,
     limit: int = 200,
     offset: int = 0,
     entity_type: str | None = None,
     action: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    before: LogCursor | None = None,
 ) -> list[AdminLog]:
-    stmt = select(AdminLog).order_by(AdminLog.created_at.desc())
+    """Newest first, ordered by (created_at, id) DESC.
+
+    Pass `before` (the last row of the previous page) instead of `offset` to page: each
+    page is then a range seek on a (filter, created_at, id) index, however deep it is.
+    """
+    stmt = select(AdminLog).order_by(AdminLog.created_at.desc(), AdminLog.id.desc())
     if entity_type:
         stmt = stmt.where(AdminLog.entity_type == entity_type)
     if action:
         stmt = stmt.where(AdminLog.action == action)
+    if created_from is not None:
+        stmt = stmt.where(AdminLog.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(AdminLog.created_at <= created_to)
+    if before is not None:
+        stmt = stmt.where(tuple_(AdminLog.created_at, AdminLog.id) < tuple_(*before))
     stmt = stmt.limit(limit).offset(offset)
     return list(db.execute(stmt).scalars().all())
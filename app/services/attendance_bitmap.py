@@ -0,0 +1,54 @@
+"""Calendar-bitmap encoding of one employee's attendance.
+
+Each calendar year is 2 bits per day from 1 January (day index = date.toordinal() minus
+1 Jan's ordinal), four days per byte with the first day in the lowest bits, base64 encoded.
+A 366-day year is 92 bytes (124 base64 characters).
+"""
+import base64
+import calendar
+from collections.abc import Iterable
+from datetime import date as Date
+
+UNMARKED, PRESENT, ABSENT, OTHER = 0, 1, 2, 3
+_CODES = {"present": PRESENT, "absent": ABSENT}
+
+
+def _days_in(year: int) -> int:
+    return 366 if calendar.isleap(year) else 365
+
+
+def encode_years(rows: Iterable[tuple[Date, str]], years: Iterable[int]) -> list[dict]:
+    """One {year, days, present, absent, bitmap} dict per year in `years` from (date, status)
+    rows; days without a row (or outside the rows given) are UNMARKED."""
+    out: dict[int, dict] = {}
+    bitmaps: dict[int, bytearray] = {}
+    for year in years:
+        days = _days_in(year)
+        out[year] = {"year": year, "days": days, "present": 0, "absent": 0, "bitmap": ""}
+        bitmaps[year] = bytearray((days + 3) // 4)
+    for date, status in rows:
+        bitmap = bitmaps.get(date.year)
+        if bitmap is None:
+            continue
+        code = _CODES.get((status or "").lower(), OTHER)
+        index = date.toordinal() - Date(date.year, 1, 1).toordinal()
+        bitmap[index >> 2] |= code << ((index & 3) * 2)
+        if code == PRESENT:
+            out[date.year]["present"] += 1
+        elif code == ABSENT:
+            out[date.year]["absent"] += 1
+    for year, bitmap in bitmaps.items():
+        out[year]["bitmap"] = base64.b64encode(bytes(bitmap)).decode("ascii")
+    return list(out.values())
+
+
+def decode_year(year: int, bitmap: str) -> dict[Date, int]:
+    """Inverse of one encode_years entry: the marked days of `year` and their codes."""
+    data = base64.b64decode(bitmap)
+    start = Date(year, 1, 1).toordinal()
+    marked: dict[Date, int] = {}
+    for index in range(_days_in(year)):
+        code = (data[index >> 2] >> ((index & 3) * 2)) & 3
+        if code:
+            marked[Date.fromordinal(start + index)] = code
+    return marked
@@ -1,16 +1,21 @@
 """Attendance service: DB operations for attendance."""
-from collections import defaultdict
+from collections.abc import Iterator
+from datetime import date as Date
 
-from sqlalchemy import func, select
+from sqlalchemy import Result, exists, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
+from app.database import Query
 from app.models import Attendance, Department, Employee
+from app.services import attendance_summary_service, employee_service
+from app.services.batching import chunked
 
 
 def get_all_with_employee_name(
     db: Session,
-    date_from: str | None = None,
-    date_to: str | None = None,
+    date_from: Date | None = None,
+    date_to: Date | None = None,
 ) -> list[dict]:
     stmt = (
         select(Attendance, Employee.full_name, Department.name)
@@ -21,7 +26,7 @@ def get_all_with_employee_name(
         stmt = stmt.where(Attendance.date >= date_from)
     if date_to:
         stmt = stmt.where(Attendance.date <= date_to)
-    stmt = stmt.order_by(Attendance.date.desc(), Attendance.id)
+    stmt = stmt.order_by(Attendance.date.desc(), Attendance.employee_id)
     rows = db.execute(stmt).all()
     return [
         {
@@ -36,36 +41,118 @@ def get_all_with_employee_name(
     ]
 
 
-def get_attendance_summary(db: Session) -> list[dict]:
-    """Per-employee present/absent day counts. Includes all employees (0s if no records)."""
+EXPORT_COLUMNS = ("id", "date", "employeeId", "employeeName", "departmentName", "status")
+
+
+def iter_export_rows(
+    db: Session,
+    date_from: Date | None = None,
+    date_to: Date | None = None,
+    batch_size: int = 2000,
+) -> Iterator[list[tuple]]:
+    """Yield batches of plain tuples (in EXPORT_COLUMNS order) for the attendance listing.
+
+    Selects columns only (no ORM entities) and streams with yield_per, so memory is bounded
+    by `batch_size` regardless of the date range.
+    """
     stmt = (
-        select(Attendance.employee_id, Attendance.status, func.count(Attendance.id).label("cnt"))
-        .group_by(Attendance.employee_id, Attendance.status)
+        select(
+            Attendance.id,
+            Attendance.date,
+            Attendance.employee_id,
+            Employee.full_name,
+            Department.name,
+            Attendance.status,
+        )
+        .join(Employee, Attendance.employee_id == Employee.employee_id)
+        .outerjoin(Department, Department.id == Employee.department_id)
     )
-    rows = db.execute(stmt).all()
-    summary: dict[str, dict] = defaultdict(lambda: {"present_days": 0, "absent_days": 0})
-    for employee_id, status, count in rows:
-        key = employee_id
-        if (status or "").lower() == "present":
-            summary[key]["present_days"] = count
-        else:
-            summary[key]["absent_days"] = count
+    if date_from:
+        stmt = stmt.where(Attendance.date >= date_from)
+    if date_to:
+        stmt = stmt.where(Attendance.date <= date_to)
+    stmt = stmt.order_by(Attendance.date.desc(), Attendance.employee_id).execution_options(yield_per=batch_size)
+    for partition in db.execute(stmt).partitions():
+        yield [tuple(row) for row in partition]
 
-    from app.services import employee_service
 
-    employees = employee_service.get_all(db)
-    return [
-        {
-            "employee_id": emp.employee_id,
-            "employee_name": emp.full_name,
-            "present_days": summary[emp.employee_id]["present_days"],
-            "absent_days": summary[emp.employee_id]["absent_days"],
-        }
-        for emp in employees
-    ]
+def get_attendance_summary(
+    date_from: Date | None = None,
+    date_to: Date | None = None,
+    department_id: int | None = None,
+) -> Query[list[dict]]:
+    """Per-employee present/absent day counts. Includes all employees (0s if no records).
+
+    Served from the incrementally maintained rollup tables (see attendance_summary_service).
+    """
+    return (
+        yield from attendance_summary_service.get_range(
+            date_from=date_from, date_to=date_to, department_id=department_id
+        )
+    )
+
+
+def history(
+    db: Session,
+    employee_id: str,
+    date_from: Date | None = None,
+    date_to: Date | None = None,
+) -> list[tuple[Date, str]]:
+    """(date, status) of one employee's records, oldest first; a range scan on uq_employee_date."""
+    stmt = select(Attendance.date, Attendance.status).where(Attendance.employee_id == employee_id)
+    if date_from:
+        stmt = stmt.where(Attendance.date >= date_from)
+    if date_to:
+        stmt = stmt.where(Attendance.date <= date_to)
+    return [tuple(row) for row in db.execute(stmt.order_by(Attendance.date))]
+
 
+def _roster_select(date: Date, state: str, department_id: int | None = None):
+    """Employee list columns of the roster of `date`, and the employee_id column it pages by.
 
-def get_by_employee_date(db: Session, employee_id: str, date: str) -> Attendance | None:
+    unmarked: employees in employee_id order with a NOT EXISTS probe of uq_employee_date.
+    present/absent: driven from attendance on `date` through ix_attendance_date_employee
+    (date, employee_id, status), so the work is bounded by the page, not the workforce.
+    Present/absent use the same predicate as the counters (absent = any status but present).
+    """
+    if state == "unmarked":
+        stmt = employee_service.list_select().where(
+            ~exists().where(Attendance.employee_id == Employee.employee_id, Attendance.date == date)
+        )
+        key = Employee.employee_id
+    else:
+        present = attendance_summary_service.present_clause()
+        stmt = employee_service.list_select().join(Attendance, Attendance.employee_id == Employee.employee_id).where(
+            Attendance.date == date, present if state == "present" else ~present
+        )
+        key = Attendance.employee_id
+    if department_id is not None:
+        stmt = stmt.where(Employee.department_id == department_id)
+    return stmt, key
+
+
+def roster_rows(
+    db: Session,
+    date: Date,
+    state: str,
+    limit: int,
+    after: str | None = None,
+    department_id: int | None = None,
+) -> Result:
+    """A page of the employees unmarked / present / absent on `date`, in employee_id order
+    (keyset: employee_id > `after`), as employee list rows."""
+    stmt, key = _roster_select(date, state, department_id)
+    if after is not None:
+        stmt = stmt.where(key > after)
+    return db.execute(stmt.order_by(key).limit(limit))
+
+
+def roster_count(db: Session, date: Date, state: str, department_id: int | None = None) -> int:
+    stmt, _ = _roster_select(date, state, department_id)
+    return db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one()
+
+
+def get_by_employee_date(db: Session, employee_id: str, date: Date) -> Attendance | None:
     return db.execute(
         select(Attendance).where(
             Attendance.employee_id == employee_id,
@@ -74,22 +161,58 @@ def get_by_employee_date(db: Session, employee_id: str, date: str) -> Attendance
     ).scalar_one_or_none()
 
 
-def create(db: Session, employee_id: str, date: str, status: str) -> Attendance:
+def create(db: Session, employee_id: str, date: Date, status: str) -> Attendance:
+    """Add and flush (so `id` is set). Does not commit."""
     rec = Attendance(employee_id=employee_id, date=date, status=status)
     db.add(rec)
-    db.commit()
-    db.refresh(rec)
+    db.flush()
+    attendance_summary_service.apply_changes(db, [(employee_id, date, None, status)])
     return rec
 
 
 def update_status(db: Session, rec: Attendance, status: str) -> Attendance:
+    """Does not commit."""
+    old_status = rec.status
     rec.status = status
-    db.commit()
-    db.refresh(rec)
+    if old_status != status:
+        attendance_summary_service.apply_changes(db, [(rec.employee_id, rec.date, old_status, status)])
     return rec
 
 
-def create_or_update(db: Session, employee_id: str, date: str, status: str) -> tuple[Attendance, str]:
+def upsert_marks(db: Session, marks: list[tuple[str, Date, str]]) -> list[tuple[Attendance, bool]]:
+    """Create or update each (employee_id, date, status) in order: one lookup per date, one
+    flush and one counter update for all of them. Does not commit. Returns (record, created)
+    per mark; a repeated employee and date updates the record of the earlier mark."""
+    wanted: dict[Date, set[str]] = {}
+    for employee_id, date, _ in marks:
+        wanted.setdefault(date, set()).add(employee_id)
+    records: dict[tuple[str, Date], Attendance] = {}
+    for date, employee_ids in wanted.items():
+        for chunk in chunked(employee_ids):
+            for rec in db.execute(
+                select(Attendance).where(Attendance.date == date, Attendance.employee_id.in_(chunk))
+            ).scalars():
+                records[(rec.employee_id, date)] = rec
+    staged: list[tuple[Attendance, bool]] = []
+    changes: list = []
+    for employee_id, date, status in marks:
+        rec = records.get((employee_id, date))
+        if rec is None:
+            rec = records[(employee_id, date)] = Attendance(employee_id=employee_id, date=date, status=status)
+            db.add(rec)
+            changes.append((employee_id, date, None, status))
+            staged.append((rec, True))
+        else:
+            if rec.status != status:
+                changes.append((employee_id, date, rec.status, status))
+                rec.status = status
+            staged.append((rec, False))
+    db.flush()
+    attendance_summary_service.apply_changes(db, changes)
+    return staged
+
+
+def create_or_update(db: Session, employee_id: str, date: Date, status: str) -> tuple[Attendance, str]:
     existing = get_by_employee_date(db, employee_id, date)
     if existing:
         update_status(db, existing, status)
@@ -98,6 +221,74 @@ def create_or_update(db: Session, employee_id: str, date: str, status: str) -> t
     return rec, "created"
 
 
+def existing_statuses_on(db: Session, date: Date, employee_ids: set[str]) -> dict[str, str]:
+    """employee_id -> status for those of `employee_ids` that already have a record on `date`."""
+    found: dict[str, str] = {}
+    for chunk in chunked(employee_ids):
+        found.update(
+            db.execute(
+                select(Attendance.employee_id, Attendance.status).where(
+                    Attendance.date == date, Attendance.employee_id.in_(chunk)
+                )
+            ).all()
+        )
+    return found
+
+
+def _stage_upsert(db: Session, date: Date, records: list[tuple[str, str]]) -> tuple[int, int, list]:
+    """Upsert one date's (employee_id, status) records; returns (created, updated, counter changes)."""
+    existing = existing_statuses_on(db, date, {eid for eid, _ in records})
+    created = updated = 0
+    statuses: dict[str, str] = {}
+    for employee_id, status in records:
+        if employee_id in existing or employee_id in statuses:
+            updated += 1
+        else:
+            created += 1
+        statuses[employee_id] = status
+    # Targets the Table, so executemany skips the ORM bulk-insert bookkeeping.
+    stmt = sqlite_insert(Attendance.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Attendance.employee_id, Attendance.date],
+        set_={"status": stmt.excluded.status},
+    )
+    db.execute(stmt, [{"employee_id": eid, "date": date, "status": st} for eid, st in statuses.items()])
+    changes = [(eid, date, existing.get(eid), st) for eid, st in statuses.items() if existing.get(eid) != st]
+    return created, updated, changes
+
+
+def bulk_upsert(db: Session, date: Date, records: list[tuple[str, str]]) -> tuple[int, int]:
+    """Create or update (employee_id, status) records for one date. Does not commit.
+
+    Uses INSERT ... ON CONFLICT(employee_id, date) DO UPDATE against uq_employee_date.
+    Counts match the per-record path: a repeated employee_id counts as an update and
+    the last status wins. Returns (created, updated).
+    """
+    if not records:
+        return 0, 0
+    created, updated, changes = _stage_upsert(db, date, records)
+    attendance_summary_service.apply_changes(db, changes)
+    return created, updated
+
+
+def bulk_upsert_many(db: Session, records: list[tuple[str, Date, str]]) -> tuple[int, int]:
+    """Create or update (employee_id, date, status) records spanning any number of dates:
+    one set-based upsert per date, then the counters for all of them at once. Does not commit.
+    Returns (created, updated), counted as in bulk_upsert."""
+    by_date: dict[Date, list[tuple[str, str]]] = {}
+    for employee_id, date, status in records:
+        by_date.setdefault(date, []).append((employee_id, status))
+    created = updated = 0
+    changes: list = []
+    for date in sorted(by_date):
+        day_created, day_updated, day_changes = _stage_upsert(db, date, by_date[date])
+        created += day_created
+        updated += day_updated
+        changes += day_changes
+    attendance_summary_service.apply_changes(db, changes)
+    return created, updated
+
+
 def to_response(
     rec: Attendance,
     employee_name: str | None = None,
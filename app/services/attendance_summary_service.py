@@ -0,0 +1,367 @@
+"""Attendance summary service: maintain per-employee attendance counters.
+
+Write paths describe what they changed as (employee_id, date, old_status, new_status)
+tuples and call `apply_changes` before committing, so counters move in the same
+transaction as the attendance rows. Three rollups are kept:
+- attendance_summary: all-time counts per employee
+- attendance_monthly: counts per employee per calendar month (for date-range summaries)
+- attendance_department_daily: counts per department per day (for department rollups);
+  a day counts toward the employee's department when it was marked
+`rebuild` recomputes all of them from `attendance`.
+"""
+from calendar import monthrange
+from collections.abc import Iterable
+from datetime import date as Date, timedelta
+
+from sqlalchemy import Date as SqlDate, case, delete, func, select, union_all
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.database import Query
+from app.models import (
+    Attendance,
+    AttendanceDepartmentDaily,
+    AttendanceMonthly,
+    AttendanceSummary,
+    Department,
+    Employee,
+)
+from app.services.batching import chunked
+
+# (employee_id, date, old_status or None if newly created, new_status or None if removed)
+Change = tuple[str, Date, str | None, str | None]
+
+
+def _is_present(status: str | None) -> bool:
+    return (status or "").lower() == "present"
+
+
+def _month_of(date: Date) -> str:
+    return date.strftime("%Y-%m")
+
+
+def _adding_upsert(model, key_columns: list):
+    """INSERT counters; on key conflict add present_days/absent_days to the existing row.
+    Targets the Table, so executemany skips the ORM bulk-insert bookkeeping."""
+    stmt = sqlite_insert(model.__table__)
+    excluded = stmt.excluded
+    set_ = {
+        "present_days": model.present_days + excluded.present_days,
+        "absent_days": model.absent_days + excluded.absent_days,
+    }
+    if model is AttendanceSummary:
+        set_["last_marked_date"] = func.max(
+            func.coalesce(AttendanceSummary.last_marked_date, excluded.last_marked_date),
+            func.coalesce(excluded.last_marked_date, AttendanceSummary.last_marked_date),
+        )
+    return stmt.on_conflict_do_update(index_elements=key_columns, set_=set_)
+
+
+def _department_ids(db: Session, employee_ids: Iterable[str]) -> dict[str, int]:
+    found: dict[str, int] = {}
+    for chunk in chunked(set(employee_ids)):
+        found.update(
+            db.execute(
+                select(Employee.employee_id, Employee.department_id).where(Employee.employee_id.in_(chunk))
+            ).all()
+        )
+    return found
+
+
+def apply_changes(db: Session, changes: Iterable[Change]) -> None:
+    """Apply counter deltas for the given attendance changes. Does not commit."""
+    changes = list(changes)
+    if not changes:
+        return
+    departments = _department_ids(db, (employee_id for employee_id, *_ in changes))
+    totals: dict[str, list] = {}
+    monthly: dict[tuple[str, str], list[int]] = {}
+    daily: dict[tuple[Date, int], list[int]] = {}
+    months: dict[Date, str] = {}
+    for employee_id, date, old_status, new_status in changes:
+        t = totals.setdefault(employee_id, [0, 0, None])
+        month = months.get(date) or months.setdefault(date, _month_of(date))
+        m = monthly.setdefault((employee_id, month), [0, 0])
+        department_id = departments.get(employee_id)
+        # Orphaned attendance (employee gone) has no department to count toward.
+        d = daily.setdefault((date, department_id), [0, 0]) if department_id is not None else [0, 0]
+        if old_status is not None:
+            idx = 0 if _is_present(old_status) else 1
+            t[idx] -= 1
+            m[idx] -= 1
+            d[idx] -= 1
+        if new_status is not None:
+            idx = 0 if _is_present(new_status) else 1
+            t[idx] += 1
+            m[idx] += 1
+            d[idx] += 1
+            if t[2] is None or date > t[2]:
+                t[2] = date
+    summary_rows = [
+        {"employee_id": eid, "present_days": p, "absent_days": a, "last_marked_date": last}
+        for eid, (p, a, last) in totals.items()
+        if p or a or last is not None
+    ]
+    monthly_rows = [
+        {"employee_id": eid, "month": month, "present_days": p, "absent_days": a}
+        for (eid, month), (p, a) in monthly.items()
+        if p or a
+    ]
+    daily_rows = [
+        {"date": date, "department_id": department_id, "present_days": p, "absent_days": a}
+        for (date, department_id), (p, a) in daily.items()
+        if p or a
+    ]
+    if summary_rows:
+        db.execute(_adding_upsert(AttendanceSummary, [AttendanceSummary.employee_id]), summary_rows)
+    if monthly_rows:
+        db.execute(
+            _adding_upsert(AttendanceMonthly, [AttendanceMonthly.month, AttendanceMonthly.employee_id]),
+            monthly_rows,
+        )
+    if daily_rows:
+        db.execute(
+            _adding_upsert(
+                AttendanceDepartmentDaily,
+                [AttendanceDepartmentDaily.date, AttendanceDepartmentDaily.department_id],
+            ),
+            daily_rows,
+        )
+
+
+def delete_for_employee(db: Session, employee_id: str) -> None:
+    """Drop an employee's counters and take their days out of the department counters. Does not commit."""
+    db.execute(delete(AttendanceSummary).where(AttendanceSummary.employee_id == employee_id))
+    db.execute(delete(AttendanceMonthly).where(AttendanceMonthly.employee_id == employee_id))
+    present_sum, absent_sum = _present_absent_sums()
+    days = db.execute(
+        _from_known_employees(Attendance.date, Employee.department_id, present_sum, absent_sum)
+        .where(Attendance.employee_id == employee_id)
+        .group_by(Attendance.date, Employee.department_id)
+    ).all()
+    if days:
+        db.execute(
+            _adding_upsert(
+                AttendanceDepartmentDaily,
+                [AttendanceDepartmentDaily.date, AttendanceDepartmentDaily.department_id],
+            ),
+            [
+                {"date": date, "department_id": department_id, "present_days": -p, "absent_days": -a}
+                for date, department_id, p, a in days
+            ],
+        )
+        db.execute(
+            delete(AttendanceDepartmentDaily).where(
+                AttendanceDepartmentDaily.department_id == days[0][1],
+                AttendanceDepartmentDaily.present_days == 0,
+                AttendanceDepartmentDaily.absent_days == 0,
+            )
+        )
+
+
+def present_clause():
+    """SQL form of `_is_present`: every other status counts as absent."""
+    return func.lower(Attendance.status) == "present"
+
+
+def _present_absent_sums():
+    present = present_clause()
+    return func.sum(case((present, 1), else_=0)), func.sum(case((present, 0), else_=1))
+
+
+def _from_known_employees(*columns):
+    """SELECT over attendance rows whose employee still exists (skips orphans left by FK-off deletes)."""
+    return select(*columns).join(Employee, Employee.employee_id == Attendance.employee_id)
+
+
+def rebuild(db) -> int:
+    """Recompute all counters from `attendance`. Works on a Session or Connection; does not commit.
+
+    Returns the number of employees with attendance.
+    """
+    present_sum, absent_sum = _present_absent_sums()
+    month = func.substr(Attendance.date, 1, 7)  # dates are stored as ISO text on SQLite
+    db.execute(delete(AttendanceSummary))
+    db.execute(delete(AttendanceMonthly))
+    db.execute(delete(AttendanceDepartmentDaily))
+    result = db.execute(
+        sqlite_insert(AttendanceSummary).from_select(
+            ["employee_id", "present_days", "absent_days", "last_marked_date"],
+            _from_known_employees(
+                Attendance.employee_id, present_sum, absent_sum, func.max(Attendance.date)
+            ).group_by(Attendance.employee_id),
+        )
+    )
+    db.execute(
+        sqlite_insert(AttendanceMonthly).from_select(
+            ["month", "employee_id", "present_days", "absent_days"],
+            _from_known_employees(month, Attendance.employee_id, present_sum, absent_sum).group_by(
+                month, Attendance.employee_id
+            ),
+        )
+    )
+    db.execute(
+        sqlite_insert(AttendanceDepartmentDaily).from_select(
+            ["date", "department_id", "present_days", "absent_days"],
+            _from_known_employees(Attendance.date, Employee.department_id, present_sum, absent_sum).group_by(
+                Attendance.date, Employee.department_id
+            ),
+        )
+    )
+    return result.rowcount
+
+
+def _summary_rows(counts, department_id: int | None) -> Query[list[dict]]:
+    """Join every employee (optionally of one department) to a (employee_id, present, absent) source."""
+    stmt = (
+        select(
+            Employee.employee_id,
+            Employee.full_name,
+            func.coalesce(counts.c.present_days, 0),
+            func.coalesce(counts.c.absent_days, 0),
+        )
+        .outerjoin(counts, counts.c.employee_id == Employee.employee_id)
+        .order_by(Employee.id)
+    )
+    if department_id is not None:
+        stmt = stmt.where(Employee.department_id == department_id)
+    rows = yield stmt
+    return [
+        {
+            "employee_id": employee_id,
+            "employee_name": full_name,
+            "present_days": present_days,
+            "absent_days": absent_days,
+        }
+        for employee_id, full_name, present_days, absent_days in rows
+    ]
+
+
+def get_all(department_id: int | None = None) -> Query[list[dict]]:
+    """Per-employee all-time present/absent day counts for every employee (0s if never marked).
+
+    One pass over `employees` with a primary-key join into the counters table; cost does
+    not depend on how much attendance history exists.
+    """
+    return (yield from _summary_rows(AttendanceSummary.__table__, department_id))
+
+
+def _month_start(d: Date) -> Date:
+    return d.replace(day=1)
+
+
+def _month_end(d: Date) -> Date:
+    return d.replace(day=monthrange(d.year, d.month)[1])
+
+
+def get_range(
+    date_from: Date | None = None,
+    date_to: Date | None = None,
+    department_id: int | None = None,
+) -> Query[list[dict]]:
+    """Per-employee present/absent counts for attendance dated within [date_from, date_to].
+
+    Whole months inside the window are summed from attendance_monthly; only the partial
+    month at each end (at most two) is counted from raw attendance rows. With `department_id`
+    each part reads only that department's employees, so the cost follows its rows.
+    """
+    if date_from is None and date_to is None:
+        return (yield from get_all(department_id=department_id))
+
+    parts = []
+    present_sum, absent_sum = _present_absent_sums()
+    staff = None
+    if department_id is not None:
+        staff = select(Employee.employee_id).where(Employee.department_id == department_id)
+
+    def raw(lo: Date | None, hi: Date | None):
+        stmt = select(Attendance.employee_id, present_sum.label("p"), absent_sum.label("a"))
+        if staff is not None:
+            stmt = stmt.where(Attendance.employee_id.in_(staff))
+        if lo is not None:
+            stmt = stmt.where(Attendance.date >= lo)
+        if hi is not None:
+            stmt = stmt.where(Attendance.date <= hi)
+        parts.append(stmt.group_by(Attendance.employee_id))
+
+    # Whole-month window [first_month, last_month]; None = unbounded on that side.
+    first_month = date_from if date_from is None or date_from.day == 1 else _month_end(date_from) + timedelta(days=1)
+    last_month = date_to if date_to is None or date_to == _month_end(date_to) else _month_start(date_to) - timedelta(days=1)
+
+    if first_month is not None and last_month is not None and first_month > last_month:
+        # No whole month inside the window: one raw scan over the range.
+        raw(date_from, date_to)
+    else:
+        if date_from is not None and first_month != date_from:
+            raw(date_from, first_month - timedelta(days=1))
+        if date_to is not None and last_month != date_to:
+            raw(last_month + timedelta(days=1), date_to)
+        stmt = select(
+            AttendanceMonthly.employee_id,
+            func.sum(AttendanceMonthly.present_days).label("p"),
+            func.sum(AttendanceMonthly.absent_days).label("a"),
+        )
+        if staff is not None:
+            stmt = stmt.where(AttendanceMonthly.employee_id.in_(staff))
+        if first_month is not None:
+            stmt = stmt.where(AttendanceMonthly.month >= first_month.strftime("%Y-%m"))
+        if last_month is not None:
+            stmt = stmt.where(AttendanceMonthly.month <= last_month.strftime("%Y-%m"))
+        parts.append(stmt.group_by(AttendanceMonthly.employee_id))
+
+    combined = union_all(*parts).subquery() if len(parts) > 1 else parts[0].subquery()
+    counts = (
+        select(
+            combined.c.employee_id,
+            func.sum(combined.c.p).label("present_days"),
+            func.sum(combined.c.a).label("absent_days"),
+        )
+        .group_by(combined.c.employee_id)
+        .subquery()
+    )
+    return (yield from _summary_rows(counts, department_id))
+
+
+def _bucket(granularity: str):
+    """Bucket start date for AttendanceDepartmentDaily.date: the day, its ISO week's Monday, or the 1st."""
+    if granularity == "week":
+        # 'weekday 0' moves to the next Sunday (or stays on one); six days back is that week's Monday.
+        return func.date(AttendanceDepartmentDaily.date, "weekday 0", "-6 days", type_=SqlDate)
+    if granularity == "month":
+        return func.date(AttendanceDepartmentDaily.date, "start of month", type_=SqlDate)
+    return AttendanceDepartmentDaily.date
+
+
+def department_rollup(
+    db: Session,
+    date_from: Date,
+    date_to: Date,
+    granularity: str = "day",
+    department_id: int | None = None,
+) -> list[tuple]:
+    """(bucket start, department id, department name, present, absent) per department per
+    day/week/month within [date_from, date_to], from attendance_department_daily.
+
+    Buckets are labelled by their start date and only count days inside the range; department
+    and bucket pairs without attendance are omitted.
+    """
+    bucket = _bucket(granularity).label("bucket")
+    stmt = (
+        select(
+            bucket,
+            AttendanceDepartmentDaily.department_id,
+            Department.name,
+            func.sum(AttendanceDepartmentDaily.present_days),
+            func.sum(AttendanceDepartmentDaily.absent_days),
+        )
+        .join(Department, Department.id == AttendanceDepartmentDaily.department_id)
+        .where(AttendanceDepartmentDaily.date >= date_from, AttendanceDepartmentDaily.date <= date_to)
+    )
+    if department_id is not None:
+        stmt = stmt.where(AttendanceDepartmentDaily.department_id == department_id)
+    stmt = (
+        stmt.group_by(bucket, AttendanceDepartmentDaily.department_id)
+        .having(func.sum(AttendanceDepartmentDaily.present_days + AttendanceDepartmentDaily.absent_days) > 0)
+        .order_by(bucket, Department.name)
+    )
+    return [tuple(row) for row in db.execute(stmt)]
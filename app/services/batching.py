@@ -0,0 +1,16 @@
+"""Helpers for set-based queries: keep IN lists under SQLite's bound-parameter limit."""
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# SQLite < 3.32 allows 999 host parameters per statement; stay safely below it.
+SQLITE_MAX_PARAMS = 900
+
+
+def chunked(items: Iterable[T], size: int = SQLITE_MAX_PARAMS) -> Iterator[list[T]]:
+    """Yield consecutive lists of at most `size` items."""
+    it = iter(items)
+    while chunk := list(islice(it, size)):
+        yield chunk
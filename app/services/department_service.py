@@ -1,29 +1,66 @@
 """Department service: DB operations for departments."""
-from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload
+from collections.abc import Iterable
+from typing import NamedTuple
 
-from app.models import Department
+from sqlalchemy import Select, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.database import Query
+from app.models import Department, Employee
 from app.schemas import DepartmentCreate
+from app.services import lookup_cache
+from app.services.batching import chunked
+
+
+class DepartmentRef(NamedTuple):
+    """Read-only department snapshot served from the lookup cache."""
+    id: int
+    name: str
 
 
 def get_all(db: Session) -> list[Department]:
     return list(db.execute(select(Department).order_by(Department.name)).scalars().all())
 
 
-def get_all_with_employees(db: Session) -> list[Department]:
-    """Fetch all departments with their employees in a single query."""
-    return list(
-        db.execute(
-            select(Department)
-            .options(joinedload(Department.employees))
-            .order_by(Department.name)
+def counts_select() -> Select:
+    """Departments ordered by name as Core rows (id, name, employee count).
+
+    Each count is a correlated COUNT over ix_employees_department_id, so employee rows are
+    never read.
+    """
+    employee_count = (
+        select(func.count())
+        .where(Employee.department_id == Department.id)
+        .correlate(Department)
+        .scalar_subquery()
+    )
+    return select(Department.id, Department.name, employee_count).order_by(Department.name)
+
+
+def employee_rows_select() -> Select:
+    """Every department with its employees in a single query, ordered by department name.
+
+    Core rows (department id, name, employee id, employee_id, full_name, email), with no ORM
+    identity map; employee columns are None for a department without employees.
+    """
+    return (
+        select(
+            Department.id,
+            Department.name,
+            Employee.id,
+            Employee.employee_id,
+            Employee.full_name,
+            Employee.email,
         )
-        .unique()
-        .scalars()
-        .all()
+        .outerjoin(Employee, Employee.department_id == Department.id)
+        .order_by(Department.name, Employee.id)
     )
 
 
+def exists(id: int) -> Query[bool]:
+    return (yield select(Department.id).where(Department.id == id)).first() is not None
+
+
 def get_by_id(db: Session, id: int) -> Department | None:
     return db.get(Department, id)
 
@@ -32,14 +69,81 @@ def get_by_name(db: Session, name: str) -> Department | None:
     return db.execute(select(Department).where(Department.name == name.strip())).scalar_one_or_none()
 
 
+def existing_ids(db: Session, ids: Iterable[int]) -> set[int]:
+    """Return the subset of `ids` that exist, using one IN query per chunk."""
+    found: set[int] = set()
+    for chunk in chunked(set(ids)):
+        found.update(db.execute(select(Department.id).where(Department.id.in_(chunk))).scalars())
+    return found
+
+
+def ids_by_name(db: Session, names: Iterable[str]) -> dict[str, int]:
+    """Map each existing (exact, stripped) name in `names` to its id, using one IN query per chunk."""
+    found: dict[str, int] = {}
+    for chunk in chunked({n.strip() for n in names}):
+        found.update(db.execute(select(Department.name, Department.id).where(Department.name.in_(chunk))).all())
+    return found
+
+
+# SQLite's NOCASE folds ASCII letters only; names are compared the same way in Python.
+_NOCASE = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def fold_case(name: str) -> str:
+    """`name` as NOCASE compares it."""
+    return name.translate(_NOCASE)
+
+
+def existing_names_nocase(db: Session, names: Iterable[str]) -> set[str]:
+    """Return fold_case() of each (stripped) name in `names` that matches a department case-insensitively,
+    using one IN query per chunk on ix_departments_name_nocase."""
+    found: set[str] = set()
+    for chunk in chunked({fold_case(n.strip()) for n in names}):
+        rows = db.execute(select(Department.name).where(Department.name.collate("NOCASE").in_(chunk))).scalars()
+        found.update(fold_case(name) for name in rows)
+    return found
+
+
+def get_ref_by_id(db: Session, id: int) -> DepartmentRef | None:
+    """Cached lookup by id, for paths that only need to read the department."""
+    def load() -> DepartmentRef | None:
+        dept = get_by_id(db, id)
+        return DepartmentRef(dept.id, dept.name) if dept else None
+
+    return lookup_cache.departments.get_or_load(("id", id), load)
+
+
+def get_ref_by_name(db: Session, name: str) -> DepartmentRef | None:
+    """Cached lookup by exact (stripped) name, for paths that only need to read the department."""
+    def load() -> DepartmentRef | None:
+        dept = get_by_name(db, name)
+        return DepartmentRef(dept.id, dept.name) if dept else None
+
+    return lookup_cache.departments.get_or_load(("name", name.strip()), load)
+
+
+def invalidate_cache() -> None:
+    lookup_cache.departments.invalidate()
+
+
+def insert_many(db: Session, names: list[str]) -> None:
+    """INSERT already-checked department names with one executemany. Does not commit."""
+    if names:
+        db.execute(insert(Department), [{"name": name} for name in names])
+
+
 def create(db: Session, data: DepartmentCreate) -> Department:
+    """Add and flush (so `id` is set). Does not commit."""
     dept = Department(name=data.name.strip())
     db.add(dept)
-    db.commit()
-    db.refresh(dept)
+    db.flush()
+    lookup_cache.on_commit(db, invalidate_cache)
     return dept
 
 
 def delete(db: Session, department: Department) -> None:
+    """Delete and flush, so an IntegrityError (department still has employees) surfaces here.
+    Does not commit."""
     db.delete(department)
-    db.commit()
+    db.flush()
+    lookup_cache.on_commit(db, invalidate_cache)
@@ -0,0 +1,128 @@
+"""Employee search: an FTS5 index over full name, email, employee ID and department name.
+
+`employee_search` is a regular FTS5 table whose rowid is `employees.id`. Triggers on
+`employees` and `departments` keep it in step with every write path (ORM, Core executemany,
+raw SQL), inside the writer's transaction. `rebuild` repopulates it from scratch
+(`python manage.py rebuild-search`).
+"""
+import re
+
+from sqlalchemy import Row, text
+from sqlalchemy.orm import Session
+
+TABLE = "employee_search"
+# bm25 weights per column (full_name, email, employee_id, department): a name match ranks
+# above an email match, and so on.
+_RANKING = "bm25(10.0, 5.0, 8.0, 2.0)"
+
+_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5(
+        full_name, email, employee_id, department,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '1 2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employees_search_ai AFTER INSERT ON employees BEGIN
+        INSERT INTO {TABLE}(rowid, full_name, email, employee_id, department)
+        VALUES (new.id, new.full_name, new.email, new.employee_id,
+                (SELECT name FROM departments WHERE id = new.department_id));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employees_search_ad AFTER DELETE ON employees BEGIN
+        DELETE FROM {TABLE} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employees_search_au AFTER UPDATE ON employees BEGIN
+        DELETE FROM {TABLE} WHERE rowid = old.id;
+        INSERT INTO {TABLE}(rowid, full_name, email, employee_id, department)
+        VALUES (new.id, new.full_name, new.email, new.employee_id,
+                (SELECT name FROM departments WHERE id = new.department_id));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS departments_search_au AFTER UPDATE OF name ON departments BEGIN
+        UPDATE {TABLE} SET department = new.name
+        WHERE rowid IN (SELECT id FROM employees WHERE department_id = new.id);
+    END
+    """,
+)
+
+
+def exists(db) -> bool:
+    return db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": TABLE}
+    ).scalar_one_or_none() is not None
+
+
+def create(db) -> None:
+    """Create the index table and its triggers if missing. Works on a Session or Connection."""
+    for statement in _DDL:
+        db.execute(text(statement))
+
+
+def rebuild(db) -> int:
+    """Repopulate the index from `employees`. Works on a Session or Connection; does not commit.
+
+    Returns the number of employees indexed.
+    """
+    create(db)
+    db.execute(text(f"DELETE FROM {TABLE}"))
+    result = db.execute(
+        text(
+            f"""
+            INSERT INTO {TABLE}(rowid, full_name, email, employee_id, department)
+            SELECT e.id, e.full_name, e.email, e.employee_id, d.name
+            FROM employees e LEFT JOIN departments d ON d.id = e.department_id
+            """
+        )
+    )
+    db.execute(text(f"INSERT INTO {TABLE}({TABLE}) VALUES ('optimize')"))
+    return result.rowcount
+
+
+def match_expression(q: str) -> str | None:
+    """Turn free text into an FTS5 query: every word must match as a prefix ("ann smi" → ann* smi*).
+
+    Punctuation separates words, so "j.doe@ex" searches j* doe* ex*. Returns None if `q` has no words.
+    """
+    words = re.findall(r"\w+", q)
+    if not words:
+        return None
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def search(db: Session, q: str, limit: int, department_id: int | None = None) -> list[Row]:
+    """Best matches first (bm25), as rows shaped like employee_service.list_select.
+
+    Ranking and the limit are applied inside FTS5 (ORDER BY rank), so only the top rows are
+    joined to employees; a department filter is applied before the limit.
+    """
+    expression = match_expression(q)
+    if expression is None:
+        return []
+    department_filter = (
+        "AND rowid IN (SELECT id FROM employees WHERE department_id = :department_id)"
+        if department_id is not None
+        else ""
+    )
+    return db.execute(
+        text(
+            f"""
+            SELECT e.id, e.employee_id, e.full_name, e.email, e.department_id, COALESCE(d.name, '')
+            FROM (
+                SELECT rowid, rank FROM {TABLE}
+                WHERE {TABLE} MATCH :expression AND rank MATCH :ranking {department_filter}
+                ORDER BY rank
+                LIMIT :limit
+            ) s
+            JOIN employees e ON e.id = s.rowid
+            LEFT JOIN departments d ON d.id = e.department_id
+            ORDER BY s.rank, e.id
+            """
+        ),
+        {"expression": expression, "ranking": _RANKING, "limit": limit, "department_id": department_id},
+    ).all()
@@ -1,17 +1,160 @@
 """Employee service: DB operations for employees."""
-from sqlalchemy import select
+import heapq
+import time
+from collections.abc import Iterable
+from functools import partial
+from itertools import islice
+from typing import NamedTuple
+
+from sqlalchemy import Row, Select, func, insert, or_, select
 from sqlalchemy.orm import Session, joinedload
 
-from app.models import Employee
+from app.database import Query
+from app.models import Department, Employee
 from app.schemas import EmployeeCreate
+from app.services import attendance_summary_service, lookup_cache
+from app.services.batching import chunked
 
 
-def get_all(db: Session) -> list[Employee]:
-    return list(
-        db.execute(
-            select(Employee).options(joinedload(Employee.department)).order_by(Employee.id)
-        ).unique().scalars().all()
-    )
+class EmployeeRef(NamedTuple):
+    """Read-only employee snapshot (with department name) served from the lookup cache."""
+    id: int
+    employee_id: str
+    full_name: str
+    email: str
+    department_id: int
+    department_name: str | None
+
+
+# Unfiltered headcount is cached briefly; local writes invalidate it, other workers see it within the TTL.
+_COUNT_TTL_SECONDS = 30.0
+_total_count: tuple[float, int] | None = None
+
+
+# SQLite's NOCASE folds ASCII letters only.
+_NOCASE = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+# Sorts after any text that starts with the same characters, so [p, p + _MAX) is "starts with p".
+_MAX = "\U0010ffff"
+_NAME_KEY = Employee.full_name.collate("NOCASE")
+
+
+def _name_range(prefix: str, lo: str | None = None):
+    # A NOCASE range rather than LIKE, so a keyset cursor can raise the lower bound of the scan.
+    p = prefix.translate(_NOCASE)
+    return (_NAME_KEY >= max(p, lo or p)) & (_NAME_KEY < p + _MAX)
+
+
+def _email_range(prefix: str, lo: str | None = None):
+    # Emails are stored lowercased, so a plain range scan on the unique index works.
+    p = prefix.lower()
+    return (Employee.email >= max(p, lo or p)) & (Employee.email < p + _MAX)
+
+
+def _filtered(stmt, department_id: int | None = None, prefix: str | None = None):
+    """Apply index-backed filters: department_id (ix_employees_department_id) and a
+    case-insensitive name prefix (ix_employees_full_name_nocase) or email prefix (ix_employees_email).
+
+    Used for counting; pages of a prefix come from prefix_selects, which keeps each branch in
+    its own index order."""
+    if department_id is not None:
+        stmt = stmt.where(Employee.department_id == department_id)
+    p = (prefix or "").strip()
+    if p:
+        stmt = stmt.where(or_(_name_range(p), _email_range(p)))
+    return stmt
+
+
+def list_select():
+    """SELECT of the employee list columns: (id, employee_id, full_name, email, department_id,
+    department name or ""). Other services add their own filters and ordering."""
+    return select(
+        Employee.id,
+        Employee.employee_id,
+        Employee.full_name,
+        Employee.email,
+        Employee.department_id,
+        func.coalesce(Department.name, ""),
+    ).outerjoin(Department, Employee.department_id == Department.id)
+
+
+def page_select(limit: int | None = None, after: int | None = None, department_id: int | None = None) -> Select:
+    """Employees ordered by id (keyset: id > `after`, at most `limit`; all when no limit).
+
+    Read-only list path: selects only the response columns through Core, so rows are plain
+    tuples (id, employee_id, full_name, email, department_id, department name or "") with no
+    ORM identity map or joinedload dedup.
+    """
+    stmt = _filtered(list_select(), department_id)
+    if after is not None:
+        stmt = stmt.where(Employee.id > after)
+    stmt = stmt.order_by(Employee.id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+# Keyset position in a prefix listing: (sort key of the last row, its id); see prefix_key.
+PrefixCursor = tuple[str, int]
+
+
+def prefix_key(prefix: str, row: Row) -> PrefixCursor:
+    """Sort key of a list_select row in a prefix listing: its full name (NOCASE-folded) when
+    the name matches the prefix, otherwise its email."""
+    name = row[2].translate(_NOCASE)
+    key = name if name.startswith(prefix.strip().translate(_NOCASE)) else row[3]
+    return key, row[0]
+
+
+def prefix_selects(
+    prefix: str, limit: int, after: PrefixCursor | None = None, department_id: int | None = None
+) -> list[Select]:
+    """The two index-ordered branches of a prefix page, each LIMITed on its own: name matches
+    by (full_name COLLATE NOCASE, id) on ix_employees_full_name_nocase, then emails matching
+    where the name does not, by email on ix_employees_email. merge_prefix_rows combines them.
+
+    The cursor's key is the lower bound of both range scans, so a page reads at most 2 x
+    `limit` index entries however deep it is. With `department_id` SQLite may scan that
+    department instead, which is bounded by its size."""
+    p = prefix.strip()
+    key = last_id = None
+    if after is not None:
+        # Both keys compare as NOCASE-folded text: emails are stored lowercased.
+        key, last_id = after[0].translate(_NOCASE), after[1]
+    by_name = list_select().where(_name_range(p, key))
+    by_email = list_select().where(_email_range(p, key), ~_name_range(p))
+    if after is not None:
+        by_name = by_name.where((_NAME_KEY > key) | (Employee.id > last_id))
+        by_email = by_email.where((Employee.email > key) | (Employee.id > last_id))
+    if department_id is not None:
+        by_name = by_name.where(Employee.department_id == department_id)
+        by_email = by_email.where(Employee.department_id == department_id)
+    return [
+        by_name.order_by(_NAME_KEY, Employee.id).limit(limit),
+        by_email.order_by(Employee.email).limit(limit),
+    ]
+
+
+def merge_prefix_rows(prefix: str, results: list[Iterable[Row]], limit: int) -> list[Row]:
+    """The first `limit` rows of the prefix_selects branches, in prefix_key order."""
+    return list(islice(heapq.merge(*results, key=partial(prefix_key, prefix)), limit))
+
+
+def count(department_id: int | None = None, prefix: str | None = None) -> Query[int]:
+    """Total matching employees. The unfiltered total comes from a short-lived cached counter."""
+    global _total_count
+    filtered = department_id is not None or bool((prefix or "").strip())
+    now = time.monotonic()
+    if not filtered and _total_count and now - _total_count[0] < _COUNT_TTL_SECONDS:
+        return _total_count[1]
+    total = (yield _filtered(select(func.count(Employee.id)), department_id, prefix)).scalar_one()
+    if not filtered:
+        _total_count = (now, total)
+    return total
+
+
+def invalidate_count() -> None:
+    global _total_count
+    _total_count = None
 
 
 def get_by_id(db: Session, id: int) -> Employee | None:
@@ -28,6 +171,30 @@ def get_by_employee_id(db: Session, employee_id: str) -> Employee | None:
     )
 
 
+def get_ref_by_employee_id(db: Session, employee_id: str) -> EmployeeRef | None:
+    """Cached lookup by employee_id, for paths that only need to read the employee."""
+    def load() -> EmployeeRef | None:
+        emp = get_by_employee_id(db, employee_id)
+        if not emp:
+            return None
+        return EmployeeRef(
+            emp.id,
+            emp.employee_id,
+            emp.full_name,
+            emp.email,
+            emp.department_id,
+            emp.department.name if emp.department else None,
+        )
+
+    return lookup_cache.employees.get_or_load(employee_id, load)
+
+
+def invalidate_cache(*employee_ids: str) -> None:
+    """Forget cached employees (all of them when no ids are given) and the cached headcount."""
+    lookup_cache.employees.invalidate(*employee_ids)
+    invalidate_count()
+
+
 def get_by_email(db: Session, email: str) -> Employee | None:
     normalized = email.strip().lower()
     return (
@@ -39,7 +206,30 @@ def get_by_email(db: Session, email: str) -> Employee | None:
     )
 
 
+def existing_employee_ids(db: Session, employee_ids: Iterable[str]) -> set[str]:
+    """Return the subset of `employee_ids` that exist, using one IN query per chunk."""
+    found: set[str] = set()
+    for chunk in chunked(set(employee_ids)):
+        found.update(db.execute(select(Employee.employee_id).where(Employee.employee_id.in_(chunk))).scalars())
+    return found
+
+
+def existing_emails(db: Session, emails: Iterable[str]) -> set[str]:
+    """Return the subset of (normalized) `emails` already in use, using one IN query per chunk."""
+    found: set[str] = set()
+    for chunk in chunked(set(emails)):
+        found.update(db.execute(select(Employee.email).where(Employee.email.in_(chunk))).scalars())
+    return found
+
+
+def insert_many(db: Session, rows: list[dict]) -> None:
+    """INSERT already-validated employee rows with one executemany. Does not commit."""
+    if rows:
+        db.execute(insert(Employee), rows)
+
+
 def create(db: Session, data: EmployeeCreate) -> Employee:
+    """Add and flush (so `id` is set). Does not commit."""
     emp = Employee(
         employee_id=data.employee_id.strip(),
         full_name=data.full_name.strip(),
@@ -47,11 +237,15 @@ def create(db: Session, data: EmployeeCreate) -> Employee:
         department_id=data.department_id,
     )
     db.add(emp)
-    db.commit()
-    db.refresh(emp)
+    db.flush()
+    lookup_cache.on_commit(db, partial(invalidate_cache, emp.employee_id))
     return emp
 
 
 def delete(db: Session, employee: Employee) -> None:
+    """Delete the employee and their attendance counters. Does not commit."""
+    employee_id = employee.employee_id
+    attendance_summary_service.delete_for_employee(db, employee_id)
     db.delete(employee)
-    db.commit()
+    db.flush()
+    lookup_cache.on_commit(db, partial(invalidate_cache, employee_id))
@@ -0,0 +1,155 @@
+"""Group commit: coalesce small writes from concurrent requests into one transaction.
+
+A GroupCommitter owns a writer thread. Requests `submit` an item and wait on the returned
+future; the writer collects whatever arrives within GROUP_COMMIT_WINDOW_MS of the first
+item (up to GROUP_COMMIT_MAX_BATCH), stages them all with its `stage` function in one
+session and commits once. Futures resolve only after that commit, so every caller gets its
+own result with the same durability as a commit of its own, while the batch pays for one
+write lock and one WAL sync.
+
+`stage(db, items)` returns one result per item; a result that is an exception (e.g. a 404)
+is raised to that caller alone. If staging or the commit fails, the batch is rolled back and
+its items are retried one per transaction, so one bad item does not fail its neighbours.
+
+Committers are registered at import; `start`/`stop` run from the app lifespan. While a
+committer is not running (GROUP_COMMIT_WINDOW_MS=0, or during shutdown) `submit` returns
+None and callers `write` their item in a transaction of its own.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+
+GROUP_COMMIT_WINDOW_MS = float(os.getenv("GROUP_COMMIT_WINDOW_MS", "2"))
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "256"))
+
+logger = logging.getLogger(__name__)
+
+# stage(db, items) -> one result (or exception instance) per item. Must not commit.
+Stage = Callable[[Session, list[Any]], list[Any]]
+
+_STOP = object()
+
+
+class GroupCommitter:
+    def __init__(self, name: str, stage: Stage):
+        self.name = name
+        self._stage = stage
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        # Guards `_accepting`, so nothing is queued behind the stop marker.
+        self._lock = threading.Lock()
+        self._accepting = False
+
+    @property
+    def running(self) -> bool:
+        return self._accepting
+
+    def submit(self, item: Any) -> Future | None:
+        """Queue `item`; the future resolves once the batch holding it has committed.
+        Returns None when the committer is not running: use `write` instead."""
+        future: Future = Future()
+        with self._lock:
+            if not self._accepting:
+                return None
+            self._queue.put((item, future))
+        return future
+
+    def write(self, item: Any) -> Any:
+        """Stage and commit `item` alone, in the calling thread. Raises its exception result."""
+        future: Future = Future()
+        self._commit([(item, future)])
+        return future.result()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=f"group-commit-{self.name}", daemon=True)
+            self._accepting = True
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop accepting items, commit the ones already queued, then stop the writer thread."""
+        with self._lock:
+            if not self._accepting:
+                return
+            self._accepting = False
+            self._queue.put(_STOP)
+            thread = self._thread
+        thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        window = GROUP_COMMIT_WINDOW_MS / 1000
+        while True:
+            entry = self._queue.get()
+            if entry is _STOP:
+                return
+            batch = [entry]
+            deadline = time.monotonic() + window
+            stopping = False
+            while len(batch) < GROUP_COMMIT_MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._commit(batch)
+            if stopping:
+                return
+
+    def _commit(self, batch: list[tuple[Any, Future]]) -> None:
+        db = SessionLocal()
+        try:
+            results = self._stage(db, [item for item, _ in batch])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            db.close()
+            if len(batch) > 1:
+                logger.warning("Group commit %s: batch of %d failed (%s); retrying one by one", self.name, len(batch), e)
+                for entry in batch:
+                    self._commit([entry])
+            else:
+                batch[0][1].set_exception(e)
+            return
+        db.close()
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+_committers: dict[str, GroupCommitter] = {}
+
+
+def register(name: str, stage: Stage) -> GroupCommitter:
+    """Create the committer for `name`; it runs between `start` and `stop`."""
+    committer = _committers[name] = GroupCommitter(name, stage)
+    return committer
+
+
+def start() -> None:
+    if GROUP_COMMIT_WINDOW_MS <= 0:
+        return
+    for committer in _committers.values():
+        committer.start()
+
+
+def stop() -> None:
+    for committer in _committers.values():
+        committer.stop()
@@ -0,0 +1,274 @@
+"""Background jobs: a SQLite-backed queue worked by one runner thread per app process.
+
+A job row holds its input file (copied under JOB_DIR) and a checkpoint. Handlers process the
+input in chunks and call `checkpoint` after each one, which commits the chunk's writes and
+the job's progress in the same transaction: a job stopped by a restart or crash resumes
+from its last committed chunk and no row is applied twice.
+
+Runners claim jobs with a conditional UPDATE. While a job runs, a keep-alive thread refreshes
+its heartbeat every JOB_STALE_SECONDS / 4 in a transaction of its own, so a chunk that takes
+longer than the stale window (e.g. waiting for the write lock) does not lose the job; every
+checkpoint refreshes it too. A running job whose heartbeat is older than JOB_STALE_SECONDS
+(its process died) can be claimed by any runner; a checkpoint from a runner that lost its
+claim is rolled back.
+"""
+import logging
+import os
+import secrets
+import shutil
+import socket
+import threading
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO
+from uuid import uuid4
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import Job
+
+JOB_DIR = os.getenv("JOB_DIR", "./data/jobs")
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "60"))
+
+FINISHED = ("succeeded", "failed", "cancelled")
+
+logger = logging.getLogger(__name__)
+
+# handler(db, job): processes job input from its checkpoint, calling `checkpoint` per chunk.
+Handler = Callable[[Session, Job], None]
+_handlers: dict[str, Handler] = {}
+
+_owner = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(3)}"
+_wake = threading.Event()
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+
+
+class JobCancelled(Exception):
+    """Raised by `checkpoint` when cancellation was requested."""
+
+
+class JobInterrupted(Exception):
+    """Raised by `checkpoint` when the runner is shutting down or lost its claim on the job."""
+
+
+class InputLines:
+    """Decoded lines of a job's input file from `offset`, counting the bytes consumed.
+
+    csv.reader pulls exactly the lines of each record (no read-ahead), so after a record
+    `offset` is where the next one starts: a valid checkpoint.
+    """
+
+    def __init__(self, f: BinaryIO, offset: int = 0):
+        self._f = f
+        self.offset = offset
+        f.seek(offset)
+
+    def __iter__(self) -> "InputLines":
+        return self
+
+    def __next__(self) -> str:
+        raw = self._f.readline()
+        if not raw:
+            raise StopIteration
+        encoding = "utf-8-sig" if self.offset == 0 else "utf-8"
+        self.offset += len(raw)
+        return raw.decode(encoding)
+
+
+def register(kind: str, handler: Handler) -> None:
+    _handlers[kind] = handler
+
+
+def enqueue(db: Session, kind: str, source: BinaryIO) -> Job:
+    """Copy `source` to JOB_DIR and queue a `kind` job for it. Commits."""
+    os.makedirs(JOB_DIR, exist_ok=True)
+    job_id = uuid4().hex
+    path = os.path.join(JOB_DIR, f"{job_id}.input")
+    with open(path, "wb") as out:
+        shutil.copyfileobj(source, out, 1024 * 1024)
+        size = out.tell()
+    job = Job(id=job_id, kind=kind, status="queued", file_path=path, total_bytes=size)
+    db.add(job)
+    db.commit()
+    _wake.set()
+    return job
+
+
+def get(db: Session, job_id: str) -> Job | None:
+    return db.get(Job, job_id)
+
+
+def request_cancel(db: Session, job: Job) -> Job:
+    """Cancel a queued job now; ask a running one to stop at its next checkpoint. Commits."""
+    now = datetime.utcnow()
+    cancelled = db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.status == "queued")
+        .values(status="cancelled", cancel_requested=True, finished_at=now)
+    ).rowcount
+    if not cancelled:
+        db.execute(update(Job).where(Job.id == job.id, Job.status == "running").values(cancel_requested=True))
+    db.commit()
+    db.refresh(job)
+    if cancelled:
+        _remove_input(job)
+    return job
+
+
+def checkpoint(db: Session, job: Job, **progress: Any) -> None:
+    """Commit the current chunk together with the job's new progress (Job column values).
+
+    Raises JobInterrupted (after rolling the chunk back) if another runner has taken the job,
+    or (after committing) if this runner is stopping; JobCancelled if cancellation was requested.
+    """
+    claimed = db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.owner == _owner)
+        .values(heartbeat_at=datetime.utcnow(), **progress)
+    ).rowcount
+    if not claimed:
+        db.rollback()
+        raise JobInterrupted
+    db.commit()
+    if _stop.is_set():
+        raise JobInterrupted
+    if job.cancel_requested:  # reloaded: the commit expired the instance
+        raise JobCancelled
+
+
+def _claimable():
+    stale = datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+    return or_(Job.status == "queued", and_(Job.status == "running", Job.heartbeat_at < stale))
+
+
+def _claim(db: Session) -> str | None:
+    job_id = db.execute(
+        select(Job.id).where(_claimable()).order_by(Job.created_at).limit(1)
+    ).scalar_one_or_none()
+    if job_id is None:
+        return None
+    now = datetime.utcnow()
+    claimed = db.execute(
+        update(Job)
+        .where(Job.id == job_id, _claimable())
+        .values(
+            status="running",
+            owner=_owner,
+            heartbeat_at=now,
+            started_at=func.coalesce(Job.started_at, now),
+            run_started_at=now,
+            run_start_offset=Job.offset,
+        )
+    ).rowcount
+    db.commit()
+    return job_id if claimed else None
+
+
+def _remove_input(job: Job) -> None:
+    try:
+        os.remove(job.file_path)
+    except FileNotFoundError:
+        pass
+
+
+def _finish(db: Session, job: Job, status: str, error: str | None = None) -> None:
+    db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.owner == _owner)
+        .values(status=status, error=error, owner=None, finished_at=datetime.utcnow())
+    )
+    db.commit()
+    _remove_input(job)
+
+
+def _keep_alive(job_id: str, done: threading.Event) -> None:
+    """Refresh the heartbeat of a job this runner owns until `done` is set."""
+    while not done.wait(JOB_STALE_SECONDS / 4):
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(Job).where(Job.id == job_id, Job.owner == _owner).values(heartbeat_at=datetime.utcnow())
+            )
+            db.commit()
+        except OperationalError:  # database busy; the next beat retries
+            db.rollback()
+        finally:
+            db.close()
+
+
+def _run(job_id: str) -> None:
+    done = threading.Event()
+    keep_alive = threading.Thread(
+        target=_keep_alive, args=(job_id, done), name=f"job-heartbeat-{job_id}", daemon=True
+    )
+    keep_alive.start()
+    db = SessionLocal()
+    try:
+        job = db.get(Job, job_id)
+        try:
+            if job.cancel_requested:
+                raise JobCancelled
+            _handlers[job.kind](db, job)
+        except JobCancelled:
+            db.rollback()
+            _finish(db, job, "cancelled")
+        except JobInterrupted:
+            db.rollback()
+            # Hand the job back so any runner (including this one after a restart) resumes it.
+            db.execute(
+                update(Job).where(Job.id == job_id, Job.owner == _owner).values(status="queued", owner=None)
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            _finish(db, job, "failed", str(e) or type(e).__name__)
+        else:
+            _finish(db, job, "succeeded")
+    finally:
+        db.close()
+        done.set()
+        keep_alive.join()
+
+
+def _loop() -> None:
+    while not _stop.is_set():
+        _wake.clear()
+        db = SessionLocal()
+        try:
+            job_id = _claim(db)
+        except OperationalError:  # database busy; try again on the next poll
+            db.rollback()
+            job_id = None
+        finally:
+            db.close()
+        if job_id is None:
+            _wake.wait(JOB_POLL_SECONDS)
+            continue
+        try:
+            _run(job_id)
+        except Exception:
+            # Keep the runner alive; the job's heartbeat goes stale and it is claimed again.
+            logger.exception("Job %s could not be run", job_id)
+
+
+def start() -> None:
+    """Start this process's runner thread (picks up queued and orphaned jobs)."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_loop, name="job-runner", daemon=True)
+    _thread.start()
+
+
+def stop(timeout: float = 30.0) -> None:
+    """Stop the runner after its current chunk; an unfinished job is re-queued for resume."""
+    _stop.set()
+    _wake.set()
+    if _thread is not None:
+        _thread.join(timeout)
@@ -0,0 +1,109 @@
+"""In-process read-through cache for hot lookups (departments, employees by employee_id).
+
+Entries are immutable snapshots (never ORM instances, which are bound to a session), kept
+in an LRU of bounded size with a TTL. Services invalidate on every local create/delete,
+once the caller's transaction commits (see `on_commit`); the TTL bounds staleness for
+writes made by other worker processes.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+LOOKUP_CACHE_TTL = float(os.getenv("LOOKUP_CACHE_TTL", "60"))
+LOOKUP_CACHE_SIZE = int(os.getenv("LOOKUP_CACHE_SIZE", "10000"))
+
+
+class LookupCache:
+    """Thread-safe LRU + TTL cache with hit/miss counters. Misses (None results) are not cached."""
+
+    def __init__(self, name: str, maxsize: int = LOOKUP_CACHE_SIZE, ttl: float = LOOKUP_CACHE_TTL):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by `invalidate`, so a load that overlapped an invalidation is not stored.
+        self._generations: dict[Hashable, int] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = (self._epoch, self._generations.get(key, 0))
+        value = loader()
+        if value is not None and self.ttl > 0:
+            with self._lock:
+                if generation != (self._epoch, self._generations.get(key, 0)):
+                    # Invalidated while loading: `value` may predate the write.
+                    return value
+                self._data[key] = (now + self.ttl, value)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop the given keys, or everything when called without keys."""
+        with self._lock:
+            if not keys:
+                self._data.clear()
+            for key in keys:
+                self._data.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+            if not keys or len(self._generations) > self.maxsize:
+                # A new epoch invalidates every load in flight; keeps the generations bounded.
+                self._generations.clear()
+                self._epoch += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+departments = LookupCache("departments")
+employees = LookupCache("employees")
+
+
+def all_stats() -> list[dict]:
+    return [departments.stats(), employees.stats()]
+
+
+def on_commit(session: Session, invalidate: Callable[[], None]) -> None:
+    """Run `invalidate` after the session's current transaction commits (dropped on rollback).
+
+    Services that stage writes without committing use this, so a concurrent reader can't
+    re-cache the pre-commit state after an eager invalidation.
+    """
+    session.info.setdefault("cache_invalidations", []).append(invalidate)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_invalidations(session: Session) -> None:
+    for invalidate in session.info.pop("cache_invalidations", ()):
+        invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_invalidations(session: Session) -> None:
+    session.info.pop("cache_invalidations", None)
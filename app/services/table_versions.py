@@ -0,0 +1,105 @@
+"""Per-table write version counters (used for ETags on list endpoints).
+
+Every committed Session write bumps the version of the tables it touched: ORM flushes are
+seen in `after_flush`, Core INSERT/UPDATE/DELETE statements run through the session in
+`do_orm_execute`. No service has to remember to bump anything.
+
+The counters live in the `table_versions` table and are bumped in `before_commit`, inside
+the writing transaction, so they commit (or roll back) with the data and every process
+(other uvicorn workers, manage.py) sees the same versions. Readers keep a copy and re-read
+the table only when SQLite's `PRAGMA data_version` on a dedicated connection says another
+connection has committed since; a commit that only touched other tables leaves the
+versions of these ones, and so their ETags, unchanged. Without a database file to watch
+(e.g. in-memory SQLite) the versions are counted in this process instead.
+"""
+import secrets
+import sqlite3
+import threading
+from collections import defaultdict
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.models import TableVersion
+
+# Changes on restart, so ETags from a previous process never match.
+BOOT_TOKEN = secrets.token_hex(4)
+
+_lock = threading.Lock()
+_versions: dict[str, int] = defaultdict(int)
+_watch_conn: sqlite3.Connection | None = None
+_seen_data_version: int | None = None
+
+if engine.dialect.name == "sqlite" and engine.url.database not in (None, "", ":memory:"):
+    _watch_conn = sqlite3.connect(engine.url.database, check_same_thread=False)
+
+
+def _reload() -> None:
+    """Re-read `table_versions` if any connection has committed since the last read."""
+    global _seen_data_version
+    current = _watch_conn.execute("PRAGMA data_version").fetchone()[0]
+    if current == _seen_data_version:
+        return
+    try:
+        rows = _watch_conn.execute("SELECT name, version FROM table_versions").fetchall()
+    except sqlite3.OperationalError:  # not created yet
+        rows = []
+    _versions.clear()
+    _versions.update(rows)
+    _seen_data_version = current
+
+
+def snapshot(*tables: str) -> tuple[int, ...]:
+    """Current versions of `tables`."""
+    with _lock:
+        if _watch_conn is not None:
+            _reload()
+        return tuple(_versions[t] for t in tables)
+
+
+def _pending(session: Session) -> set[str]:
+    return session.info.setdefault("written_tables", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, _flush_context) -> None:
+    tables = _pending(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        tables.add(type(obj).__table__.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_dml(state) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if table is not None and table is not TableVersion.__table__:
+            _pending(state.session).add(table.name)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_in_transaction(session: Session) -> None:
+    session.flush()  # commit flushes after this hook; the flush's tables must be counted here
+    tables = session.info.get("written_tables")
+    if not tables or _watch_conn is None:
+        return
+    stmt = sqlite_insert(TableVersion).values([{"name": t, "version": 1} for t in sorted(tables)])
+    session.execute(
+        stmt.on_conflict_do_update(index_elements=[TableVersion.name], set_={"version": TableVersion.version + 1})
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _count_locally(session: Session) -> None:
+    tables = session.info.pop("written_tables", None)
+    if tables and _watch_conn is None:
+        with _lock:
+            for table in tables:
+                _versions[table] += 1
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop("written_tables", None)
@@ -0,0 +1,120 @@
+"""Load test: sync (threadpool) vs async (DB_ASYNC=1) request path.
+
+Usage: python benchmarks/bench_async_mode.py [--clients 200] [--seconds 10] [--employees 5000]
+
+Run it on a multi-core host: the load generator shares the CPU with the server.
+
+Seeds a temporary DB, then for each mode starts uvicorn on it and has many concurrent
+dashboard clients poll GET /api/employees pages (plain and filtered) and the attendance
+summary. Each request asks for a different page, so it misses the in-memory body cache and
+reaches the database. Prints requests/s and p50/p99 latency per mode. Needs httpx
+(pip install httpx).
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def seed(url: str, employees: int) -> None:
+    from sqlalchemy.orm import sessionmaker
+
+    from app.database import Base, build_engine
+    from app.models import Department, Employee
+
+    eng = build_engine(url, "production")
+    Base.metadata.create_all(eng)
+    db = sessionmaker(bind=eng)()
+    db.add_all([Department(name="Dept A"), Department(name="Dept B")])
+    db.flush()
+    db.add_all(
+        Employee(employee_id=f"E{i}", full_name=f"Employee {i}", email=f"e{i}@bench.local", department_id=1 + i % 2)
+        for i in range(employees)
+    )
+    db.commit()
+    db.close()
+    eng.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def load(base: str, clients: int, seconds: float, employees: int) -> list[float]:
+    latencies: list[float] = []
+    deadline = time.perf_counter() + seconds
+    paths = [
+        lambda i: f"/api/employees?limit=50&after={i % employees}",
+        lambda i: f"/api/employees?limit=50&department_id=2&prefix=employee {i % 1000}",
+        lambda i: f"/api/attendance/summary?department_id={1 + i % 2}&date_from=2024-01-{1 + i % 28:02d}",
+    ]
+
+    async def client(n: int):
+        async with httpx.AsyncClient(base_url=base, timeout=60) as http:
+            i = n
+            while time.perf_counter() < deadline:
+                t = time.perf_counter()
+                r = await http.get(paths[i % len(paths)](i))
+                r.raise_for_status()
+                latencies.append(time.perf_counter() - t)
+                i += 1
+
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    return latencies
+
+
+def run_mode(url: str, async_mode: bool, clients: int, seconds: float, employees: int) -> None:
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=url, DB_PROFILE="production", DB_ASYNC="1" if async_mode else "0")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(base + "/api/departments", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        latencies = asyncio.run(load(base, clients, seconds, employees))
+    finally:
+        proc.terminate()
+        proc.wait()
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{'async' if async_mode else 'sync':>6}: {len(latencies) / seconds:8.1f} req/s  "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--employees", type=int, default=5000)
+    args = parser.parse_args()
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    seed(url, args.employees)
+    print(f"{args.clients} concurrent clients, {args.employees} employees, {args.seconds}s per mode")
+    for async_mode in (False, True):
+        run_mode(url, async_mode, args.clients, args.seconds, args.employees)
+
+
+if __name__ == "__main__":
+    main()
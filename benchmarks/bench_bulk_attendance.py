@@ -0,0 +1,103 @@
+"""Backfilling a month of attendance: one POST /attendance/bulk per day vs one multi-day call.
+
+Usage: python benchmarks/bench_bulk_attendance.py [--employees 10000] [--days 30]
+
+Calls attendance_controller.bulk_attendance once per date, then bulk_attendance_multi_day with a
+date range (weekday pattern) on a second fresh database, and finally re-sends the same range as
+{employeeId, date, status} triples so every row is an update. Prints time, rows/s and statements.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.controllers import attendance_controller
+from app.database import Base, build_engine
+from app.models import Department, Employee
+from app.schemas import AttendanceBulkCreate, AttendanceMultiDayBulkCreate
+
+START = date(2024, 1, 1)
+PATTERN = ["Present", "Present", "Present", "Absent", "Present", None, None]
+
+
+def fresh_session(employees: int):
+    engine = build_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}", "production")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Department), [{"id": 1, "name": "Bench"}])
+        conn.execute(
+            insert(Employee),
+            [
+                {"employee_id": f"E{i}", "full_name": f"Name {i}", "email": f"e{i}@bench.example.com", "department_id": 1}
+                for i in range(employees)
+            ],
+        )
+    statements = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(*_args):
+        statements[0] += 1
+
+    return sessionmaker(bind=engine, autoflush=False), statements
+
+
+def timed(label: str, Session, statements: list[int], fn) -> None:
+    db = Session()
+    statements[0] = 0
+    start = time.perf_counter()
+    rows = fn(db)
+    elapsed = time.perf_counter() - start
+    db.close()
+    print(f"{label:<26} {elapsed:8.2f}s  {rows / elapsed:>9.0f} rows/s  {statements[0]:>6} statements")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+    ids = [f"E{i}" for i in range(args.employees)]
+    dates = [START + timedelta(days=d) for d in range(args.days)]
+    statuses = [[(eid, PATTERN[d % len(PATTERN)]) for eid in ids] for d in range(args.days)]
+
+    def per_day(db) -> int:
+        rows = 0
+        for d, day in zip(dates, statuses):
+            records = [{"employeeId": eid, "status": st} for eid, st in day if st]
+            if not records:
+                continue
+            attendance_controller.bulk_attendance(AttendanceBulkCreate(date=d, records=records), db)
+            rows += len(records)
+        return rows
+
+    rows_in_range = sum(1 for day in statuses for _, st in day if st)
+    date_range = {
+        "dateFrom": dates[0],
+        "dateTo": dates[-1],
+        "employees": [{"employeeId": eid, "pattern": PATTERN} for eid in ids],
+    }
+    triples = [{"employeeId": eid, "date": d, "status": st} for d, day in zip(dates, statuses) for eid, st in day if st]
+
+    def multi_day(body):
+        def call(db) -> int:
+            result = attendance_controller.bulk_attendance_multi_day(AttendanceMultiDayBulkCreate(**body), db)
+            return result["created"] + result["updated"]
+        return call
+
+    Session, statements = fresh_session(args.employees)
+    timed(f"per-day bulk x{args.days}", Session, statements, per_day)
+    Session, statements = fresh_session(args.employees)
+    timed("multi-day dateRange", Session, statements, multi_day({"dateRange": date_range}))
+    timed("multi-day records (upd)", Session, statements, multi_day({"records": triples}))
+    print(f"{rows_in_range} rows, chunks of {attendance_controller.MULTI_DAY_CHUNK_SIZE}")
+
+
+if __name__ == "__main__":
+    main()
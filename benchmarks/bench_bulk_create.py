@@ -0,0 +1,76 @@
+"""Bulk create throughput for departments and employees at increasing payload sizes.
+
+Usage: python benchmarks/bench_bulk_create.py [--sizes 1000 10000 100000]
+
+Calls department_controller.bulk_create_departments and employee_controller.bulk_create_employees
+(the POST .../bulk handlers) on a fresh database per size. 10% of each payload repeats an
+earlier item, so the duplicate checks are exercised. Prints time and SQL statements per call.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.controllers import department_controller, employee_controller
+from app.database import Base, build_engine
+from app.schemas import EmployeeCreate
+
+DEPARTMENTS = 20
+
+
+def run(size: int) -> None:
+    engine = build_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}", "production")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    statements = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(*_args):
+        nonlocal statements
+        statements += 1
+
+    def timed(label: str, fn, *args) -> None:
+        nonlocal statements
+        db = Session()
+        statements = 0
+        start = time.perf_counter()
+        result = fn(db, *args)
+        elapsed = time.perf_counter() - start
+        db.close()
+        print(
+            f"{size:>7} {label:<12} {elapsed:8.3f}s  {statements:>6} statements  "
+            f"created={result.created} failed={result.failed}"
+        )
+
+    unique = size - size // 10
+    names = [f"Dept {i}" for i in range(unique)]
+    names += names[: size - unique]
+    timed("departments", department_controller.bulk_create_departments, names)
+
+    employees = [
+        EmployeeCreate(
+            employeeId=f"E{i}", fullName=f"Name {i}", email=f"e{i}@bench.example.com", departmentId=i % DEPARTMENTS + 1
+        )
+        for i in range(unique)
+    ]
+    employees += employees[: size - unique]
+    timed("employees", employee_controller.bulk_create_employees, employees)
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Employee search latency on a large table.
+
+Usage: python benchmarks/bench_employee_search.py [--employees 100000] [--repeat 50]
+
+Seeds a temporary DB (names drawn from small first/last name lists, so common prefixes
+match thousands of rows), builds the FTS5 index, then runs employee_search_service.search
+for a mix of queries. Prints p50/p99 per query and the index build time.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, build_engine
+from app.db_migrations import ensure_employee_search
+from app.models import Department, Employee
+from app.services import employee_search_service
+
+FIRST = ["Anna", "Ben", "Carla", "Dmitri", "Elena", "Farah", "Gustavo", "Hiro", "Ines", "Jonas", "Kavya", "Liam"]
+LAST = ["Smith", "Okafor", "Schmidt", "Nakamura", "Garcia", "Novak", "Haddad", "Larsen", "Kowalski", "Singh"]
+DEPARTMENTS = ["Engineering", "Sales", "Finance", "People", "Support", "Legal", "Marketing", "Operations"]
+QUERIES = ["anna", "sm", "anna smi", "e12345", "kowalski eng", "farah.haddad", "zzz", "a"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = build_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}", "production")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    rng = random.Random(1)
+    with Session() as db:
+        db.execute(insert(Department), [{"name": name} for name in DEPARTMENTS])
+        rows = []
+        for i in range(args.employees):
+            first, last = rng.choice(FIRST), rng.choice(LAST)
+            rows.append(
+                {
+                    "employee_id": f"E{i}",
+                    "full_name": f"{first} {last}",
+                    "email": f"{first}.{last}.{i}@example.com".lower(),
+                    "department_id": 1 + i % len(DEPARTMENTS),
+                }
+            )
+        db.execute(insert(Employee), rows)
+        db.commit()
+    start = time.perf_counter()
+    ensure_employee_search(engine)
+    print(f"index build: {time.perf_counter() - start:.2f}s for {args.employees} employees")
+
+    with Session() as db:
+        for q in QUERIES:
+            latencies = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                found = employee_search_service.search(db, q, 20)
+                latencies.append(time.perf_counter() - start)
+            p = statistics.quantiles(latencies, n=100, method="inclusive")
+            print(f"{q!r:<16} {len(found):>3} hits  p50={p[49] * 1000:6.2f} ms  p99={p[98] * 1000:6.2f} ms")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Load test: single attendance marks with and without group commit.
+
+Usage: python benchmarks/bench_group_commit.py [--clients 200] [--seconds 10] [--employees 5000]
+                                               [--workers 1] [--windows 0 2 5]
+
+Run it on a multi-core host: the load generator shares the CPU with the server.
+
+Seeds a temporary DB, then for each GROUP_COMMIT_WINDOW_MS (0 = off, one transaction per
+mark) starts uvicorn on it in the production profile and has many concurrent clients POST
+/api/attendance for distinct employees and dates (the morning rush). Prints marks/s, p50/p99
+latency and failed requests per window. Needs httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_async_mode import free_port, seed  # noqa: E402
+
+
+async def load(base: str, clients: int, seconds: float, employees: int, first_day: date) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    failed = 0
+    deadline = time.perf_counter() + seconds
+    counter = iter(range(10**9))
+
+    async def client():
+        nonlocal failed
+        async with httpx.AsyncClient(base_url=base, timeout=60) as http:
+            while time.perf_counter() < deadline:
+                n = next(counter)
+                body = {
+                    "employeeId": f"E{n % employees}",
+                    "date": (first_day + timedelta(days=n // employees)).isoformat(),
+                    "status": "Present" if n % 4 else "Absent",
+                }
+                t = time.perf_counter()
+                r = await http.post("/api/attendance", json=body)
+                if r.status_code == 201:
+                    latencies.append(time.perf_counter() - t)
+                else:
+                    failed += 1
+
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return latencies, failed
+
+
+def run_window(url: str, window: float, args: argparse.Namespace, first_day: date) -> None:
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=url, DB_PROFILE="production", GROUP_COMMIT_WINDOW_MS=str(window))
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(base + "/api/departments", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        latencies, failed = asyncio.run(load(base, args.clients, args.seconds, args.employees, first_day))
+    finally:
+        proc.terminate()
+        proc.wait()
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else float("nan")
+    median = statistics.median(latencies) if latencies else float("nan")
+    print(
+        f"window {window:>4g} ms: {len(latencies) / args.seconds:8.1f} marks/s  "
+        f"p50 {median * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms  failed {failed}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 2, 5])
+    args = parser.parse_args()
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    seed(url, args.employees)
+    print(f"{args.clients} concurrent clients, {args.workers} worker(s), {args.seconds}s per window")
+    for i, window in enumerate(args.windows):
+        # Each run marks its own range of dates, so every mark creates a row.
+        run_window(url, window, args, date(2024, 1, 1) + timedelta(days=400 * i))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""CPU time and peak memory of the list queries: ORM entities vs column-projected Core rows.
+
+Usage: python benchmarks/bench_list_queries.py [--employees 100000] [--repeat 3]
+
+Seeds a temporary DB, then builds the GET /api/employees and GET /api/departments?expand=employees
+payloads (full lists, before JSON encoding) two ways: the former ORM loaders (select(Entity)
+with joinedload and unique(), then copying fields out) and the current controllers
+(employee_service.page_select / department_service.employee_rows_select). The default department
+list (counts only) is included for reference. Prints the best time and the tracemalloc
+peak of each.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import Response
+from sqlalchemy import insert, select
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from app.controllers import department_controller, employee_controller
+from app.database import Base, build_engine, run_query
+from app.models import Department, Employee
+
+DEPARTMENTS = 20
+
+
+def orm_employees(db) -> list[dict]:
+    employees = db.execute(
+        select(Employee).options(joinedload(Employee.department)).order_by(Employee.id)
+    ).unique().scalars().all()
+    return [
+        {
+            "id": e.id,
+            "employeeId": e.employee_id,
+            "fullName": e.full_name,
+            "email": e.email,
+            "departmentId": e.department_id,
+            "departmentName": e.department.name if e.department else "",
+        }
+        for e in employees
+    ]
+
+
+def orm_departments(db) -> list[dict]:
+    departments = db.execute(
+        select(Department).options(joinedload(Department.employees)).order_by(Department.name)
+    ).unique().scalars().all()
+    return [
+        {
+            "id": d.id,
+            "name": d.name,
+            "employeeCount": len(d.employees),
+            "employees": [
+                {"id": e.id, "employeeId": e.employee_id, "fullName": e.full_name, "email": e.email}
+                for e in d.employees
+            ],
+        }
+        for d in departments
+    ]
+
+
+def measure(Session, fn, repeat: int) -> tuple[float, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        db = Session()
+        start = time.perf_counter()
+        fn(db)
+        best = min(best, time.perf_counter() - start)
+        db.close()
+    db = Session()
+    tracemalloc.start()
+    fn(db)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.close()
+    return best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = build_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}", "production")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    with Session() as db:
+        db.execute(insert(Department), [{"name": f"Dept {i}"} for i in range(DEPARTMENTS)])
+        db.execute(
+            insert(Employee),
+            [
+                {
+                    "employee_id": f"E{i}",
+                    "full_name": f"Employee {i}",
+                    "email": f"e{i}@bench.local",
+                    "department_id": 1 + i % DEPARTMENTS,
+                }
+                for i in range(args.employees)
+            ],
+        )
+        db.commit()
+
+    cases = [
+        ("employees", "orm", orm_employees),
+        ("employees", "core", lambda db: run_query(db, employee_controller.list_employees(Response()))),
+        ("departments", "orm", orm_departments),
+        ("departments", "core", lambda db: run_query(db, department_controller.list_departments(expand_employees=True))),
+        ("departments", "count", lambda db: run_query(db, department_controller.list_departments())),
+    ]
+    for name, kind, fn in cases:
+        best, peak = measure(Session, fn, args.repeat)
+        print(
+            f"{name:<12} {kind:<5} {best * 1000:8.1f} ms  {best / args.employees * 1e6:5.2f} us/row  "
+            f"peak {peak / 2**20:6.1f} MiB  ({peak / args.employees:5.0f} B/row)"
+        )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
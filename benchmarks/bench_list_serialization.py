@@ -0,0 +1,88 @@
+"""Latency of the large list endpoints: Pydantic response models vs the fast JSON path.
+
+Usage: python benchmarks/bench_list_serialization.py [--employees 50000] [--requests 30]
+
+Seeds a temporary DB, then calls GET /api/employees and GET /api/departments?expand=employees
+in-process with FAST_JSON off and on. The ETag body cache is cleared before every request,
+so each one queries and serializes. Prints p50/p99 latency and body size per path and mode.
+Needs httpx (pip install httpx).
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+os.environ.setdefault("DB_PROFILE", "production")
+
+DEPARTMENTS = 20
+
+
+def seed(employees: int) -> None:
+    from sqlalchemy import insert
+
+    from app.database import SessionLocal
+    from app.models import Department, Employee
+
+    db = SessionLocal()
+    db.execute(insert(Department), [{"name": f"Dept {i}"} for i in range(DEPARTMENTS)])
+    db.execute(
+        insert(Employee),
+        [
+            {
+                "employee_id": f"E{i}",
+                "full_name": f"Employee {i}",
+                "email": f"e{i}@bench.local",
+                "department_id": 1 + i % DEPARTMENTS,
+            }
+            for i in range(employees)
+        ],
+    )
+    db.commit()
+    db.close()
+
+
+def percentile(samples: list[float], q: float) -> float:
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1] if len(samples) > 1 else samples[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=50000)
+    parser.add_argument("--requests", type=int, default=30)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+
+    from app.controllers import fast_json, http_cache
+    from app.main import app
+
+    with TestClient(app) as client:
+        seed(args.employees)
+        for path in ("/api/employees", "/api/departments?expand=employees"):
+            for fast in (False, True):
+                fast_json.FAST_JSON = fast
+                latencies = []
+                size = 0
+                for i in range(args.requests + 2):
+                    http_cache._bodies.clear()
+                    start = time.perf_counter()
+                    r = client.get(path)
+                    elapsed = time.perf_counter() - start
+                    r.raise_for_status()
+                    size = len(r.content)
+                    if i >= 2:  # warm-up
+                        latencies.append(elapsed)
+                print(
+                    f"{path:<33} {'fast_json' if fast else 'pydantic':<9} "
+                    f"p50={percentile(latencies, 50) * 1000:7.1f} ms  p99={percentile(latencies, 99) * 1000:7.1f} ms  "
+                    f"{size / 1e6:.1f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
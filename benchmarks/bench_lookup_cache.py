@@ -0,0 +1,69 @@
+"""SQL statements per single attendance mark, with and without the lookup cache.
+
+Usage: python benchmarks/bench_lookup_cache.py [--marks 500]
+
+Counts statements sent to SQLite while committing `--marks` marks spread over 50 employees
+one at a time through attendance_controller.stage_marks (what POST /api/attendance runs for a
+mark that is committed on its own).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.controllers import attendance_controller
+from app.database import Base, build_engine
+from app.models import Department, Employee
+from app.schemas import AttendanceCreate
+from app.services import lookup_cache
+
+
+def run(marks: int, ttl: float) -> tuple[float, float]:
+    engine = build_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}", "production")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db = Session()
+    db.add(Department(name="Bench"))
+    db.flush()
+    db.add_all(Employee(employee_id=f"E{i}", full_name=f"N{i}", email=f"e{i}@bench.local", department_id=1) for i in range(50))
+    db.commit()
+
+    lookup_cache.employees.ttl = ttl
+    lookup_cache.employees.invalidate()
+    statements = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(*_args):
+        nonlocal statements
+        statements += 1
+
+    start = time.perf_counter()
+    for n in range(marks):
+        body = AttendanceCreate(employeeId=f"E{n % 50}", date=date(2025, 1, 1) + timedelta(days=n // 50), status="Present")
+        attendance_controller.stage_marks(db, [body])
+        db.commit()
+    elapsed = time.perf_counter() - start
+    db.close()
+    engine.dispose()
+    return statements / marks, elapsed / marks * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--marks", type=int, default=500)
+    args = parser.parse_args()
+    for label, ttl in (("no cache", 0.0), ("cache", 60.0)):
+        per_mark, ms = run(args.marks, ttl)
+        print(f"{label:>9}: {per_mark:5.2f} statements/mark  {ms:6.2f} ms/mark")
+    print(lookup_cache.employees.stats())
+
+
+if __name__ == "__main__":
+    main()
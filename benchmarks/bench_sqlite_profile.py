@@ -0,0 +1,114 @@
+"""Read throughput under concurrent writes: default vs production SQLite profile.
+
+Usage: python benchmarks/bench_sqlite_profile.py [--readers 8] [--seconds 5] [--employees 2000]
+
+For each profile a fresh temporary DB is seeded, then one writer thread keeps submitting
+whole-day roll calls (POST /api/attendance/bulk) while reader threads run single-record
+attendance lookups. Prints completed reads/s and roll-call commits/s per profile.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, build_engine
+from app.models import Attendance, Department, Employee
+from app.services import attendance_service
+
+START = date(2025, 1, 1)
+
+
+def seed(Session, employees: int, days: int) -> None:
+    db = Session()
+    dept = Department(name="Bench")
+    db.add(dept)
+    db.flush()
+    db.add_all(
+        Employee(employee_id=f"E{i}", full_name=f"Employee {i}", email=f"e{i}@bench.local", department_id=dept.id)
+        for i in range(employees)
+    )
+    db.flush()
+    for d in range(days):
+        db.add_all(
+            Attendance(employee_id=f"E{i}", date=START + timedelta(days=d), status="Present")
+            for i in range(employees)
+        )
+    db.commit()
+    db.close()
+
+
+def run(profile: str, readers: int, seconds: float, employees: int, days: int) -> tuple[float, float, int]:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = build_engine(f"sqlite:///{path}", profile)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    seed(Session, employees, days)
+
+    stop = threading.Event()
+    reads = [0] * readers
+    writes = errors = 0
+
+    def writer():
+        nonlocal writes, errors
+        db = Session()
+        d = days
+        while not stop.is_set():
+            day = START + timedelta(days=d)
+            try:
+                records = [(f"E{i}", random.choice(("Present", "Absent"))) for i in range(employees)]
+                attendance_service.bulk_upsert(db, day, records)
+                db.commit()
+                writes += 1
+            except OperationalError:
+                db.rollback()
+                errors += 1
+            d += 1
+        db.close()
+
+    def reader(n: int):
+        db = Session()
+        while not stop.is_set():
+            day = START + timedelta(days=random.randrange(days))
+            try:
+                attendance_service.get_by_employee_date(db, f"E{random.randrange(employees)}", day)
+                reads[n] += 1
+            except OperationalError:
+                db.rollback()
+            db.rollback()  # end the read transaction like a request would
+        db.close()
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    engine.dispose()
+    return sum(reads) / seconds, writes / seconds, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+    print(f"{args.readers} readers, 1 writer, {args.employees} employees x {args.days} days, {args.seconds}s each")
+    for profile in ("default", "production"):
+        rps, wps, errors = run(profile, args.readers, args.seconds, args.employees, args.days)
+        print(f"{profile:>10}: {rps:8.1f} reads/s  {wps:7.1f} roll calls/s  {errors} busy errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Maintenance commands for the HRMS database.
+
+Usage:
+    python manage.py rebuild-summary    Recompute the attendance rollups (summary, monthly, department daily)
+    python manage.py rebuild-search     Repopulate the employee full-text search index
+    python manage.py archive-logs [--days N] [--batch-size N]
+                                        Move admin logs older than N days to gzip NDJSON archives,
+                                        then run an incremental vacuum (run it from cron)
+    python manage.py query-archive [--from T] [--to T] [--entity-type X] [--action X] [--limit N]
+                                        Print archived admin logs as NDJSON, newest first
+    python manage.py enable-incremental-vacuum
+                                        One-off: switch an existing DB to auto_vacuum=INCREMENTAL
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import Base, SessionLocal, engine
+from app.models import (  # noqa: F401 - register tables with Base
+    AdminLog,
+    AttendanceDepartmentDaily,
+    AttendanceMonthly,
+    AttendanceSummary,
+    Department,
+    Employee,
+)
+from app.services import admin_log_archive_service, attendance_summary_service, employee_search_service
+
+
+def rebuild_summary(args: argparse.Namespace) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        rows = attendance_summary_service.rebuild(db)
+        db.commit()
+        print("Rebuilt attendance summary for", rows, "employee(s).")
+    finally:
+        db.close()
+
+
+def rebuild_search(args: argparse.Namespace) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        rows = employee_search_service.rebuild(db)
+        db.commit()
+        print("Indexed", rows, "employee(s) for search.")
+    finally:
+        db.close()
+
+
+def archive_logs(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        moved = admin_log_archive_service.apply_retention(db, days=args.days, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"Archived {moved} admin log(s) older than {args.days} day(s) to {admin_log_archive_service.ADMIN_LOG_ARCHIVE_DIR}.")
+    free_pages = admin_log_archive_service.incremental_vacuum(engine)
+    if free_pages is None:
+        print("auto_vacuum is not INCREMENTAL; run `python manage.py enable-incremental-vacuum` once to reclaim space.")
+    else:
+        print("Incremental vacuum done;", free_pages, "free page(s) left.")
+
+
+def query_archive(args: argparse.Namespace) -> None:
+    rows = admin_log_archive_service.query(
+        created_from=args.created_from, created_to=args.created_to, entity_type=args.entity_type, action=args.action
+    )
+    for row in islice(rows, args.limit):
+        print(json.dumps(row))
+
+
+def enable_incremental_vacuum(args: argparse.Namespace) -> None:
+    admin_log_archive_service.enable_incremental_vacuum(engine)
+    print("auto_vacuum set to INCREMENTAL.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HRMS maintenance commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild-summary", help="Recompute attendance rollups from attendance").set_defaults(
+        func=rebuild_summary
+    )
+    sub.add_parser("rebuild-search", help="Repopulate the employee search index").set_defaults(func=rebuild_search)
+    archive = sub.add_parser("archive-logs", help="Archive and delete old admin logs, then vacuum")
+    archive.add_argument("--days", type=int, default=admin_log_archive_service.ADMIN_LOG_RETENTION_DAYS)
+    archive.add_argument("--batch-size", type=int, default=5000)
+    archive.set_defaults(func=archive_logs)
+    query = sub.add_parser("query-archive", help="Print archived admin logs as NDJSON")
+    query.add_argument("--from", dest="created_from", type=datetime.fromisoformat)
+    query.add_argument("--to", dest="created_to", type=datetime.fromisoformat)
+    query.add_argument("--entity-type")
+    query.add_argument("--action")
+    query.add_argument("--limit", type=int, default=1000)
+    query.set_defaults(func=query_archive)
+    sub.add_parser(
+        "enable-incremental-vacuum", help="Switch the DB to auto_vacuum=INCREMENTAL (full VACUUM once)"
+    ).set_defaults(func=enable_incremental_vacuum)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
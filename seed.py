@@ -1,6 +1,7 @@
 """Seed DB with departments, Indian-name employees, and sample attendance. Idempotent: skips if data exists."""
 import os
 import sys
+from datetime import date as Date
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -9,6 +10,7 @@ from sqlalchemy import select
 from app.database import Base, SessionLocal, engine
 from app.db_migrations import ensure_employees_department_id
 from app.models import Attendance, Department, Employee
+from app.services import attendance_summary_service
 
 SEED_DEPARTMENTS = ["Engineering", "HR", "Sales", "Finance"]
 
@@ -70,7 +72,9 @@ def seed():
         print("Added", len(SEED_EMPLOYEES), "employees.")
 
         for employee_id, date, status in SAMPLE_ATTENDANCE:
-            db.add(Attendance(employee_id=employee_id, date=date, status=status))
+            db.add(Attendance(employee_id=employee_id, date=Date.fromisoformat(date), status=status))
+        db.flush()
+        attendance_summary_service.rebuild(db)
         db.commit()
         print("Added", len(SAMPLE_ATTENDANCE), "attendance records.")
         print("Seed completed.")
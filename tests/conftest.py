@@ -0,0 +1,49 @@
+"""Test setup: the app runs against a throwaway SQLite file (set before `app` is imported)."""
+import os
+import tempfile
+from itertools import count
+
+import pytest
+
+_tmp = tempfile.mkdtemp(prefix="hrms-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/test.db")
+os.environ.setdefault("JOB_DIR", f"{_tmp}/jobs")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+_ids = count(1)
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def make_employees(client):
+    """Create `n` employees (spread over two fresh departments); returns their employeeIds."""
+    def make(n: int) -> list[str]:
+        run = next(_ids)
+        departments = [
+            client.post("/api/departments", json={"name": f"Dept {run}-{i}"}).json()["id"] for i in range(2)
+        ]
+        employee_ids = []
+        for i in range(n):
+            employee_id = f"T{run}-{i}"
+            r = client.post(
+                "/api/employees",
+                json={
+                    "employeeId": employee_id,
+                    "fullName": f"Test {run} {i}",
+                    "email": f"t{run}-{i}@test.example.com",
+                    "departmentId": departments[i % 2],
+                },
+            )
+            assert r.status_code == 201, r.text
+            employee_ids.append(employee_id)
+        return employee_ids
+
+    return make
@@ -0,0 +1,47 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app import database
+from app.controllers import http_cache
+
+
+def _get(client, path: str, **params):
+    http_cache._bodies.clear()  # compare fresh bodies, not the ones cached by the other mode
+    r = client.get(path, params=params)
+    assert r.status_code == 200, r.text
+    return r.json(), r.headers.get("x-next-cursor"), r.headers.get("x-total-count")
+
+
+def test_async_mode_serves_the_same_lists(client, make_employees, monkeypatch):
+    employees = make_employees(6)
+    for employee_id in employees[:4]:
+        client.post("/api/attendance", json={"employeeId": employee_id, "date": "2024-05-02", "status": "Present"})
+    department = client.get("/api/employees", params={"prefix": employees[0].lower()}).json()[0]["departmentId"]
+    requests = [
+        ("/api/employees", {}),
+        ("/api/employees", {"limit": 2, "include_total": "true"}),
+        ("/api/employees", {"prefix": "test", "limit": 3, "include_total": "true"}),
+        ("/api/departments", {}),
+        ("/api/departments", {"expand": "employees"}),
+        (f"/api/departments/{department}/employees", {"limit": 2}),
+        ("/api/attendance/summary", {"date_from": "2024-05-01", "date_to": "2024-06-15"}),
+    ]
+    sync = [_get(client, path, **params) for path, params in requests]
+
+    # What DB_ASYNC=1 sets up: the same queries, awaited on an AsyncSession (aiosqlite).
+    engine = database.build_async_engine(database.DATABASE_URL)
+    monkeypatch.setattr(database, "DB_ASYNC", True)
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(engine, autoflush=False))
+    awaited = []
+
+    async def run_query_async(db, query):
+        awaited.append(type(db).__name__)
+        return await original(db, query)
+
+    original = database.run_query_async
+    monkeypatch.setattr(database, "run_query_async", run_query_async)
+    try:
+        assert [_get(client, path, **params) for path, params in requests] == sync
+        assert awaited == ["AsyncSession"] * len(requests)
+        assert client.get("/api/departments/999999/employees").status_code == 404
+    finally:
+        engine.sync_engine.dispose()
@@ -0,0 +1,28 @@
+from datetime import date
+
+from app.services import attendance_bitmap
+
+
+def test_bitmap_round_trip():
+    rows = [(date(2024, 1, 1), "Present"), (date(2024, 2, 29), "Absent"), (date(2024, 12, 31), "Late")]
+    [year] = attendance_bitmap.encode_years(rows, [2024])
+    assert (year["days"], year["present"], year["absent"]) == (366, 1, 1)
+    assert attendance_bitmap.decode_year(2024, year["bitmap"]) == {
+        date(2024, 1, 1): attendance_bitmap.PRESENT,
+        date(2024, 2, 29): attendance_bitmap.ABSENT,
+        date(2024, 12, 31): attendance_bitmap.OTHER,
+    }
+
+
+def test_bitmap_up_to_the_last_representable_year(client, make_employees):
+    [employee_id] = make_employees(1)
+    client.post("/api/attendance", json={"employeeId": employee_id, "date": "9999-12-31", "status": "Present"})
+    r = client.get(
+        f"/api/employees/{employee_id}/attendance",
+        params={"format": "bitmap", "date_from": "9990-01-01", "date_to": "9999-12-31"},
+    )
+    assert r.status_code == 200, r.text
+    years = r.json()["years"]
+    assert [y["year"] for y in years] == list(range(9990, 10000))
+    assert years[-1]["days"] == 365 and years[-1]["present"] == 1
+    assert attendance_bitmap.decode_year(9999, years[-1]["bitmap"]) == {date(9999, 12, 31): attendance_bitmap.PRESENT}
@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models import AttendanceDepartmentDaily, AttendanceMonthly, AttendanceSummary
+from app.services import attendance_summary_service
+
+ROLLUPS = (AttendanceSummary, AttendanceMonthly, AttendanceDepartmentDaily)
+
+
+def _rollups(db) -> dict[str, list[tuple]]:
+    out = {}
+    for model in ROLLUPS:
+        columns = list(model.__table__.columns)
+        out[model.__tablename__] = sorted(tuple(row) for row in db.execute(select(*columns)))
+    return out
+
+
+def _assert_rollups_match_rebuild():
+    db = SessionLocal()
+    try:
+        maintained = _rollups(db)
+        attendance_summary_service.rebuild(db)
+        db.flush()
+        assert _rollups(db) == maintained
+        db.rollback()
+    finally:
+        db.close()
+
+
+def test_incremental_rollups_match_rebuild(client, make_employees):
+    employees = make_employees(8)
+
+    def mark(employee_id, day, status):
+        r = client.post("/api/attendance", json={"employeeId": employee_id, "date": day, "status": status})
+        assert r.status_code == 201, r.text
+
+    # Single marks, then a status flip of one of them.
+    mark(employees[0], "2024-03-01", "Present")
+    mark(employees[1], "2024-03-01", "Absent")
+    mark(employees[0], "2024-03-01", "Absent")
+    _assert_rollups_match_rebuild()
+
+    # Concurrent single marks (group-committed), including repeats of the same day.
+    marks = [
+        (e, f"2024-03-{d:02d}", "Present" if (i + d) % 3 else "Absent")
+        for d in range(2, 6)
+        for i, e in enumerate(employees)
+    ]
+    marks += [(employees[2], "2024-03-02", "Absent")] * 3
+    with ThreadPoolExecutor(16) as pool:
+        list(pool.map(lambda m: mark(*m), marks))
+    _assert_rollups_match_rebuild()
+
+    # Single-day bulk, overwriting some of the marks above.
+    r = client.post(
+        "/api/attendance/bulk",
+        json={"date": "2024-03-02", "records": [{"employeeId": e, "status": "Present"} for e in employees[:5]]},
+    )
+    assert r.status_code == 200, r.text
+    _assert_rollups_match_rebuild()
+
+    # Multi-day bulk across a month boundary: triples, then a patterned range.
+    records = [
+        {"employeeId": e, "date": d, "status": "Absent"} for e in employees[3:] for d in ("2024-03-31", "2024-04-01")
+    ]
+    assert client.post("/api/attendance/bulk/multi-day", json={"records": records}).status_code == 200
+    date_range = {
+        "dateFrom": "2024-03-25",
+        "dateTo": "2024-04-07",
+        "employees": [{"employeeId": e, "pattern": ["Present", "Absent", None]} for e in employees],
+    }
+    assert client.post("/api/attendance/bulk/multi-day", json={"dateRange": date_range}).status_code == 200
+    _assert_rollups_match_rebuild()
+
+    # Deleting an employee takes their days out of the department counters.
+    assert client.delete(f"/api/employees/{employees[0]}").status_code in (200, 204)
+    _assert_rollups_match_rebuild()
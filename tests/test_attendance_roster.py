@@ -0,0 +1,63 @@
+from datetime import date
+
+from app.database import SessionLocal
+from app.models import Attendance
+from app.services import attendance_service
+
+DAY = "2024-06-03"
+
+
+def _roster(client, **params):
+    return client.get("/api/attendance/roster", params={"date": DAY, **params})
+
+
+def _employee_ids(response) -> list[str]:
+    assert response.status_code == 200, response.text
+    return [e["employeeId"] for e in response.json()]
+
+
+def test_roster_states_and_paging(client, make_employees):
+    employees = make_employees(9)
+    for employee_id in employees[:3]:
+        client.post("/api/attendance", json={"employeeId": employee_id, "date": DAY, "status": "Present"})
+    for employee_id in employees[3:5]:
+        client.post("/api/attendance", json={"employeeId": employee_id, "date": DAY, "status": "Absent"})
+    # A status the API no longer accepts counts as absent, as in the summaries.
+    db = SessionLocal()
+    db.add(Attendance(employee_id=employees[5], date=date(2024, 6, 3), status="Late"))
+    db.commit()
+    db.close()
+    prefix = employees[0].rsplit("-", 1)[0] + "-"
+    mine = lambda ids: [e for e in ids if e.startswith(prefix)]  # noqa: E731
+
+    assert mine(_employee_ids(_roster(client, state="present", limit=1000))) == employees[:3]
+    assert mine(_employee_ids(_roster(client, state="absent", limit=1000))) == employees[3:6]
+
+    unmarked, after = [], None
+    while True:
+        r = _roster(client, state="unmarked", limit=2, **({"after": after} if after else {}))
+        unmarked += _employee_ids(r)
+        after = r.headers.get("x-next-cursor")
+        if not after:
+            break
+    assert unmarked == sorted(unmarked)
+    assert mine(unmarked) == employees[6:]
+
+    r = _roster(client, state="absent", include_total="true")
+    assert int(r.headers["x-total-count"]) == len(_employee_ids(r))
+    assert _roster(client, state="late").status_code == 422
+
+
+def test_marked_states_are_driven_from_the_attendance_index():
+    db = SessionLocal()
+    try:
+        for state in ("present", "absent"):
+            stmt, _ = attendance_service._roster_select(date(2024, 6, 3), state)
+            compiled = stmt.compile(db.get_bind())
+            params = tuple(compiled.params[name] for name in compiled.positiontup)
+            rows = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params)
+            plan = " | ".join(row[3] for row in rows)
+            assert "ix_attendance_date_employee" in plan, plan
+            assert "SCAN employees" not in plan, plan
+    finally:
+        db.close()
@@ -0,0 +1,22 @@
+def test_department_range_summary_counts_only_that_department(client, make_employees):
+    employees = make_employees(4)  # alternating between two departments
+    days = ["2024-01-30", "2024-02-05", "2024-02-20", "2024-03-02"]
+    for i, employee_id in enumerate(employees):
+        for j, day in enumerate(days):
+            status = "Present" if (i + j) % 3 else "Absent"
+            r = client.post("/api/attendance", json={"employeeId": employee_id, "date": day, "status": status})
+            assert r.status_code == 201, r.text
+    run = employees[0].rsplit("-", 1)[0].lower()  # emails are "<employeeId>@..."
+    mine = client.get("/api/employees", params={"prefix": run + "-"}).json()
+    dept_of = {e["employeeId"]: e["departmentId"] for e in mine}
+    window = {"date_from": "2024-01-15", "date_to": "2024-03-10"}  # partial, whole, partial month
+
+    everyone = {row["employeeId"]: row for row in client.get("/api/attendance/summary", params=window).json()}
+    scoped = client.get(
+        "/api/attendance/summary", params={**window, "department_id": dept_of[employees[1]]}
+    ).json()
+
+    assert [row["employeeId"] for row in scoped if row["employeeId"] in employees] == employees[1::2]
+    for row in scoped:
+        assert row == everyone[row["employeeId"]]
+    assert sum(row["presentDays"] + row["absentDays"] for row in scoped if row["employeeId"] in employees) == 8
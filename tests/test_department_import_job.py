@@ -0,0 +1,50 @@
+import io
+import threading
+
+import pytest
+from sqlalchemy import func, select
+
+from app.controllers import department_controller
+from app.database import Base, SessionLocal, engine
+from app.models import Department
+from app.services import job_service
+
+
+def test_resumed_import_rejects_case_duplicates_of_earlier_chunks(monkeypatch):
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(department_controller, "CSV_CHUNK_SIZE", 1)
+    monkeypatch.setattr(job_service, "_stop", threading.Event())  # as in a running app
+    checkpoints = 0
+    real_checkpoint = job_service.checkpoint
+
+    def interrupt_after_first(db, job, **progress):
+        nonlocal checkpoints
+        real_checkpoint(db, job, **progress)
+        checkpoints += 1
+        if checkpoints == 1:
+            raise job_service.JobInterrupted
+
+    monkeypatch.setattr(job_service, "checkpoint", interrupt_after_first)
+    db = SessionLocal()
+    try:
+        job = job_service.enqueue(
+            db, department_controller.CSV_IMPORT_JOB, io.BytesIO(b"name\nResume Sales\nRESUME sales\nResume Ops\n")
+        )
+        job.status, job.owner = "running", job_service._owner
+        db.commit()
+
+        with pytest.raises(job_service.JobInterrupted):
+            department_controller.run_departments_csv_job(db, job)
+        # A restart: nothing from the first run is left in memory, only its checkpoint.
+        db.rollback()
+        db.refresh(job)
+        department_controller.run_departments_csv_job(db, job)
+        db.refresh(job)
+
+        assert (job.created, job.failed) == (2, 1)
+        names = db.execute(
+            select(func.count()).where(Department.name.collate("NOCASE") == "resume sales")
+        ).scalar_one()
+        assert names == 1
+    finally:
+        db.close()
@@ -0,0 +1,55 @@
+from app.database import SessionLocal
+from app.services import employee_service
+
+
+def _page_through(client, **params) -> list[dict]:
+    employees, after = [], None
+    while True:
+        r = client.get("/api/employees", params={**params, **({"after": after} if after else {})})
+        assert r.status_code == 200, r.text
+        employees += r.json()
+        after = r.headers.get("x-next-cursor")
+        if not after:
+            return employees
+
+
+def test_prefix_pages_cover_name_and_email_matches_once(client):
+    department = client.post("/api/departments", json={"name": "Prefix paging"}).json()["id"]
+    people = [
+        ("P1", "Zed Quill", "qu.zed@prefix.example.com"),  # email match only
+        ("P2", "quentin Ash", "ash@prefix.example.com"),  # name match only
+        ("P3", "Quinn Ash", "quinn@prefix.example.com"),  # both: listed once, by name
+        ("P4", "QUILL Bo", "bo@prefix.example.com"),
+        ("P5", "Amy Quill", "amy@prefix.example.com"),  # no match
+        ("P6", "Quinn Ash", "quinn2@prefix.example.com"),  # same name: ordered by id
+        ("P7", "Mo Ray", "qua@prefix.example.com"),
+    ]
+    for employee_id, full_name, email in people:
+        r = client.post(
+            "/api/employees",
+            json={"employeeId": employee_id, "fullName": full_name, "email": email, "departmentId": department},
+        )
+        assert r.status_code == 201, r.text
+
+    # Name matches sort by the folded name, email-only matches by email, ties by id.
+    expected = ["P1", "P7", "P2", "P4", "P3", "P6"]
+    for limit in (1, 2, 3, 100):
+        got = _page_through(client, prefix="Qu", limit=limit, department_id=department)
+        assert [e["employeeId"] for e in got] == expected
+    r = client.get("/api/employees", params={"prefix": "qu", "department_id": department, "include_total": "true"})
+    assert int(r.headers["x-total-count"]) == len(expected)
+    assert client.get("/api/employees", params={"prefix": "qu", "after": "%%"}).status_code == 400
+
+
+def test_prefix_branches_are_index_ordered_range_scans():
+    db = SessionLocal()
+    try:
+        for stmt in employee_service.prefix_selects("qu", 100, after=("quinn ash", 3)):
+            compiled = stmt.compile(db.get_bind())
+            params = tuple(compiled.params[name] for name in compiled.positiontup)
+            rows = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params)
+            plan = " | ".join(row[3] for row in rows)
+            assert "TEMP B-TREE" not in plan, plan
+            assert "USING INDEX" in plan, plan
+    finally:
+        db.close()
@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.controllers import attendance_controller
+from app.database import SessionLocal
+from app.models import Attendance
+from app.schemas import AttendanceCreate
+from app.services import group_commit
+
+
+def _mark(employee_id: str, day: str = "2024-07-01", status: str = "Present") -> AttendanceCreate:
+    return AttendanceCreate(employeeId=employee_id, date=day, status=status)
+
+
+def _statuses(employee_ids: list[str], day: str = "2024-07-01") -> dict[str, str]:
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(Attendance.employee_id, Attendance.status).where(
+                Attendance.employee_id.in_(employee_ids), Attendance.date == day
+            )
+        )
+        return dict(rows.all())
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def committer(monkeypatch):
+    """A committer over stage_marks that records its batch sizes; a long window so items
+    submitted together land in one batch."""
+    monkeypatch.setattr(group_commit, "GROUP_COMMIT_WINDOW_MS", 200)
+    batches: list[int] = []
+    fail_on: set[str] = set()
+
+    def stage(db, bodies):
+        batches.append(len(bodies))
+        results = attendance_controller.stage_marks(db, bodies)
+        if any(body.employee_id in fail_on for body in bodies):
+            raise RuntimeError("staging failed")
+        return results
+
+    c = group_commit.GroupCommitter("test", stage)
+    c.batches, c.fail_on = batches, fail_on
+    c.start()
+    yield c
+    c.stop()
+
+
+def test_mixed_batch_unknown_employee_gets_404_neighbours_commit(client, make_employees, committer):
+    first, second = make_employees(2)
+    futures = [committer.submit(_mark(first)), committer.submit(_mark("NO-SUCH")), committer.submit(_mark(second))]
+    assert futures[0].result(5)["employee_id"] == first
+    with pytest.raises(HTTPException) as e:
+        futures[1].result(5)
+    assert e.value.status_code == 404
+    assert futures[2].result(5)["status"] == "Present"
+    assert committer.batches == [3]
+    assert _statuses([first, second]) == {first: "Present", second: "Present"}
+
+
+def test_failed_batch_is_retried_one_item_at_a_time(client, make_employees, committer):
+    first, bad, last = make_employees(3)
+    committer.fail_on.add(bad)
+    futures = [committer.submit(_mark(e, status="Absent")) for e in (first, bad, last)]
+    assert futures[0].result(5)["status"] == "Absent"
+    with pytest.raises(RuntimeError):
+        futures[1].result(5)
+    assert futures[2].result(5)["status"] == "Absent"
+    assert committer.batches == [3, 1, 1, 1]
+    # The failed batch was rolled back: only the retried neighbours are stored, once each.
+    assert _statuses([first, bad, last]) == {first: "Absent", last: "Absent"}
+
+
+def test_submit_after_stop_is_refused_and_write_commits_inline(client, make_employees, committer):
+    [employee_id] = make_employees(1)
+    committer.stop()
+    assert not committer.running
+    assert committer.submit(_mark(employee_id)) is None
+    assert committer.write(_mark(employee_id, status="Absent"))["status"] == "Absent"
+    with pytest.raises(HTTPException):
+        committer.write(_mark("NO-SUCH"))
+    assert _statuses([employee_id]) == {employee_id: "Absent"}
+
+
+@pytest.fixture
+def group_commit_off(monkeypatch):
+    """GROUP_COMMIT_WINDOW_MS=0 for the app started by `client` (request this fixture first)."""
+    monkeypatch.setattr(group_commit, "GROUP_COMMIT_WINDOW_MS", 0)
+
+
+@pytest.fixture
+def commits():
+    counted: list[int] = []
+
+    def count(_session):
+        counted.append(1)
+
+    event.listen(Session, "after_commit", count)
+    yield counted
+    event.remove(Session, "after_commit", count)
+
+
+def test_window_zero_commits_each_mark_on_its_own(group_commit_off, client, make_employees, commits):
+    employees = make_employees(6)
+    assert not attendance_controller.mark_writes.running
+
+    def post(employee_id):
+        body = {"employeeId": employee_id, "date": "2024-07-02", "status": "Present"}
+        return client.post("/api/attendance", json=body)
+
+    commits.clear()
+    with ThreadPoolExecutor(6) as pool:
+        responses = list(pool.map(post, employees))
+    assert [r.status_code for r in responses] == [201] * 6
+    assert len(commits) == 6
+    assert post("NO-SUCH").status_code == 404
+    assert _statuses(employees, "2024-07-02") == {e: "Present" for e in employees}
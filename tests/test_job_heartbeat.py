@@ -0,0 +1,37 @@
+import io
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.database import Base, SessionLocal, engine
+from app.models import Job
+from app.services import job_service
+
+
+def test_slow_chunk_keeps_its_claim(monkeypatch):
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(job_service, "JOB_STALE_SECONDS", 0.4)
+    monkeypatch.setattr(job_service, "_stop", threading.Event())  # as in a running app
+    seen = {}
+
+    def slow_chunk(db, job):
+        time.sleep(1.0)  # a chunk far longer than the stale window
+        seen["claimable"] = db.execute(select(Job.id).where(job_service._claimable())).scalars().all()
+        job_service.checkpoint(db, job, offset=1)
+
+    monkeypatch.setitem(job_service._handlers, "slow", slow_chunk)
+    db = SessionLocal()
+    try:
+        job = job_service.enqueue(db, "slow", io.BytesIO(b"x\n"))
+        job.status, job.owner, job.heartbeat_at = "running", job_service._owner, datetime.utcnow()
+        db.commit()
+
+        job_service._run(job.id)
+
+        assert job.id not in seen["claimable"]
+        db.refresh(job)
+        assert (job.status, job.offset) == ("succeeded", 1)
+    finally:
+        db.close()
@@ -0,0 +1,34 @@
+from app.services.lookup_cache import LookupCache
+
+
+def test_load_overlapping_an_invalidation_is_not_stored():
+    cache = LookupCache("test", maxsize=10, ttl=60)
+
+    def stale_loader():
+        # The write commits (and invalidates) while this read is in flight.
+        cache.invalidate("E1")
+        return "before the write"
+
+    assert cache.get_or_load("E1", stale_loader) == "before the write"
+    assert cache.get_or_load("E1", lambda: "after the write") == "after the write"
+    assert cache.get_or_load("E1", lambda: "not called") == "after the write"
+
+
+def test_invalidate_all_discards_loads_in_flight():
+    cache = LookupCache("test", maxsize=10, ttl=60)
+
+    def stale_loader():
+        cache.invalidate()
+        return "stale"
+
+    cache.get_or_load("E1", stale_loader)
+    assert cache.get_or_load("E1", lambda: "fresh") == "fresh"
+
+
+def test_generations_stay_bounded():
+    cache = LookupCache("test", maxsize=3, ttl=60)
+    for i in range(10):
+        cache.invalidate(f"E{i}")
+    assert len(cache._generations) <= 3
+    assert cache.get_or_load("E1", lambda: "v") == "v"
+    assert cache.get_or_load("E1", lambda: "not called") == "v"
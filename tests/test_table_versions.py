@@ -0,0 +1,48 @@
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DATABASE_URL, build_engine
+from app.models import Department
+from app.services import table_versions
+
+
+def test_unrelated_writes_keep_list_etags(client, make_employees):
+    employee_id = make_employees(1)[0]
+    first = client.get("/api/departments")
+    etag = first.headers["etag"]
+
+    r = client.post("/api/attendance", json={"employeeId": employee_id, "date": "2024-08-01", "status": "Present"})
+    assert r.status_code == 201, r.text
+    assert client.get("/api/departments", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/api/departments", json={"name": "Versioned"})
+    assert client.get("/api/departments", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_another_process_commit_bumps_only_its_tables(client):
+    before = table_versions.snapshot("departments", "attendance")
+    # Another worker: its own engine and connections, the same database file.
+    other = build_engine(DATABASE_URL)
+    db = sessionmaker(bind=other)()
+    db.add(Department(name="Written elsewhere"))
+    db.commit()
+    db.close()
+    other.dispose()
+    after = table_versions.snapshot("departments", "attendance")
+    assert after[0] > before[0]
+    assert after[1] == before[1]
+
+
+def test_rolled_back_writes_leave_versions_alone(client):
+    before = table_versions.snapshot("departments")
+    other = build_engine(DATABASE_URL)
+    db = sessionmaker(bind=other)()
+    db.add(Department(name="Never committed"))
+    db.flush()
+    db.rollback()
+    db.close()
+    other.dispose()
+    assert table_versions.snapshot("departments") == before
+
+
+def test_snapshot_is_stable_without_writes(client):
+    assert table_versions.snapshot("employees") == table_versions.snapshot("employees")